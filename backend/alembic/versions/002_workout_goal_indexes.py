@@ -0,0 +1,37 @@
+"""add composite indexes for per-user queries
+
+Revision ID: 002_workout_goal_indexes
+Revises: merge_goals_and_initial
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '002_workout_goal_indexes'
+down_revision: Union[str, None] = 'merge_goals_and_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Workout lists, date ranges and the analytics queries all filter by user then date
+    op.create_index(
+        'ix_workouts_user_id_workout_date', 'workouts',
+        ['user_id', 'workout_date'], unique=False
+    )
+    # Activity type filters (runs only, RunsList filter) followed by a date range or sort
+    op.create_index(
+        'ix_workouts_user_id_activity_type_workout_date', 'workouts',
+        ['user_id', 'activity_type', 'workout_date'], unique=False
+    )
+    # Goals are always listed per user ordered by target date
+    op.create_index(
+        'ix_goals_user_id_target_date', 'goals',
+        ['user_id', 'target_date'], unique=False
+    )
+
+def downgrade() -> None:
+    op.drop_index('ix_goals_user_id_target_date', table_name='goals')
+    op.drop_index('ix_workouts_user_id_activity_type_workout_date', table_name='workouts')
+    op.drop_index('ix_workouts_user_id_workout_date', table_name='workouts')
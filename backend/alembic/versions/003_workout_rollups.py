@@ -0,0 +1,57 @@
+"""add workout rollups table
+
+Revision ID: 003_workout_rollups
+Revises: 002_workout_goal_indexes
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_workout_rollups'
+down_revision: Union[str, None] = '002_workout_goal_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        'workout_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('activity_type', sa.String(), nullable=False),
+        sa.Column('workout_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('distance_mi', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('workout_time_seconds', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('pace_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('pace_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_distance_mi', sa.Float(), nullable=True),
+        sa.Column('min_pace_min_mi', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'activity_type')
+    )
+
+    # Backfill from existing workouts
+    op.execute("""
+        INSERT INTO workout_rollups (
+            user_id, day, activity_type, workout_count, distance_mi, workout_time_seconds,
+            pace_sum, pace_count, max_distance_mi, min_pace_min_mi
+        )
+        SELECT
+            user_id,
+            CAST(workout_date AS DATE),
+            activity_type,
+            COUNT(*),
+            COALESCE(SUM(distance_mi), 0),
+            COALESCE(SUM(workout_time_seconds), 0),
+            COALESCE(SUM(avg_pace_min_mi) FILTER (WHERE avg_pace_min_mi <> 0), 0),
+            COUNT(avg_pace_min_mi) FILTER (WHERE avg_pace_min_mi <> 0),
+            MAX(distance_mi),
+            MIN(avg_pace_min_mi) FILTER (WHERE avg_pace_min_mi <> 0)
+        FROM workouts
+        GROUP BY user_id, CAST(workout_date AS DATE), activity_type
+    """)
+
+def downgrade() -> None:
+    op.drop_table('workout_rollups')
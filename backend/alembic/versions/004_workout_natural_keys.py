@@ -0,0 +1,74 @@
+"""add natural-key unique indexes to workouts
+
+Revision ID: 004_workout_natural_keys
+Revises: 003_workout_rollups
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_workout_natural_keys'
+down_revision: Union[str, None] = '003_workout_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # CSV rows without a link were stored as empty strings
+    op.execute("UPDATE workouts SET external_link = NULL WHERE external_link = ''")
+
+    # Drop duplicates left by earlier re-imports, keeping the oldest row
+    op.execute("""
+        DELETE FROM workouts a USING workouts b
+        WHERE a.user_id = b.user_id
+          AND a.external_link = b.external_link
+          AND a.id > b.id
+    """)
+    op.execute("""
+        DELETE FROM workouts a USING workouts b
+        WHERE a.user_id = b.user_id
+          AND a.external_link IS NULL AND b.external_link IS NULL
+          AND a.workout_date = b.workout_date
+          AND a.activity_type = b.activity_type
+          AND a.distance_mi = b.distance_mi
+          AND a.id > b.id
+    """)
+
+    op.create_index(
+        'uq_workouts_user_id_external_link', 'workouts',
+        ['user_id', 'external_link'], unique=True,
+        postgresql_where=sa.text('external_link IS NOT NULL')
+    )
+    op.create_index(
+        'uq_workouts_user_id_date_activity_distance', 'workouts',
+        ['user_id', 'workout_date', 'activity_type', 'distance_mi'], unique=True,
+        postgresql_where=sa.text('external_link IS NULL')
+    )
+
+    # Rollups still count the deleted duplicates
+    op.execute("DELETE FROM workout_rollups")
+    op.execute("""
+        INSERT INTO workout_rollups (
+            user_id, day, activity_type, workout_count, distance_mi, workout_time_seconds,
+            pace_sum, pace_count, max_distance_mi, min_pace_min_mi
+        )
+        SELECT
+            user_id,
+            CAST(workout_date AS DATE),
+            activity_type,
+            COUNT(*),
+            COALESCE(SUM(distance_mi), 0),
+            COALESCE(SUM(workout_time_seconds), 0),
+            COALESCE(SUM(avg_pace_min_mi) FILTER (WHERE avg_pace_min_mi <> 0), 0),
+            COUNT(avg_pace_min_mi) FILTER (WHERE avg_pace_min_mi <> 0),
+            MAX(distance_mi),
+            MIN(avg_pace_min_mi) FILTER (WHERE avg_pace_min_mi <> 0)
+        FROM workouts
+        GROUP BY user_id, CAST(workout_date AS DATE), activity_type
+    """)
+
+def downgrade() -> None:
+    op.drop_index('uq_workouts_user_id_date_activity_distance', table_name='workouts')
+    op.drop_index('uq_workouts_user_id_external_link', table_name='workouts')
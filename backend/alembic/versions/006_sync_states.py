@@ -0,0 +1,36 @@
+"""add sync states table
+
+Revision ID: 006_sync_states
+Revises: 005_import_jobs
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_sync_states'
+down_revision: Union[str, None] = '005_import_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        'sync_states',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('provider', sa.String(), nullable=False),
+        sa.Column('remote_user_id', sa.String(), nullable=False),
+        sa.Column('access_token', sa.String(), nullable=False),
+        sa.Column('cursor', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False, server_default='idle'),
+        sa.Column('workouts_synced', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'provider')
+    )
+
+def downgrade() -> None:
+    op.drop_table('sync_states')
@@ -0,0 +1,25 @@
+"""add data version to users
+
+Revision ID: 007_user_data_version
+Revises: 006_sync_states
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_user_data_version'
+down_revision: Union[str, None] = '006_sync_states'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('data_version', sa.BigInteger(), nullable=False, server_default='0')
+    )
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
@@ -0,0 +1,42 @@
+"""add heart rate to workout rollups
+
+Revision ID: 008_rollup_heart_rate
+Revises: 007_user_data_version
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008_rollup_heart_rate'
+down_revision: Union[str, None] = '007_user_data_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column('workout_rollups', sa.Column('heart_rate_sum', sa.BigInteger(), nullable=False, server_default='0'))
+    op.add_column('workout_rollups', sa.Column('heart_rate_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing workouts
+    op.execute("""
+        UPDATE workout_rollups AS r
+        SET heart_rate_sum = s.heart_rate_sum, heart_rate_count = s.heart_rate_count
+        FROM (
+            SELECT
+                user_id,
+                CAST(workout_date AS DATE) AS day,
+                activity_type,
+                COALESCE(SUM(avg_heart_rate), 0) AS heart_rate_sum,
+                COUNT(avg_heart_rate) AS heart_rate_count
+            FROM workouts
+            WHERE avg_heart_rate IS NOT NULL
+            GROUP BY user_id, CAST(workout_date AS DATE), activity_type
+        ) AS s
+        WHERE r.user_id = s.user_id AND r.day = s.day AND r.activity_type = s.activity_type
+    """)
+
+def downgrade() -> None:
+    op.drop_column('workout_rollups', 'heart_rate_count')
+    op.drop_column('workout_rollups', 'heart_rate_sum')
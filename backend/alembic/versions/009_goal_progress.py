@@ -0,0 +1,29 @@
+"""add parsed targets and progress to goals
+
+Revision ID: 009_goal_progress
+Revises: 008_rollup_heart_rate
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009_goal_progress'
+down_revision: Union[str, None] = '008_rollup_heart_rate'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Existing goals are parsed and evaluated the first time they are listed
+    op.add_column('goals', sa.Column('target_distance_mi', sa.Float(), nullable=True))
+    op.add_column('goals', sa.Column('target_seconds', sa.Integer(), nullable=True))
+    op.add_column('goals', sa.Column('progress_value', sa.Float(), nullable=True))
+    op.add_column('goals', sa.Column('progress_updated_at', sa.DateTime(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('goals', 'progress_updated_at')
+    op.drop_column('goals', 'progress_value')
+    op.drop_column('goals', 'target_seconds')
+    op.drop_column('goals', 'target_distance_mi')
@@ -0,0 +1,53 @@
+"""add personal records table
+
+Revision ID: 010_personal_records
+Revises: 009_goal_progress
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '010_personal_records'
+down_revision: Union[str, None] = '009_goal_progress'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# category: (workout column, sort order putting the best first)
+CATEGORIES = {
+    'longest_distance': ('distance_mi', 'DESC'),
+    'fastest_pace': ('avg_pace_min_mi', 'ASC'),
+    'longest_duration': ('workout_time_seconds', 'DESC'),
+    'most_calories': ('calories_burned', 'DESC'),
+}
+
+def upgrade() -> None:
+    op.create_table(
+        'personal_records',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('activity_type', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.Column('workout_id', sa.Integer(), nullable=False),
+        sa.Column('workout_date', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['workout_id'], ['workouts.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'activity_type', 'category')
+    )
+
+    # Backfill from existing workouts; earliest workout wins ties
+    for category, (column, order) in CATEGORIES.items():
+        op.execute(f"""
+            INSERT INTO personal_records (user_id, activity_type, category, value, workout_id, workout_date)
+            SELECT DISTINCT ON (user_id, activity_type)
+                user_id, activity_type, '{category}', {column}, id, workout_date
+            FROM workouts
+            WHERE user_id IS NOT NULL AND {column} > 0
+            ORDER BY user_id, activity_type, {column} {order}, workout_date, id
+        """)
+
+def downgrade() -> None:
+    op.drop_table('personal_records')
@@ -0,0 +1,22 @@
+"""add claim tokens to import_jobs
+
+Revision ID: 011_import_job_claims
+Revises: 010_personal_records
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '011_import_job_claims'
+down_revision: Union[str, None] = '010_personal_records'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column('import_jobs', sa.Column('claim_token', sa.String(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('import_jobs', 'claim_token')
@@ -0,0 +1,99 @@
+"""match workouts without a distance in the unlinked natural key
+
+Revision ID: 012_null_distance_natural_key
+Revises: 011_import_job_claims
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '012_null_distance_natural_key'
+down_revision: Union[str, None] = '011_import_job_claims'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same categories as 010_personal_records
+RECORD_CATEGORIES = {
+    'longest_distance': ('distance_mi', 'DESC'),
+    'fastest_pace': ('avg_pace_min_mi', 'ASC'),
+    'longest_duration': ('workout_time_seconds', 'DESC'),
+    'most_calories': ('calories_burned', 'DESC'),
+}
+
+def upgrade() -> None:
+    # NULLs never conflict, so re-imports of workouts without a distance
+    # were duplicated; drop them, keeping the oldest row
+    op.execute("""
+        DELETE FROM personal_records WHERE workout_id IN (
+            SELECT a.id FROM workouts a JOIN workouts b
+              ON a.user_id = b.user_id
+             AND a.external_link IS NULL AND b.external_link IS NULL
+             AND a.workout_date = b.workout_date
+             AND a.activity_type = b.activity_type
+             AND a.distance_mi IS NULL AND b.distance_mi IS NULL
+             AND a.id > b.id
+        )
+    """)
+    op.execute("""
+        DELETE FROM workouts a USING workouts b
+        WHERE a.user_id = b.user_id
+          AND a.external_link IS NULL AND b.external_link IS NULL
+          AND a.workout_date = b.workout_date
+          AND a.activity_type = b.activity_type
+          AND a.distance_mi IS NULL AND b.distance_mi IS NULL
+          AND a.id > b.id
+    """)
+
+    op.drop_index('uq_workouts_user_id_date_activity_distance', table_name='workouts')
+    op.create_index(
+        'uq_workouts_user_id_date_activity_distance', 'workouts',
+        ['user_id', 'workout_date', 'activity_type', sa.text('COALESCE(distance_mi, -1)')], unique=True,
+        postgresql_where=sa.text('external_link IS NULL')
+    )
+
+    # Derived tables still count the deleted duplicates
+    op.execute("DELETE FROM workout_rollups")
+    op.execute("""
+        INSERT INTO workout_rollups (
+            user_id, day, activity_type, workout_count, distance_mi, workout_time_seconds,
+            pace_sum, pace_count, max_distance_mi, min_pace_min_mi, heart_rate_sum, heart_rate_count
+        )
+        SELECT
+            user_id,
+            CAST(workout_date AS DATE),
+            activity_type,
+            COUNT(*),
+            COALESCE(SUM(distance_mi), 0),
+            COALESCE(SUM(workout_time_seconds), 0),
+            COALESCE(SUM(avg_pace_min_mi) FILTER (WHERE avg_pace_min_mi <> 0), 0),
+            COUNT(avg_pace_min_mi) FILTER (WHERE avg_pace_min_mi <> 0),
+            MAX(distance_mi),
+            MIN(avg_pace_min_mi) FILTER (WHERE avg_pace_min_mi <> 0),
+            COALESCE(SUM(avg_heart_rate), 0),
+            COUNT(avg_heart_rate)
+        FROM workouts
+        GROUP BY user_id, CAST(workout_date AS DATE), activity_type
+    """)
+    op.execute("DELETE FROM personal_records")
+    for category, (column, order) in RECORD_CATEGORIES.items():
+        op.execute(f"""
+            INSERT INTO personal_records (user_id, activity_type, category, value, workout_id, workout_date)
+            SELECT DISTINCT ON (user_id, activity_type)
+                user_id, activity_type, '{category}', {column}, id, workout_date
+            FROM workouts
+            WHERE user_id IS NOT NULL AND {column} > 0
+            ORDER BY user_id, activity_type, {column} {order}, workout_date, id
+        """)
+    # Goal progress is recomputed the next time goals are listed
+    op.execute("UPDATE goals SET progress_updated_at = NULL")
+
+def downgrade() -> None:
+    op.drop_index('uq_workouts_user_id_date_activity_distance', table_name='workouts')
+    op.create_index(
+        'uq_workouts_user_id_date_activity_distance', 'workouts',
+        ['user_id', 'workout_date', 'activity_type', 'distance_mi'], unique=True,
+        postgresql_where=sa.text('external_link IS NULL')
+    )
@@ -0,0 +1,26 @@
+"""store goal kind and progress share on goals
+
+Revision ID: 013_goal_kind_progress
+Revises: 012_null_distance_natural_key
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '013_goal_kind_progress'
+down_revision: Union[str, None] = '012_null_distance_natural_key'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column('goals', sa.Column('kind', sa.String(), nullable=True))
+    op.add_column('goals', sa.Column('progress', sa.Float(), nullable=True))
+    # Goals are re-evaluated, filling both, the next time they are listed
+    op.execute("UPDATE goals SET progress_updated_at = NULL")
+
+def downgrade() -> None:
+    op.drop_column('goals', 'progress')
+    op.drop_column('goals', 'kind')
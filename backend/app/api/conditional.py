@@ -0,0 +1,62 @@
+"""
+Conditional GET support.
+
+ETags are strong validators derived from the user's persistent data
+version, so they can be computed, and a 304 returned, with a single
+primary-key lookup before any of the endpoint's queries run. Any workout
+or goal write changes every ETag of that user.
+"""
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.compression import strip_encoding
+from app.core.config import settings
+from app.crud import data_version_async as crud_data_version
+
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(user_id: int, data_version: Optional[int], *variant: Any) -> str:
+    """
+    Quoted strong ETag for one representation of a user's data. variant
+    distinguishes representations, e.g. the path and the resolved filters.
+    The API version is included so deploys that change the response shape
+    don't revalidate old bodies.
+    """
+    key = repr((settings.VERSION, user_id, data_version) + variant)
+    return '"%s"' % hashlib.sha256(key.encode()).hexdigest()[:32]
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match uses the weak comparison, so W/ prefixes are ignored, as
+    are the encoding suffixes CompressionMiddleware adds.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if strip_encoding(candidate) == etag:
+            return True
+    return False
+
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    user_id: int,
+    *variant: Any,
+) -> Optional[Response]:
+    """
+    Returns a 304 response if the client's copy is current. Otherwise sets
+    ETag and Cache-Control on response and returns None.
+    """
+    data_version = await crud_data_version.get_version(db, user_id)
+    etag = make_etag(user_id, data_version, request.url.path, *variant)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
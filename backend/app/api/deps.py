@@ -1,12 +1,17 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.cache import MISSING, principal_cache
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.logs import bind_user
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.models.user import User
+from app.schemas.token import Principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -17,10 +22,11 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _user_id_from_token(token: str) -> int:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -31,12 +37,33 @@ def get_current_user(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
             )
-    except (jwt.JWTError, ValidationError):
+        user_id = int(user_id)
+    except (jwt.JWTError, ValidationError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+    bind_user(user_id)
+    return user_id
+
+def _check_principal(principal: Optional[Principal]) -> Principal:
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Inactive user",
+        )
+    return principal
 
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    user_id = _user_id_from_token(token)
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
@@ -45,7 +72,67 @@ def get_current_user(
         )
     return user
 
+def get_current_principal(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Verified (id, is_active) for the token's user.
+    Served from principal_cache; the database is only hit on a miss.
+    """
+    user_id = _user_id_from_token(token)
+    principal = principal_cache.get(user_id)
+    if principal is MISSING:
+        row = db.query(User.id, User.is_active).filter(User.id == user_id).first()
+        principal = Principal(id=row.id, is_active=bool(row.is_active)) if row else None
+        if principal:
+            principal_cache.set(user_id, principal)
+    return _check_principal(principal)
+
 def get_current_user_id(
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
+) -> int:
+    return principal.id
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    user_id = _user_id_from_token(token)
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    return user
+
+async def get_current_principal_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """Async variant of get_current_principal."""
+    user_id = _user_id_from_token(token)
+    principal = principal_cache.get(user_id)
+    if principal is MISSING:
+        result = await db.execute(select(User.id, User.is_active).where(User.id == user_id))
+        row = result.first()
+        principal = Principal(id=row.id, is_active=bool(row.is_active)) if row else None
+        if principal:
+            principal_cache.set(user_id, principal)
+    return _check_principal(principal)
+
+async def get_current_user_id_async(
+    principal: Principal = Depends(get_current_principal_async),
+) -> int:
+    return principal.id
+
+def get_current_user_id_from_claims(
+    token: str = Depends(oauth2_scheme),
 ) -> int:
-    return current_user.id 
\ No newline at end of file
+    """
+    User id taken straight from the signed token, with no database or cache lookup.
+    Only for read-only endpoints: a deactivated user keeps read access to their
+    own data until the token expires.
+    """
+    return _user_id_from_token(token)
\ No newline at end of file
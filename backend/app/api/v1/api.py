@@ -1,11 +1,12 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, workouts, users, goals
+from app.api.v1.endpoints import auth, workouts, users, goals, sync
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(workouts.router, prefix="/workouts", tags=["workouts"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(goals.router, prefix="/goals", tags=["goals"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
 
 @api_router.get("/health")
 async def health_check():
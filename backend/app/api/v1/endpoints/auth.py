@@ -2,26 +2,36 @@ from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app import crud
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.core import security
 from app.core.config import settings
+from app.crud import user_async as crud_user
 from app.schemas import token, user
 
 router = APIRouter()
 
+def _hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/login", response_model=token.Token)
-def login(
-    db: Session = Depends(deps.get_db),
+async def login(
+    db: AsyncSession = Depends(deps.get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    user = crud.user.authenticate_user(
-        db, email=form_data.username, password=form_data.password
-    )
+    try:
+        user = await crud_user.authenticate_user(
+            db, email=form_data.username, password=form_data.password
+        )
+    except security.PasswordHashPoolFull:
+        raise _hashing_unavailable()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,19 +52,22 @@ def login(
     }
 
 @router.post("/register", response_model=user.User)
-def register(
+async def register(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     user_in: user.UserCreate,
 ) -> Any:
     """
     Create new user.
     """
-    user = crud.user.get_user_by_email(db, email=user_in.email)
+    user = await crud_user.get_user_by_email(db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    user = crud.user.create_user(db, user=user_in)
+    try:
+        user = await crud_user.create_user(db, user_in=user_in)
+    except security.PasswordHashPoolFull:
+        raise _hashing_unavailable()
     return user 
\ No newline at end of file
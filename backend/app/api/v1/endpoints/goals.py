@@ -1,49 +1,54 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.api import deps
-from app.crud import goal as crud_goal
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import conditional, deps
+from app.crud import goal_async as crud_goal
 from app.schemas.goal import Goal, GoalCreate, GoalUpdate
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Goal])
-def get_goals(
-    db: Session = Depends(deps.get_db),
-    current_user_id: int = Depends(deps.get_current_user_id),
+async def get_goals(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_from_claims),
 ):
     """Get all goals for the current user."""
-    return crud_goal.get_goals(db, current_user_id)
+    not_modified = await conditional.check_not_modified(request, response, db, current_user_id)
+    if not_modified:
+        return not_modified
+    return await crud_goal.get_goals(db, current_user_id)
 
 @router.post("/", response_model=Goal)
-def create_goal(
+async def create_goal(
     goal: GoalCreate,
-    db: Session = Depends(deps.get_db),
-    current_user_id: int = Depends(deps.get_current_user_id),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_async),
 ):
     """Create a new goal."""
-    return crud_goal.create_goal(db, goal, current_user_id)
+    return await crud_goal.create_goal(db, goal, current_user_id)
 
 @router.put("/{goal_id}", response_model=Goal)
-def update_goal(
+async def update_goal(
     goal_id: int,
     goal: GoalUpdate,
-    db: Session = Depends(deps.get_db),
-    current_user_id: int = Depends(deps.get_current_user_id),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_async),
 ):
     """Update a goal."""
-    db_goal = crud_goal.update_goal(db, goal_id, goal, current_user_id)
+    db_goal = await crud_goal.update_goal(db, goal_id, goal, current_user_id)
     if not db_goal:
         raise HTTPException(status_code=404, detail="Goal not found")
     return db_goal
 
 @router.delete("/{goal_id}")
-def delete_goal(
+async def delete_goal(
     goal_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user_id: int = Depends(deps.get_current_user_id),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_async),
 ):
     """Delete a goal."""
-    if not crud_goal.delete_goal(db, goal_id, current_user_id):
+    if not await crud_goal.delete_goal(db, goal_id, current_user_id):
         raise HTTPException(status_code=404, detail="Goal not found")
     return {"message": "Goal deleted"} 
\ No newline at end of file
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.crud import sync_state_async as crud_sync_state
+from app.schemas.sync import SyncConnection, SyncResult, SyncState
+from app.services import mapmyfitness
+
+router = APIRouter()
+
+@router.put("/mapmyfitness", response_model=SyncState)
+async def connect_mapmyfitness(
+    connection: SyncConnection,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_async),
+):
+    """Connect or update the current user's MapMyFitness account."""
+    return await crud_sync_state.connect(
+        db, current_user_id, mapmyfitness.PROVIDER, connection.remote_user_id, connection.access_token
+    )
+
+@router.get("/mapmyfitness", response_model=SyncState)
+async def get_mapmyfitness_sync(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_from_claims),
+):
+    """Get the status and cursor of the current user's MapMyFitness sync."""
+    db_state = await crud_sync_state.get_state(db, current_user_id, mapmyfitness.PROVIDER)
+    if not db_state:
+        raise HTTPException(status_code=404, detail="MapMyFitness account is not connected")
+    return db_state
+
+@router.post("/mapmyfitness/run", response_model=SyncResult)
+async def run_mapmyfitness_sync(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_async),
+):
+    """
+    Pull workouts added on MapMyFitness since the last sync.
+    """
+    try:
+        return await mapmyfitness.sync_user(db, current_user_id)
+    except mapmyfitness.NotConnectedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except mapmyfitness.MapMyFitnessError as e:
+        raise HTTPException(status_code=502, detail=str(e))
@@ -1,205 +1,243 @@
-import csv
+import logging
 from datetime import datetime, timedelta
-from io import StringIO
-from typing import List, Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, func, extract
-from app.api import deps
-from app.crud import workout as crud_workout
-from app.schemas.workout import Workout, WorkoutCreate, WorkoutList, WorkoutSummary
+from typing import List, Optional, Dict, Tuple
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.api import conditional, deps
+from app.crud import import_job_async as crud_import_job
+from app.crud import personal_record_async as crud_personal_record
+from app.crud import workout_async as crud_workout
+from app.crud.workout import TREND_METRICS, WORKOUT_RESPONSE_COLUMNS
+from app.schemas.personal_record import PersonalRecord
+from app.schemas.workout import ImportJob, Workout, WorkoutArchiveImportResult, WorkoutImportResult, WorkoutList, WorkoutSummary
+from app.services import archive_import, csv_import, import_worker, workout_export
+from app.core import responses
+from app.core.cache import analytics_cache
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-def parse_date(date_str: str) -> datetime:
-    """Try multiple date formats to parse the date string."""
-    # First, normalize the month abbreviations
-    month_mappings = {
-        'Jan.': 'Jan', 'Feb.': 'Feb', 'Mar.': 'Mar', 'Apr.': 'Apr',
-        'Jun.': 'Jun', 'Jul.': 'Jul', 'Aug.': 'Aug', 'Sept.': 'Sep',
-        'Oct.': 'Oct', 'Nov.': 'Nov', 'Dec.': 'Dec',
-        'September': 'Sep', 'October': 'Oct', 'November': 'Nov', 'December': 'Dec',
-        'January': 'Jan', 'February': 'Feb', 'March': 'Mar', 'April': 'Apr',
-        'June': 'Jun', 'July': 'Jul', 'August': 'Aug'
-    }
-    
-    # Remove any extra spaces and normalize the date string
-    date_str = ' '.join(date_str.split())  # Normalize spaces
-    
-    # Replace month names with standard abbreviations
-    for month, abbr in month_mappings.items():
-        if month in date_str:
-            date_str = date_str.replace(month, abbr)
-            break
-    
-    # Special case for "Sept" -> "Sep"
-    date_str = date_str.replace('Sept', 'Sep')
-    
-    date_formats = [
-        '%Y-%m-%d %H:%M:%S',  # 2024-12-04 15:30:00
-        '%b %d, %Y',          # Sep 26, 2024
-        '%Y-%m-%d',           # 2024-12-04
-        '%m/%d/%Y',           # 12/4/2024
-        '%d/%m/%Y',           # 4/12/2024
-    ]
-    
-    for date_format in date_formats:
-        try:
-            return datetime.strptime(date_str, date_format)
-        except ValueError:
-            continue
-    
-    raise ValueError(f"Could not parse date: {date_str}")
+_WORKOUT_FIELDS = [column.key for column in WORKOUT_RESPONSE_COLUMNS]
 
-def safe_int(value: str, allow_null: bool = False, treat_zero_as_null: bool = False) -> int | None:
-    """Convert string to int, handling empty strings and floats.
-    
-    Args:
-        value: The string value to convert
-        allow_null: Whether to return None for empty/invalid values instead of 0
-        treat_zero_as_null: Whether to treat 0 values as null (useful for measurements that can't be 0)
+def _resolve_date_range(
+    days: int, start_date: Optional[datetime], end_date: Optional[datetime]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
     """
-    if not value or value.strip() == '':
-        return None if allow_null else 0
-    try:
-        result = int(float(value))
-        if treat_zero_as_null and result == 0:
-            return None
-        return result
-    except (ValueError, TypeError):
-        return None if allow_null else 0
-
-def safe_float(value: str, allow_null: bool = False) -> float | None:
-    """Convert string to float, handling empty strings."""
-    if not value or value.strip() == '':
-        return None if allow_null else 0.0
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None if allow_null else 0.0
+    Turn the analytics filters into concrete bounds. Either days (positive
+    number for last N days, -1 for all time) or start_date and end_date.
+    """
+    # Handle custom date range
+    if start_date and end_date:
+        if days != -1:
+            raise HTTPException(
+                status_code=400,
+                detail="Cannot specify both days and date range"
+            )
+        return start_date, end_date
+    # Handle days parameter
+    if days >= 0:
+        # Use end of current day to include all workouts
+        end_date = datetime.utcnow().replace(hour=23, minute=59, second=59, microsecond=999999)
+        # Use start of day days ago
+        start_date = (end_date - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return start_date, end_date
+    # Handle all time case
+    return None, None
 
-@router.post("/upload-csv", response_model=List[Workout])
+@router.post("/upload-csv", response_model=WorkoutImportResult)
 async def upload_csv(
     file: UploadFile = File(...),
-    db: Session = Depends(deps.get_db),
-    current_user_id: int = Depends(deps.get_current_user_id),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_async),
 ):
     """
     Upload workouts from a MapMyRun CSV export file.
+    The file is parsed as a stream and written in batches; rows that fail
+    to parse are reported in the response instead of aborting the upload.
+    A file that can't be parsed from the start is rejected with a 400; one
+    that breaks off later returns the counts so far with error set.
+    The whole import runs inside the request; the app uploads through
+    POST /imports instead, so large files don't hit proxy timeouts.
     """
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
 
-    # Read the CSV file
-    contents = await file.read()
-    csv_text = contents.decode()
-    csv_file = StringIO(csv_text)
-    reader = csv.DictReader(csv_file)
+    try:
+        return await csv_import.import_csv_stream_async(
+            db,
+            file.file,
+            user_id=current_user_id,
+            batch_size=settings.CSV_IMPORT_BATCH_SIZE
+        )
+    except (csv_import.MissingColumnsError, csv_import.MalformedCsvError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Verify required columns are present
-    required_columns = {
-        'Workout Date',
-        'Activity Type',
-        'Calories Burned (kCal)',
-        'Distance (mi)',
-        'Workout Time (seconds)',
-        'Avg Pace (min/mi)',
-        'Max Pace (min/mi)',
-        'Avg Speed (mi/h)',
-        'Max Speed (mi/h)',
-        'Source',
-        'Link'
-    }
-    
-    optional_columns = {
-        'Avg Heart Rate',
-        'Steps',
-        'Notes'
-    }
-    
-    missing_columns = required_columns - set(reader.fieldnames or [])
-    if missing_columns:
-        raise HTTPException(
-            status_code=400,
-            detail=f"CSV file is missing required columns: {', '.join(missing_columns)}"
+@router.post("/upload-bulk", response_model=WorkoutArchiveImportResult)
+async def upload_bulk(
+    files: List[UploadFile] = File(...),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_async),
+):
+    """
+    Upload several MapMyRun CSV exports at once.
+    Accepts any mix of .csv, .csv.gz and .zip files; the CSVs are parsed in
+    parallel and the response has one result per CSV alongside the totals.
+    """
+    try:
+        return await archive_import.import_uploads(
+            db,
+            [(file.filename or "", file.file) for file in files],
+            user_id=current_user_id
         )
+    except archive_import.ArchiveError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    workouts = []
-    for row in reader:
-        try:
-            workout = WorkoutCreate(
-                workout_date=parse_date(row['Workout Date']),
-                activity_type=row['Activity Type'],
-                calories_burned=safe_int(row['Calories Burned (kCal)']),
-                distance_mi=safe_float(row['Distance (mi)']),
-                workout_time_seconds=safe_int(row['Workout Time (seconds)']),
-                avg_pace_min_mi=safe_float(row['Avg Pace (min/mi)']),
-                max_pace_min_mi=safe_float(row['Max Pace (min/mi)']),
-                avg_speed_mph=safe_float(row['Avg Speed (mi/h)']),
-                max_speed_mph=safe_float(row['Max Speed (mi/h)']),
-                avg_heart_rate=safe_int(row.get('Avg Heart Rate', ''), allow_null=True, treat_zero_as_null=True),
-                steps=safe_int(row.get('Steps', ''), allow_null=True),
-                notes=row.get('Notes', '').strip("b''"),
-                source=row['Source'],
-                external_link=row['Link']
-            )
-            workouts.append(workout)
-        except (ValueError, KeyError) as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Error processing row: {row}. Error: {str(e)}"
-            )
+@router.post("/imports", response_model=ImportJob, status_code=202)
+async def create_import_job(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_async),
+):
+    """
+    Queue a MapMyRun CSV export for background import.
+    Returns immediately; poll GET /imports/{job_id} for progress.
+    """
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="File must be a CSV")
+
+    job_id = await run_in_threadpool(import_worker.store_upload, file.file)
+    job = await crud_import_job.create_job(db, job_id, current_user_id, file.filename)
+    import_worker.import_workers.notify()
+    return job
 
-    # Bulk create workouts
-    db_workouts = crud_workout.create_workouts_bulk(db, workouts, current_user_id)
-    return db_workouts
+@router.get("/imports/{job_id}", response_model=ImportJob)
+async def get_import_job(
+    job_id: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_from_claims),
+):
+    """
+    Get the status and progress of a background import.
+    """
+    job = await crud_import_job.get_job(db, job_id, current_user_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
 
 @router.get("/", response_model=WorkoutList)
-def get_workouts(
+async def get_workouts(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     sort_by: Optional[str] = Query(None, regex="^(workout_date|activity_type|distance_mi|avg_pace_min_mi|calories_burned|avg_heart_rate|steps)$"),
     sort_order: Optional[str] = Query("desc", regex="^(asc|desc)$"),
     activity_type: Optional[str] = None,
-    db: Session = Depends(deps.get_db),
-    current_user_id: int = Depends(deps.get_current_user_id),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_from_claims),
 ):
     """
     Retrieve workouts for the current user with pagination, sorting, and filtering.
+    Every page carries a next_cursor; pass it back as cursor (with the same
+    sorting and filters) to fetch the following page without an OFFSET.
+    """
+    not_modified = await conditional.check_not_modified(
+        request, response, db, current_user_id, sorted(request.query_params.multi_items())
+    )
+    if not_modified:
+        return not_modified
+
+    try:
+        workouts, total, next_cursor = await crud_workout.get_workouts_by_user(
+            db,
+            user_id=current_user_id,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            activity_type=activity_type,
+            cursor=cursor,
+            include_total=include_total,
+            as_rows=settings.FAST_JSON_RESPONSES
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if settings.FAST_JSON_RESPONSES:
+        items = responses.rows_to_dicts(workouts, _WORKOUT_FIELDS)
+        return responses.fast_json_response(
+            {"items": items, "total": total, "next_cursor": next_cursor}, response
+        )
+    return {"items": workouts, "total": total, "next_cursor": next_cursor}
+
+@router.get("/export")
+async def export_workouts(
+    format: str = Query("csv", regex="^(csv|ndjson|parquet)$"),
+    current_user_id: int = Depends(deps.get_current_user_id_from_claims),
+):
     """
-    workouts, total = crud_workout.get_workouts_by_user(
-        db,
-        user_id=current_user_id,
-        skip=skip,
-        limit=limit,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        activity_type=activity_type
+    Download all of the current user's workouts, oldest first, as a
+    MapMyRun-style CSV (re-importable through upload-csv), NDJSON or Parquet.
+    The file is streamed from a server-side cursor in batches.
+    """
+    if format == "parquet" and not workout_export.parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export is not available on this server")
+    media_type, extension = workout_export.FORMATS[format]
+    return StreamingResponse(
+        workout_export.stream_workouts(current_user_id, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="workouts.{extension}"'},
+    )
+
+@router.get("/achievements", response_model=List[PersonalRecord])
+async def get_achievements(
+    request: Request,
+    response: Response,
+    activity_type: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_from_claims),
+):
+    """
+    The current user's all-time personal records per activity type: longest
+    distance, fastest average pace, longest duration and most calories.
+    Records are kept up to date as workouts are written, so this is a
+    primary key lookup.
+    """
+    not_modified = await conditional.check_not_modified(request, response, db, current_user_id, activity_type)
+    if not_modified:
+        return not_modified
+    return await crud_personal_record.get_records(
+        db, current_user_id, [activity_type] if activity_type else None
     )
-    return {"items": workouts, "total": total}
 
 @router.get("/{workout_id}", response_model=Workout)
-def get_workout(
+async def get_workout(
     workout_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user_id: int = Depends(deps.get_current_user_id),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_from_claims),
 ):
     """
     Get a specific workout by ID.
     """
-    workout = crud_workout.get_workout(db, workout_id)
+    workout = await crud_workout.get_workout(db, workout_id)
     if not workout or workout.user_id != current_user_id:
         raise HTTPException(status_code=404, detail="Workout not found")
     return workout 
 
 @router.get("/analytics/summary", response_model=WorkoutSummary)
-def get_workout_summary(
+async def get_workout_summary(
+    request: Request,
+    response: Response,
     days: int = Query(..., ge=-1),  # -1 means all time, but now required
     start_date: datetime = Query(None),
     end_date: datetime = Query(None),
-    db: Session = Depends(deps.get_db),
-    current_user_id: int = Depends(deps.get_current_user_id),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_from_claims),
 ):
     """
     Get workout summary statistics for the dashboard.
@@ -207,202 +245,130 @@ def get_workout_summary(
     - days (positive number for last N days, -1 for all time)
     - start_date and end_date for custom range
     """
-    # Handle custom date range
-    if start_date and end_date:
-        if days != -1:
-            raise HTTPException(
-                status_code=400,
-                detail="Cannot specify both days and date range"
-            )
-    # Handle days parameter
-    elif days >= 0:
-        # Use end of current day to include all workouts
-        end_date = datetime.utcnow().replace(hour=23, minute=59, second=59, microsecond=999999)
-        # Use start of day days ago
-        start_date = (end_date - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
-    # Handle all time case
-    else:  # days == -1
-        start_date = None
-        end_date = None
+    start_date, end_date = _resolve_date_range(days, start_date, end_date)
+    # Resolved bounds are part of the ETag, since days=N moves with the current date
+    not_modified = await conditional.check_not_modified(
+        request, response, db, current_user_id, start_date, end_date
+    )
+    if not_modified:
+        return not_modified
+
+    summary = await analytics_cache.get_or_compute_async(
+        current_user_id,
+        ("summary", start_date, end_date),
+        lambda: crud_workout.get_workout_summary(
+            db,
+            user_id=current_user_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+    )
 
-    # Get workouts in date range
-    workouts = crud_workout.get_workouts_in_date_range(
-        db,
-        user_id=current_user_id,
-        start_date=start_date,
-        end_date=end_date
+    logger.debug(
+        "Workout summary computed",
+        extra={"start_date": start_date, "end_date": end_date, "total_runs": summary["total_runs"]}
     )
 
-    # Debug logging
-    print(f"Date range: {start_date} to {end_date}")
-    print(f"Found {len(workouts)} workouts")
-    
-    # Filter runs
-    runs = [w for w in workouts if w.activity_type in ["Run", "Running"]]
-    print(f"Found {len(runs)} runs")
-    
-    total_runs = len(runs)
-    
-    if not runs:
-        return {
-            "total_runs": 0,
-            "total_distance": 0,
-            "avg_distance": 0,
-            "longest_run": 0,
-            "best_pace": None,
-            "avg_pace": None,
-            "total_time": 0,
-            "weekly_mileage": [],
-            "recent_achievements": [],
-            "pace_zones": {"easy": 0, "moderate": 0, "tempo": 0}
-        }
-    
-    # Calculate stats
-    total_distance = sum(r.distance_mi for r in runs)
-    avg_distance = total_distance / total_runs if total_runs > 0 else 0
-    longest_run = max(r.distance_mi for r in runs)
-    best_pace = min((r.avg_pace_min_mi for r in runs if r.avg_pace_min_mi), default=None)
-    avg_pace = sum(r.avg_pace_min_mi for r in runs if r.avg_pace_min_mi) / len([r for r in runs if r.avg_pace_min_mi]) if runs else None
-    total_time = sum(r.workout_time_seconds for r in runs)
-    
-    # Calculate weekly mileage
-    weekly_mileage = {}
-    for run in runs:
-        week_start = run.workout_date.date() - timedelta(days=run.workout_date.weekday())
-        weekly_mileage[week_start] = weekly_mileage.get(week_start, 0) + run.distance_mi
-    
-    weekly_mileage = [
-        {"week": str(week), "distance": distance}
-        for week, distance in sorted(weekly_mileage.items())
-    ]
-    
-    # Find recent achievements
-    recent_achievements = []
-    longest_run_workout = max(runs, key=lambda r: r.distance_mi)
-    if longest_run_workout:
-        recent_achievements.append({
-            "type": "Longest Run",
-            "value": f"{longest_run_workout.distance_mi:.2f} miles",
-            "date": str(longest_run_workout.workout_date.date())
-        })
-    
-    best_pace_workout = min((r for r in runs if r.avg_pace_min_mi), key=lambda r: r.avg_pace_min_mi, default=None)
-    if best_pace_workout:
-        recent_achievements.append({
-            "type": "Best Pace",
-            "value": f"{best_pace_workout.avg_pace_min_mi:.2f} min/mi",
-            "date": str(best_pace_workout.workout_date.date())
-        })
-    
-    # Calculate pace zones
-    pace_zones = {"easy": 0, "moderate": 0, "tempo": 0}
-    if avg_pace is not None:
-        for run in runs:
-            if run.avg_pace_min_mi is None:
-                continue
-            if run.avg_pace_min_mi > avg_pace * 1.1:
-                pace_zones["easy"] += 1
-            elif run.avg_pace_min_mi <= avg_pace * 0.9:
-                pace_zones["tempo"] += 1
-            else:
-                pace_zones["moderate"] += 1
-    
-    return {
-        "total_runs": total_runs,
-        "total_distance": total_distance,
-        "avg_distance": avg_distance,
-        "longest_run": longest_run,
-        "best_pace": best_pace,
-        "avg_pace": avg_pace,
-        "total_time": total_time,
-        "weekly_mileage": weekly_mileage,
-        "recent_achievements": recent_achievements,
-        "pace_zones": pace_zones
-    }
+    if settings.FAST_JSON_RESPONSES:
+        return responses.fast_json_response(summary, response)
+    return summary
 
 @router.get("/analytics/trends", response_model=Dict)
-def get_workout_trends(
-    metric: str = Query(..., regex="^(distance|pace|time)$"),
+async def get_workout_trends(
+    request: Request,
+    response: Response,
+    metric: Optional[str] = Query(None, regex="^(distance|pace|time)$"),
+    metrics: Optional[List[str]] = Query(None),
     group_by: str = Query(..., regex="^(day|week|month)$"),
     days: int = Query(..., ge=-1),  # -1 means all time, but now required
     start_date: datetime = Query(None),
     end_date: datetime = Query(None),
-    db: Session = Depends(deps.get_db),
-    current_user_id: int = Depends(deps.get_current_user_id),
+    fill_empty: bool = False,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user_id: int = Depends(deps.get_current_user_id_from_claims),
 ):
     """
     Get trending data for specific metrics.
+    Either one metric, answered as {metric, group_by, data: [{period, value}]},
+    or several metrics (repeated, or comma separated) of distance, pace, time,
+    count, max_distance and heart_rate, computed in a single pass and answered
+    as {metrics, group_by, periods, series: {metric: [...]}} with every series
+    aligned to periods. fill_empty adds the periods without runs.
     Can filter by either:
     - days (positive number for last N days, -1 for all time)
     - start_date and end_date for custom range
     """
-    # Handle custom date range
-    if start_date and end_date:
-        if days != -1:
+    if (metric is None) == (metrics is None):
+        raise HTTPException(status_code=400, detail="Specify either metric or metrics")
+    if metrics is not None:
+        requested = list(dict.fromkeys(
+            name.strip() for value in metrics for name in value.split(",") if name.strip()
+        ))
+        unknown = [name for name in requested if name not in TREND_METRICS]
+        if not requested or unknown:
             raise HTTPException(
                 status_code=400,
-                detail="Cannot specify both days and date range"
+                detail=f"metrics must be among {', '.join(TREND_METRICS)}"
             )
-    # Handle days parameter
-    elif days >= 0:
-        # Use end of current day to include all workouts
-        end_date = datetime.utcnow().replace(hour=23, minute=59, second=59, microsecond=999999)
-        # Use start of day days ago
-        start_date = (end_date - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
-    # Handle all time case
-    else:  # days == -1
-        start_date = None
-        end_date = None
 
-    # Get workouts in date range
-    workouts = crud_workout.get_workouts_in_date_range(
-        db,
-        user_id=current_user_id,
-        start_date=start_date,
-        end_date=end_date
+    start_date, end_date = _resolve_date_range(days, start_date, end_date)
+    variant = (metric, tuple(requested) if metrics is not None else None, group_by, fill_empty)
+    not_modified = await conditional.check_not_modified(
+        request, response, db, current_user_id, *variant, start_date, end_date
+    )
+    if not_modified:
+        return not_modified
+
+    try:
+        if metrics is None:
+            trend_data = await analytics_cache.get_or_compute_async(
+                current_user_id,
+                ("trends", *variant, start_date, end_date),
+                lambda: crud_workout.get_workout_trends(
+                    db,
+                    user_id=current_user_id,
+                    metric=metric,
+                    group_by=group_by,
+                    start_date=start_date,
+                    end_date=end_date,
+                    fill_empty=fill_empty
+                )
+            )
+            trends = {
+                'metric': metric,
+                'group_by': group_by,
+                'data': trend_data
+            }
+            periods = len(trend_data)
+        else:
+            series = await analytics_cache.get_or_compute_async(
+                current_user_id,
+                ("trends", *variant, start_date, end_date),
+                lambda: crud_workout.get_trend_series(
+                    db,
+                    user_id=current_user_id,
+                    metrics=requested,
+                    group_by=group_by,
+                    start_date=start_date,
+                    end_date=end_date,
+                    fill_empty=fill_empty
+                )
+            )
+            trends = {
+                'metrics': requested,
+                'group_by': group_by,
+                **series
+            }
+            periods = len(series["periods"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.debug(
+        "Workout trends computed",
+        extra={"metrics": requested if metrics is not None else [metric], "group_by": group_by,
+               "start_date": start_date, "end_date": end_date, "periods": periods}
     )
 
-    # Debug logging
-    print(f"Trends date range: {start_date} to {end_date}")
-    print(f"Found {len(workouts)} workouts")
-    
-    # Filter runs
-    runs = [w for w in workouts if w.activity_type in ["Run", "Running"]]
-    
-    # Group data by period
-    grouped_data = {}
-    for run in runs:
-        if group_by == 'day':
-            period = run.workout_date.date()
-        elif group_by == 'week':
-            period = run.workout_date.date() - timedelta(days=run.workout_date.weekday())
-        else:  # month
-            period = run.workout_date.date().replace(day=1)
-        
-        if period not in grouped_data:
-            grouped_data[period] = []
-        grouped_data[period].append(run)
-    
-    # Calculate metric values for each period
-    trend_data = []
-    for period in sorted(grouped_data.keys()):
-        period_runs = grouped_data[period]
-        if metric == 'distance':
-            value = sum(r.distance_mi for r in period_runs)
-        elif metric == 'pace':
-            paces = [r.avg_pace_min_mi for r in period_runs if r.avg_pace_min_mi is not None]
-            value = sum(paces) / len(paces) if paces else None
-        else:  # time
-            value = sum(r.workout_time_seconds for r in period_runs)
-        
-        if value is not None:
-            trend_data.append({
-                'period': period.strftime('%Y-%m-%d'),
-                'value': float(value)
-            })
-    
-    return {
-        'metric': metric,
-        'group_by': group_by,
-        'data': trend_data
-    } 
\ No newline at end of file
+    if settings.FAST_JSON_RESPONSES:
+        return responses.fast_json_response(trends, response)
+    return trends
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from app.core.config import settings
+
+MISSING = object()
+
+class UserDataVersions:
+    """
+    Per-user counters bumped whenever a user's data changes.
+    Cache keys embed the current version, so a bump makes every older
+    entry for that user unreachable without scanning the cache.
+    Versions are per process; the cache TTL bounds staleness when several
+    workers serve the same user.
+    """
+
+    def __init__(self):
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def bump(self, user_id: int) -> int:
+        with self._lock:
+            version = self._versions.get(user_id, 0) + 1
+            self._versions[user_id] = version
+            return version
+
+class LRUCache:
+    """Thread-safe LRU cache with a per-entry TTL and hit/miss/eviction counters."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the live value for key, or MISSING."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+class AnalyticsCache(LRUCache):
+    """LRU cache whose keys include the user's data version."""
+
+    def __init__(self, versions: UserDataVersions, max_entries: int, ttl_seconds: float):
+        super().__init__(max_entries, ttl_seconds)
+        self.versions = versions
+
+    def get_or_compute(self, user_id: int, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        The user's current data version is part of the key.
+        """
+        full_key = (user_id, self.versions.get(user_id)) + tuple(key)
+        value = self.get(full_key)
+        if value is MISSING:
+            # Computed outside the lock so slow queries don't serialize the cache
+            value = compute()
+            self.set(full_key, value)
+        return value
+
+    async def get_or_compute_async(
+        self, user_id: int, key: Tuple, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Same as get_or_compute for an async compute function."""
+        full_key = (user_id, self.versions.get(user_id)) + tuple(key)
+        value = self.get(full_key)
+        if value is MISSING:
+            value = await compute()
+            self.set(full_key, value)
+        return value
+
+data_versions = UserDataVersions()
+
+analytics_cache = AnalyticsCache(
+    data_versions,
+    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+# Verified (id, is_active) principals keyed by user id
+principal_cache = LRUCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
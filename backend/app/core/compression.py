@@ -0,0 +1,138 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+CompressionMiddleware compresses complete response bodies of at least
+COMPRESSION_MIN_BYTES with brotli when the client accepts it and the
+brotli package is installed, otherwise with gzip. Streaming responses,
+which send their body in several chunks, pass through unchanged.
+
+Strong ETags identify one exact representation, so a compressed response
+gets its encoding appended to the ETag ('"abc"' becomes '"abc-br"').
+app.api.conditional strips the suffix again when matching If-None-Match,
+and 304s echo the suffixed tag the client sent.
+"""
+import gzip
+from typing import List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    The preferred supported encoding the client accepts, or None. Higher
+    q-values win; brotli wins ties since it compresses JSON better.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level)
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """The ETag of the encoded representation. Weak ETags are left alone."""
+    if etag.startswith('"') and etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+def strip_encoding(etag: str) -> str:
+    """Inverse of encoded_etag."""
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # The start message is held back until the first body chunk shows
+        # whether the body is complete and large enough to compress
+        pending_start: List[Message] = []
+
+        async def send_compressed(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                pending_start.append(message)
+                return
+            if message["type"] != "http.response.body" or not pending_start:
+                await send(message)
+                return
+
+            start = pending_start.pop()
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            start["headers"] = headers.raw
+            body = message.get("body", b"")
+
+            if start["status"] == 304:
+                self._echo_encoded_etag(headers, request_headers, encoding)
+            elif self._should_compress(headers, body, message.get("more_body", False)):
+                body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    headers["etag"] = encoded_etag(headers["etag"], encoding)
+                message = {**message, "body": body}
+
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        if more_body or len(body) < self.minimum_size or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(("application/json", "text/"))
+
+    @staticmethod
+    def _echo_encoded_etag(headers: MutableHeaders, request_headers: Headers, encoding: str) -> None:
+        """Answer a revalidation of the encoded representation with its own ETag."""
+        etag = headers.get("etag")
+        if etag is None:
+            return
+        tagged = encoded_etag(etag, encoding)
+        if tagged in request_headers.get("if-none-match", ""):
+            headers["etag"] = tagged
+            headers.add_vary_header("Accept-Encoding")
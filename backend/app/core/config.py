@@ -14,14 +14,71 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "analyzemyrun"
     SQLALCHEMY_DATABASE_URI: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
 
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> str:
+        """The same database through the asyncpg driver."""
+        return self.SQLALCHEMY_DATABASE_URI.replace("postgresql://", "postgresql+asyncpg://", 1)
+
     # Security settings
     SECRET_KEY: str = "your-secret-key-here"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+
+    # Password hashing; bcrypt runs on a bounded pool of PASSWORD_HASH_WORKERS
+    # threads, and requests beyond PASSWORD_HASH_MAX_QUEUE waiting are rejected
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # CSV import settings
+    CSV_IMPORT_BATCH_SIZE: int = 500
+    IMPORT_PARSE_PROCESSES: int = 0  # 0 uses one process per CPU
+    ARCHIVE_MAX_MEMBERS: int = 500
+    ARCHIVE_MAX_UNCOMPRESSED_BYTES: int = 1024 * 1024 * 1024
+
+    # Rows fetched per server-side cursor batch by GET /workouts/export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Background import job settings. Uploads wait in IMPORT_STORAGE_DIR, so every
+    # process running import workers must see the same directory.
+    IMPORT_STORAGE_DIR: str = "/tmp/analyzemyrun-imports"
+    IMPORT_WORKERS: int = 2
+    IMPORT_POLL_SECONDS: float = 2.0
+    IMPORT_STALE_AFTER_SECONDS: int = 300
+
+    # Analytics settings; ANALYTICS_ENGINE is 'sql' (rollups and SQL aggregates) or 'pandas'
+    ANALYTICS_ENGINE: str = "sql"
+    ANALYTICS_CACHE_MAX_ENTRIES: int = 1024
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300
+
+    # Response settings; FAST_JSON_RESPONSES serializes list and analytics responses
+    # straight from query results, without re-validating them against the schemas
+    FAST_JSON_RESPONSES: bool = False
+    COMPRESSION_MIN_BYTES: int = 1024
+    GZIP_COMPRESSION_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
 
     # MapMyFitness API settings
     MAPMYFITNESS_CLIENT_ID: Optional[str] = None
     MAPMYFITNESS_CLIENT_SECRET: Optional[str] = None
+    MAPMYFITNESS_API_URL: str = "https://api.mapmyfitness.com/v7.1/"
+    MAPMYFITNESS_PAGE_SIZE: int = 40
+    MAPMYFITNESS_CONCURRENCY: int = 4
+    MAPMYFITNESS_MAX_CONNECTIONS: int = 10
+    MAPMYFITNESS_REQUESTS_PER_SECOND: float = 4.0
+    MAPMYFITNESS_MAX_RETRIES: int = 5
+    MAPMYFITNESS_TIMEOUT_SECONDS: float = 30.0
+
+    # Logging; LOG_FORMAT is 'json' or 'text'
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_DEBUG_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    # Parameters can hold personal data; credentials are redacted by column name
+    SLOW_QUERY_LOG_PARAMETERS: bool = False
+    SLOW_QUERY_MAX_PARAMETER_CHARS: int = 1000
 
     # First admin user
     FIRST_SUPERUSER: str = "admin@analyzemyrun.com"
@@ -0,0 +1,265 @@
+"""
+Structured, non-blocking logging.
+
+configure_logging routes every record through a QueueHandler, so request
+handlers only enqueue; a QueueListener thread formats records and writes
+them to stdout. Records are JSON objects carrying the request id, user
+id and route of the request that produced them, plus any `extra` fields.
+
+DEBUG records pass LOG_LEVEL gating first and are then sampled at
+LOG_DEBUG_SAMPLE_RATE, so high-volume debug events can stay enabled in
+production at a fraction of the cost. A record can carry its own rate
+with extra={"sample_rate": ...}.
+
+instrument_slow_queries logs every SQL statement slower than
+SLOW_QUERY_THRESHOLD_MS with the route that ran it, and its parameters
+when SLOW_QUERY_LOG_PARAMETERS is on.
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+class RequestContext:
+    """Who and what a log record was produced for. Mutable so dependencies can fill in the user."""
+
+    __slots__ = ("request_id", "method", "path", "scope", "user_id")
+
+    def __init__(self, request_id: str, method: str, path: str, scope: Optional[Scope] = None):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.scope = scope
+        self.user_id: Optional[int] = None
+
+    @property
+    def route(self) -> str:
+        # The router records the matched route on the scope once routing has happened
+        route = self.scope.get("route") if self.scope is not None else None
+        return getattr(route, "path", None) or self.path
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+def bind_user(user_id: int) -> None:
+    """Attach the authenticated user to the current request's log records."""
+    context = current_request.get()
+    if context is not None:
+        context.user_id = user_id
+
+# Attributes every LogRecord has; anything else came from `extra`
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sample_rate"}
+
+class ContextFilter(logging.Filter):
+    """
+    Copies the request context onto records. Runs on the QueueHandler, in
+    the thread that logged, before the record crosses to the listener.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = current_request.get()
+        if context is not None:
+            record.request_id = context.request_id
+            record.user_id = context.user_id
+            record.route = context.route
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random share of DEBUG records, or the share given by the record's sample_rate."""
+
+    def __init__(self, debug_rate: float):
+        super().__init__()
+        self.debug_rate = debug_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, "sample_rate", None)
+        if rate is None:
+            if record.levelno > logging.DEBUG:
+                return True
+            rate = self.debug_rate
+        return rate >= 1 or random.random() < rate
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps extra fields and the traceback separate from the
+    message. The stock prepare() folds everything into one string.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def configure_logging() -> None:
+    """Install the queue handler on the root logger and start the writer thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+
+    # Unbounded, so logging never blocks a request; the listener drains it continuously
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    handler = StructuredQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(SamplingFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+_SECRET_KEYS = re.compile(r"password|token|secret|email", re.IGNORECASE)
+
+def _parameter_names(context: Any) -> Optional[List[str]]:
+    """Bind names of a positional statement (asyncpg, psycopg2 executemany), in order."""
+    compiled = getattr(context, "compiled", None)
+    names = getattr(compiled, "positiontup", None)
+    return list(names) if names else None
+
+def _loggable_parameters(parameters: Any, executemany: bool, names: Optional[List[str]] = None) -> Any:
+    """
+    Parameters with credentials and contact details redacted by bind name.
+    Positional parameters are named from the compiled statement; ones that
+    can't be named are not logged at all.
+    """
+    if parameters is None:
+        return None
+    if executemany and isinstance(parameters, (list, tuple)):
+        return {
+            "rows": len(parameters),
+            "first": _loggable_parameters(parameters[0], False, names) if parameters else None,
+        }
+    if isinstance(parameters, (list, tuple)):
+        if names is None or len(names) != len(parameters):
+            return f"[{len(parameters)} positional parameters]"
+        parameters = dict(zip(names, parameters))
+    if isinstance(parameters, dict):
+        parameters = {
+            key: "[redacted]" if _SECRET_KEYS.search(str(key)) else value
+            for key, value in parameters.items()
+        }
+    text = repr(parameters)
+    limit = settings.SLOW_QUERY_MAX_PARAMETER_CHARS
+    return text if len(text) <= limit else text[:limit] + "..."
+
+def instrument_slow_queries(engine: Engine) -> None:
+    """Log statements slower than SLOW_QUERY_THRESHOLD_MS. Pass async_engine.sync_engine for async engines."""
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_started"].pop()
+        if elapsed < threshold:
+            return
+        slow_query_logger.warning(
+            "Slow query",
+            extra={
+                "duration_ms": round(elapsed * 1000, 1),
+                "statement": statement,
+                "parameters": (
+                    _loggable_parameters(parameters, executemany, _parameter_names(context))
+                    if settings.SLOW_QUERY_LOG_PARAMETERS else None
+                ),
+                "executemany": executemany,
+            }
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("slow_query_started"):
+            conn.info["slow_query_started"].pop()
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+class RequestContextMiddleware:
+    """
+    Gives each request an id, taken from a well-formed X-Request-ID header
+    or generated, binds it to log records and echoes it on the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        context = RequestContext(request_id or uuid.uuid4().hex, scope["method"], scope["path"], scope)
+        token = current_request.set(context)
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", context.request_id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            current_request.reset(token)
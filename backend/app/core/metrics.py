@@ -0,0 +1,220 @@
+"""
+In-process request and database metrics in the Prometheus text format.
+
+Metrics are per process, like the caches in app.core.cache; with several
+workers each one reports its own series and Prometheus sums them.
+
+Per-request SQL counts and DB time are collected through a context
+variable holding the current request's RequestStats. The middleware sets
+it, and the engine event listeners and the timed pool add to it.
+Context variables follow requests into the threadpool and into
+AsyncSession.run_sync, so sync and async queries are both counted.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.cache import analytics_cache
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last is +Inf), sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+class CacheMetrics:
+    """Reads an LRUCache's counters at scrape time."""
+
+    COUNTERS = ("hits", "misses", "evictions", "expirations")
+    GAUGES = ("size", "max_entries")
+
+    def __init__(self, name: str, documentation: str, stats: Callable[[], Dict[str, Any]]):
+        self.name = name
+        self.documentation = documentation
+        self.stats = stats
+
+    def render(self) -> Iterable[str]:
+        stats = self.stats()
+        for key in self.COUNTERS:
+            yield f"# HELP {self.name}_{key}_total {self.documentation} {key.capitalize()}."
+            yield f"# TYPE {self.name}_{key}_total counter"
+            yield f"{self.name}_{key}_total {_format_value(stats[key])}"
+        for key in self.GAUGES:
+            yield f"# HELP {self.name}_{key} {self.documentation} {key.replace('_', ' ').capitalize()}."
+            yield f"# TYPE {self.name}_{key} gauge"
+            yield f"{self.name}_{key} {_format_value(stats[key])}"
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route and status.",
+    ("method", "route", "status"),
+)
+http_request_db_statements = Histogram(
+    "http_request_db_statements", "SQL statements executed per request.",
+    ("method", "route"), QUERY_COUNT_BUCKETS,
+)
+http_request_db_duration = Histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL per request.",
+    ("method", "route"),
+)
+db_statements = Counter("db_statements_total", "SQL statements executed.", ("engine",))
+db_statement_duration = Histogram(
+    "db_statement_duration_seconds", "Duration of individual SQL statements.", ("engine",),
+)
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool, including opening a new one.",
+    ("engine",), (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+
+REGISTRY = [
+    http_request_duration,
+    http_request_db_statements,
+    http_request_db_duration,
+    db_statements,
+    db_statement_duration,
+    db_pool_checkout_wait,
+    CacheMetrics("analytics_cache", "Analytics result cache.", analytics_cache.stats),
+]
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+class RequestStats:
+    """Database work done on behalf of one request."""
+
+    __slots__ = ("statements", "db_seconds", "pool_wait_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+def _record_pool_wait(engine_name: str, seconds: float) -> None:
+    db_pool_checkout_wait.observe(seconds, engine_name)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    engine_name = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _record_pool_wait(self.engine_name, time.perf_counter() - started)
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    engine_name = "async"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _record_pool_wait(self.engine_name, time.perf_counter() - started)
+
+def instrument_engine(engine: Engine, engine_name: str) -> None:
+    """Count statements and time their execution. Pass async_engine.sync_engine for async engines."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        db_statements.inc(1, engine_name)
+        db_statement_duration.observe(elapsed, engine_name)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # after_cursor_execute doesn't fire for failed statements
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
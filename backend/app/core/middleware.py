@@ -0,0 +1,60 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import (
+    RequestStats,
+    current_request_stats,
+    http_request_db_duration,
+    http_request_db_statements,
+    http_request_duration,
+)
+
+def _route_label(scope: Scope) -> str:
+    # The path template keeps label cardinality bounded; unmatched paths share one label
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL statement count and DB time per route, and adds a
+    Server-Timing header splitting each response into database, pool wait
+    and application time.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                db_ms = stats.db_seconds * 1000
+                pool_ms = stats.pool_wait_seconds * 1000
+                app_ms = max(total_ms - db_ms - pool_ms, 0.0)
+                timing = (
+                    f'db;dur={db_ms:.1f};desc="{stats.statements} queries", '
+                    f"pool;dur={pool_ms:.1f}, app;dur={app_ms:.1f}, total;dur={total_ms:.1f}"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request_stats.reset(token)
+            method = scope["method"]
+            route = _route_label(scope)
+            http_request_duration.observe(time.perf_counter() - started, method, route, str(status))
+            http_request_db_statements.observe(stats.statements, method, route)
+            http_request_db_duration.observe(stats.db_seconds, method, route)
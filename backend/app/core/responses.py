@@ -0,0 +1,51 @@
+"""
+Fast JSON responses for trusted internal data.
+
+FastAPI validates returned content against the endpoint's response_model
+and then encodes it with the stdlib json module. For data the API built
+itself (query rows, analytics dicts) the validation repeats work already
+done, and json.dumps is several times slower than orjson. Returning a
+FastJSONResponse skips both. Enabled with FAST_JSON_RESPONSES.
+
+orjson is optional; without it the stdlib encoder is used, which still
+saves the validation pass.
+"""
+import json
+from datetime import date, datetime
+from typing import Any, List, Mapping, Sequence
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy scalars from the pandas analytics engine
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON. Naive datetimes are written without an offset, as Pydantic does."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def rows_to_dicts(rows: Sequence[Sequence[Any]], fields: Sequence[str]) -> List[dict]:
+    """Pair SQL row tuples with field names."""
+    return [dict(zip(fields, row)) for row in rows]
+
+def fast_json_response(content: Any, response: Response) -> FastJSONResponse:
+    """
+    Wrap content in a FastJSONResponse, keeping the headers dependencies
+    and the endpoint set on the injected response (e.g. the ETag).
+    """
+    headers: Mapping[str, str] = response.headers
+    return FastJSONResponse(content, status_code=response.status_code or 200, headers=headers)
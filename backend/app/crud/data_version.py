@@ -0,0 +1,24 @@
+"""
+Persistent per-user data version.
+
+Every workout or goal write bumps it in the same transaction, so unlike the
+in-memory versions keying the analytics cache it is shared by all workers
+and survives restarts. Response ETags are derived from it.
+"""
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.user import User
+
+def get_version(db: Session, user_id: int) -> Optional[int]:
+    """Current data version of a user, or None if the user doesn't exist."""
+    return db.query(User.data_version).filter(User.id == user_id).scalar()
+
+def bump(db: Session, user_id: int) -> None:
+    """Increment the user's data version. Committed by the caller along with the write."""
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
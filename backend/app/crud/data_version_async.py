@@ -0,0 +1,10 @@
+"""
+Async versions of the crud.data_version functions, run through AsyncSession.run_sync.
+"""
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import data_version as crud_data_version
+
+async def get_version(db: AsyncSession, user_id: int) -> Optional[int]:
+    """Current data version of a user, or None if the user doesn't exist."""
+    return await db.run_sync(crud_data_version.get_version, user_id)
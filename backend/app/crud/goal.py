@@ -1,12 +1,24 @@
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
+from app.crud import data_version as crud_data_version
+from app.crud import goal_progress as crud_goal_progress
 from app.models.goal import Goal
 from app.schemas.goal import GoalCreate, GoalUpdate
 
 def get_goals(db: Session, user_id: int) -> List[Goal]:
-    """Get all goals for a user."""
-    return db.query(Goal).filter(Goal.user_id == user_id).order_by(Goal.target_date).all()
+    """
+    Get all goals for a user with their progress. Goals not evaluated yet,
+    e.g. created before progress tracking, are computed in one batch here.
+    """
+    goals = db.query(Goal).filter(Goal.user_id == user_id).order_by(Goal.target_date).all()
+    pending = [goal.id for goal in goals if goal.progress_updated_at is None]
+    if pending:
+        # Lock, then re-check: another request may have evaluated them meanwhile
+        locked = db.query(Goal).filter(Goal.id.in_(pending)).order_by(Goal.id).with_for_update().populate_existing().all()
+        crud_goal_progress.refresh_goals(db, [goal for goal in locked if goal.progress_updated_at is None])
+        db.commit()
+    return goals
 
 def create_goal(db: Session, goal: GoalCreate, user_id: int) -> Goal:
     """Create a new goal."""
@@ -15,19 +27,33 @@ def create_goal(db: Session, goal: GoalCreate, user_id: int) -> Goal:
         user_id=user_id
     )
     db.add(db_goal)
+    crud_goal_progress.refresh_goals(db, [db_goal])
+    crud_data_version.bump(db, user_id)
     db.commit()
     db.refresh(db_goal)
     return db_goal
 
 def update_goal(db: Session, goal_id: int, goal: GoalUpdate, user_id: int) -> Optional[Goal]:
     """Update a goal."""
-    db_goal = db.query(Goal).filter(Goal.id == goal_id, Goal.user_id == user_id).first()
+    # Locked, since a retarget recomputes progress that imports also update
+    db_goal = db.query(Goal).filter(Goal.id == goal_id, Goal.user_id == user_id).with_for_update().first()
     if not db_goal:
         return None
     
-    for key, value in goal.model_dump(exclude_unset=True).items():
+    changes = goal.model_dump(exclude_unset=True)
+    retargeted = any(
+        key in changes and changes[key] != getattr(db_goal, key)
+        for key in ("type", "target", "target_date")
+    )
+    for key, value in changes.items():
         setattr(db_goal, key, value)
+    if retargeted:
+        # Progress toward the old target no longer applies, unless completion was set explicitly
+        if "completed" not in changes:
+            db_goal.completed = None
+        crud_goal_progress.refresh_goals(db, [db_goal])
     
+    crud_data_version.bump(db, user_id)
     db.commit()
     db.refresh(db_goal)
     return db_goal
@@ -39,5 +65,6 @@ def delete_goal(db: Session, goal_id: int, user_id: int) -> bool:
         return False
     
     db.delete(db_goal)
+    crud_data_version.bump(db, user_id)
     db.commit()
     return True 
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Async versions of the crud.goal functions, run through AsyncSession.run_sync.
+"""
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import goal as crud_goal
+from app.models.goal import Goal
+from app.schemas.goal import GoalCreate, GoalUpdate
+
+async def get_goals(db: AsyncSession, user_id: int) -> List[Goal]:
+    """Get all goals for a user."""
+    return await db.run_sync(crud_goal.get_goals, user_id)
+
+async def create_goal(db: AsyncSession, goal: GoalCreate, user_id: int) -> Goal:
+    """Create a new goal."""
+    return await db.run_sync(crud_goal.create_goal, goal, user_id)
+
+async def update_goal(db: AsyncSession, goal_id: int, goal: GoalUpdate, user_id: int) -> Optional[Goal]:
+    """Update a goal."""
+    return await db.run_sync(crud_goal.update_goal, goal_id, goal, user_id)
+
+async def delete_goal(db: AsyncSession, goal_id: int, user_id: int) -> bool:
+    """Delete a goal."""
+    return await db.run_sync(crud_goal.delete_goal, goal_id, user_id)
@@ -0,0 +1,108 @@
+"""
+Maintains goals' progress values.
+
+apply_workouts folds newly inserted workouts into the progress of the
+goals whose window contains them; refresh_goals recomputes goals from
+scratch with one query for all of them. Neither commits, so callers run
+them in the same transaction as the workout or goal write.
+
+Progress is a read-modify-write of goal rows, so the goals are read
+FOR UPDATE, in id order: concurrent imports for one user then fold one
+after the other instead of overwriting each other's progress.
+"""
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Iterable, List, Optional
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+from app.models.goal import Goal
+from app.models.workout import Workout, RUN_ACTIVITY_TYPES
+from app.services import goal_progress
+
+def _set_progress(goal: Goal, value: Optional[float]) -> None:
+    goal.progress_value = value
+    goal.progress = goal_progress.progress(goal.kind, value, goal.target_distance_mi, goal.target_seconds)
+
+def _fold_into(goal: Goal, workouts: Iterable[Any]) -> None:
+    """Fold workouts, in date order, into a goal and mark it completed when it crosses its target."""
+    goal_kind = goal.kind
+    value = goal.progress_value
+    completed = goal.completed
+    for workout in workouts:
+        value = goal_progress.fold(goal_kind, value, workout, goal.target_distance_mi)
+        if completed is None and goal_progress.achieved(goal_kind, value, goal.target_distance_mi, goal.target_seconds):
+            completed = workout.workout_date
+    _set_progress(goal, value)
+    goal.completed = completed
+
+def refresh_goals(db: Session, goals: List[Goal]) -> None:
+    """Re-parse the goals' targets and recompute their progress from their windows' runs."""
+    if not goals:
+        return
+    # Pending goals and edits must be visible to the query below
+    db.flush()
+
+    for goal in goals:
+        goal.target_distance_mi, goal.target_seconds = goal_progress.parse_target(goal.type, goal.target)
+        goal.kind = goal_progress.kind(goal.type, goal.target_distance_mi, goal.target_seconds)
+        _set_progress(goal, goal_progress.initial_value(goal.kind))
+
+    tracked = {goal.id: goal for goal in goals if goal.kind is not None}
+    if tracked:
+        window_start = func.date_trunc("day", Goal.date_created)
+        window_end = func.date_trunc("day", Goal.target_date) + timedelta(days=1)
+        rows = db.query(
+            Goal.id, Workout.workout_date, Workout.distance_mi,
+            Workout.workout_time_seconds, Workout.avg_pace_min_mi,
+        ).join(
+            Workout,
+            and_(
+                Workout.user_id == Goal.user_id,
+                Workout.activity_type.in_(RUN_ACTIVITY_TYPES),
+                Workout.workout_date >= window_start,
+                Workout.workout_date < window_end,
+            )
+        ).filter(
+            Goal.id.in_(list(tracked))
+        ).order_by(Goal.id, Workout.workout_date, Workout.id).all()
+        for goal_id, goal_rows in groupby(rows, key=lambda row: row[0]):
+            _fold_into(tracked[goal_id], goal_rows)
+
+    now = datetime.utcnow()
+    for goal in goals:
+        goal.progress_updated_at = now
+
+def refresh_user_goals(db: Session, user_id: int) -> None:
+    """Recompute every evaluated goal of a user, e.g. after workouts changed rather than being added."""
+    goals = db.query(Goal).filter(
+        Goal.user_id == user_id, Goal.progress_updated_at.isnot(None)
+    ).order_by(Goal.id).with_for_update().all()
+    refresh_goals(db, goals)
+
+def apply_workouts(db: Session, user_id: int, workouts: Iterable[Any]) -> None:
+    """
+    Fold newly inserted workouts into the user's evaluated goals.
+    Accepts Workout, WorkoutCreate or row objects.
+    """
+    runs = sorted(
+        (workout for workout in workouts if workout.activity_type in RUN_ACTIVITY_TYPES),
+        key=lambda workout: workout.workout_date
+    )
+    if not runs:
+        return
+
+    # Coarse overlap filter; exact windows are checked per goal below. Goals
+    # not evaluated yet are locked too, so a get_goals evaluating them waits
+    # for this import and then sees its workouts.
+    goals = db.query(Goal).filter(
+        Goal.user_id == user_id,
+        Goal.date_created <= runs[-1].workout_date + timedelta(days=1),
+        Goal.target_date >= runs[0].workout_date - timedelta(days=1),
+    ).order_by(Goal.id).with_for_update().all()
+    for goal in goals:
+        if goal.progress_updated_at is None or goal.kind is None:
+            continue
+        start, end = goal_progress.window(goal.date_created, goal.target_date)
+        in_window = [run for run in runs if start <= run.workout_date < end]
+        if in_window:
+            _fold_into(goal, in_window)
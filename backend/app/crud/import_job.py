@@ -0,0 +1,77 @@
+import uuid
+from typing import Any, Dict, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from app.models.import_job import ImportJob
+from app.schemas.workout import WorkoutImportResult
+
+def create_job(db: Session, job_id: str, user_id: int, filename: str) -> ImportJob:
+    db_job = ImportJob(id=job_id, user_id=user_id, filename=filename, status="queued", errors=[])
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def get_job(db: Session, job_id: str, user_id: int) -> Optional[ImportJob]:
+    return db.query(ImportJob).filter(ImportJob.id == job_id, ImportJob.user_id == user_id).first()
+
+def claim_next_job(db: Session, stale_after: timedelta) -> Optional[ImportJob]:
+    """
+    Atomically mark the oldest runnable job as running and return it.
+    Uses FOR UPDATE SKIP LOCKED so several workers, or processes sharing
+    IMPORT_STORAGE_DIR, can poll the same table. Running jobs whose
+    heartbeat is older than stale_after were abandoned by a dead worker and
+    are picked up again under a new claim token.
+    """
+    now = datetime.utcnow()
+    db_job = (
+        db.query(ImportJob)
+        .filter(or_(
+            ImportJob.status == "queued",
+            and_(ImportJob.status == "running", ImportJob.heartbeat_at < now - stale_after)
+        ))
+        .order_by(ImportJob.created_at)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if not db_job:
+        db.rollback()
+        return None
+    db_job.status = "running"
+    db_job.started_at = now
+    db_job.heartbeat_at = now
+    db_job.claim_token = uuid.uuid4().hex
+    db.commit()
+    return db_job
+
+def _update_claimed(db: Session, job_id: str, claim_token: str, values: Dict[str, Any]) -> bool:
+    """Write values if the job is still held under claim_token. Returns False if it was re-claimed."""
+    updated = db.query(ImportJob).filter(
+        ImportJob.id == job_id,
+        ImportJob.claim_token == claim_token,
+    ).update(values, synchronize_session=False)
+    db.commit()
+    return updated == 1
+
+def heartbeat(db: Session, job_id: str, claim_token: str) -> bool:
+    """Mark a claimed job alive. Returns False if another worker has re-claimed it."""
+    return _update_claimed(db, job_id, claim_token, {"heartbeat_at": datetime.utcnow()})
+
+def record_progress(db: Session, job_id: str, claim_token: str, result: WorkoutImportResult) -> bool:
+    return _update_claimed(db, job_id, claim_token, {
+        "total_rows": result.total_rows,
+        "rows_failed": result.failed,
+        "inserted": result.inserted,
+        "updated": result.updated,
+        "skipped": result.skipped,
+        "errors": [error.model_dump() for error in result.errors],
+        "heartbeat_at": datetime.utcnow(),
+    })
+
+def finish_job(db: Session, job_id: str, claim_token: str, error: Optional[str] = None) -> bool:
+    return _update_claimed(db, job_id, claim_token, {
+        "status": "failed" if error else "completed",
+        "error": error,
+        "finished_at": datetime.utcnow(),
+    })
@@ -0,0 +1,13 @@
+"""
+Async versions of the crud.import_job functions used by the API.
+"""
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import import_job as crud_import_job
+from app.models.import_job import ImportJob
+
+async def create_job(db: AsyncSession, job_id: str, user_id: int, filename: str) -> ImportJob:
+    return await db.run_sync(crud_import_job.create_job, job_id, user_id, filename)
+
+async def get_job(db: AsyncSession, job_id: str, user_id: int) -> Optional[ImportJob]:
+    return await db.run_sync(crud_import_job.get_job, job_id, user_id)
@@ -0,0 +1,137 @@
+"""
+Per-user, per-activity all-time bests.
+
+apply_workouts runs inside the transaction that inserts workouts. It
+reduces the batch to one candidate per (activity, category) and offers
+each one with INSERT ... ON CONFLICT DO UPDATE ... WHERE new-is-better,
+a compare-and-swap: the row lock taken by the conflict check makes
+concurrent imports for the same user serialize on the record, and a
+candidate only replaces a record it beats. The earliest workout wins ties.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, delete, func, insert, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models.personal_record import PersonalRecord
+from app.models.workout import Workout
+
+# category: (workout column, True when higher is better)
+CATEGORIES: Dict[str, Tuple[str, bool]] = {
+    "longest_distance": ("distance_mi", True),
+    "fastest_pace": ("avg_pace_min_mi", False),
+    "longest_duration": ("workout_time_seconds", True),
+    "most_calories": ("calories_burned", True),
+}
+
+_LOWER_IS_BETTER = [category for category, (_, higher) in CATEGORIES.items() if not higher]
+
+def _beats(value: float, workout_date: datetime, best: Tuple[float, datetime], higher: bool) -> bool:
+    best_value, best_date = best
+    if value == best_value:
+        return workout_date < best_date
+    return value > best_value if higher else value < best_value
+
+def apply_workouts(db: Session, user_id: int, workouts: Iterable[Any]) -> None:
+    """
+    Offer newly inserted workouts as records. They need their ids, so pass
+    flushed Workout objects or rows returned by the insert. Does not commit.
+    Only positive values count, the same rule rebuild_records applies.
+    """
+    candidates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for workout in workouts:
+        for category, (column, higher) in CATEGORIES.items():
+            value = getattr(workout, column)
+            if value is None or value <= 0:
+                continue
+            key = (workout.activity_type, category)
+            best = candidates.get(key)
+            if best is None or _beats(value, workout.workout_date, (best["value"], best["workout_date"]), higher):
+                candidates[key] = {
+                    "user_id": user_id,
+                    "activity_type": workout.activity_type,
+                    "category": category,
+                    "value": float(value),
+                    "workout_id": workout.id,
+                    "workout_date": workout.workout_date,
+                }
+    if not candidates:
+        return
+
+    stmt = pg_insert(PersonalRecord).values(list(candidates.values()))
+    excluded = stmt.excluded
+    lower_is_better = PersonalRecord.category.in_(_LOWER_IS_BETTER)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PersonalRecord.user_id, PersonalRecord.activity_type, PersonalRecord.category],
+        set_={
+            "value": excluded.value,
+            "workout_id": excluded.workout_id,
+            "workout_date": excluded.workout_date,
+            "updated_at": func.now(),
+        },
+        where=or_(
+            and_(lower_is_better, excluded.value < PersonalRecord.value),
+            and_(~lower_is_better, excluded.value > PersonalRecord.value),
+            and_(excluded.value == PersonalRecord.value, excluded.workout_date < PersonalRecord.workout_date),
+        )
+    )
+    db.execute(stmt)
+
+def rebuild_records(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recompute records from the workouts table, for one user or everyone.
+    Used when existing workouts change, where a candidate can't lower a
+    record. Does not commit. Returns the number of records written.
+    """
+    clear = delete(PersonalRecord)
+    if user_id is not None:
+        clear = clear.where(PersonalRecord.user_id == user_id)
+    db.execute(clear)
+
+    written = 0
+    for category, (column_name, higher) in CATEGORIES.items():
+        column = getattr(Workout, column_name)
+        source = select(
+            Workout.user_id,
+            Workout.activity_type,
+            literal(category),
+            column,
+            Workout.id,
+            Workout.workout_date,
+        ).where(
+            Workout.user_id.isnot(None),
+            column > 0,
+        ).distinct(
+            Workout.user_id, Workout.activity_type
+        ).order_by(
+            Workout.user_id, Workout.activity_type,
+            column.desc() if higher else column.asc(),
+            Workout.workout_date, Workout.id,
+        )
+        if user_id is not None:
+            source = source.where(Workout.user_id == user_id)
+        result = db.execute(insert(PersonalRecord).from_select(
+            ["user_id", "activity_type", "category", "value", "workout_id", "workout_date"], source
+        ))
+        written += result.rowcount
+    return written
+
+def get_records(db: Session, user_id: int, activity_types: Optional[Sequence[str]] = None) -> List[PersonalRecord]:
+    """A user's records, read by primary key prefix; at most one row per activity and category."""
+    query = db.query(PersonalRecord).filter(PersonalRecord.user_id == user_id)
+    if activity_types:
+        query = query.filter(PersonalRecord.activity_type.in_(activity_types))
+    return query.order_by(PersonalRecord.activity_type, PersonalRecord.category).all()
+
+def best_record(
+    records: Iterable[PersonalRecord], category: str
+) -> Optional[Tuple[float, datetime]]:
+    """The best of a category among records, e.g. across 'Run' and 'Running'."""
+    _, higher = CATEGORIES[category]
+    best = None
+    for record in records:
+        if record.category != category:
+            continue
+        if best is None or _beats(record.value, record.workout_date, best, higher):
+            best = (record.value, record.workout_date)
+    return best
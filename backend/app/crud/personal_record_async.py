@@ -0,0 +1,12 @@
+"""
+Async versions of the crud.personal_record reads, run through AsyncSession.run_sync.
+"""
+from typing import List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import personal_record as crud_personal_record
+from app.models.personal_record import PersonalRecord
+
+async def get_records(
+    db: AsyncSession, user_id: int, activity_types: Optional[Sequence[str]] = None
+) -> List[PersonalRecord]:
+    return await db.run_sync(crud_personal_record.get_records, user_id, activity_types)
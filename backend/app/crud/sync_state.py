@@ -0,0 +1,50 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.models.sync_state import SyncState
+
+def get_state(db: Session, user_id: int, provider: str) -> Optional[SyncState]:
+    return db.query(SyncState).filter(SyncState.user_id == user_id, SyncState.provider == provider).first()
+
+def connect(db: Session, user_id: int, provider: str, remote_user_id: str, access_token: str) -> SyncState:
+    """
+    Store a user's provider credentials.
+    Connecting a different remote account starts the cursor over.
+    """
+    db_state = get_state(db, user_id, provider)
+    if db_state is None:
+        db_state = SyncState(user_id=user_id, provider=provider, status="idle", workouts_synced=0)
+        db.add(db_state)
+    elif db_state.remote_user_id != remote_user_id:
+        db_state.cursor = None
+        db_state.workouts_synced = 0
+    db_state.remote_user_id = remote_user_id
+    db_state.access_token = access_token
+    db_state.error = None
+    db.commit()
+    db.refresh(db_state)
+    return db_state
+
+def start_sync(db: Session, db_state: SyncState) -> None:
+    db_state.status = "running"
+    db_state.error = None
+    db.commit()
+
+def finish_sync(
+    db: Session,
+    db_state: SyncState,
+    cursor: Optional[datetime] = None,
+    synced: int = 0,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Record the outcome of a sync. The cursor only moves forward, and only
+    on success, so a failed sync is retried from the same point.
+    """
+    db_state.status = "failed" if error else "completed"
+    db_state.error = error
+    db_state.workouts_synced = (db_state.workouts_synced or 0) + synced
+    if not error and cursor is not None and (db_state.cursor is None or cursor > db_state.cursor):
+        db_state.cursor = cursor
+    db_state.last_synced_at = datetime.utcnow()
+    db.commit()
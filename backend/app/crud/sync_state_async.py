@@ -0,0 +1,26 @@
+"""
+Async versions of the crud.sync_state functions.
+"""
+from typing import Optional
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import sync_state as crud_sync_state
+from app.models.sync_state import SyncState
+
+async def get_state(db: AsyncSession, user_id: int, provider: str) -> Optional[SyncState]:
+    return await db.run_sync(crud_sync_state.get_state, user_id, provider)
+
+async def connect(db: AsyncSession, user_id: int, provider: str, remote_user_id: str, access_token: str) -> SyncState:
+    return await db.run_sync(crud_sync_state.connect, user_id, provider, remote_user_id, access_token)
+
+async def start_sync(db: AsyncSession, db_state: SyncState) -> None:
+    await db.run_sync(crud_sync_state.start_sync, db_state)
+
+async def finish_sync(
+    db: AsyncSession,
+    db_state: SyncState,
+    cursor: Optional[datetime] = None,
+    synced: int = 0,
+    error: Optional[str] = None,
+) -> None:
+    await db.run_sync(crud_sync_state.finish_sync, db_state, cursor, synced, error)
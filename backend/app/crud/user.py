@@ -2,6 +2,7 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
+from app.core.cache import principal_cache
 from app.core.security import get_password_hash, verify_password
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -11,9 +12,13 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
 
 def create_user(db: Session, user_in: UserCreate) -> User:
+    return create_user_with_hash(db, user_in, get_password_hash(user_in.password))
+
+def create_user_with_hash(db: Session, user_in: UserCreate, hashed_password: str) -> User:
+    """Create a user from an already hashed password."""
     db_user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
         is_active=True,
     )
@@ -35,6 +40,7 @@ def update_user(db: Session, db_user: User, user_in: UserUpdate) -> User:
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    principal_cache.pop(db_user.id)
     return db_user
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
@@ -43,4 +49,10 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         return None
     if not verify_password(password, user.hashed_password):
         return None
-    return user 
\ No newline at end of file
+    return user
+
+def set_password_hash(db: Session, db_user: User, hashed_password: str) -> User:
+    """Store a rehashed password without touching anything else."""
+    db_user.hashed_password = hashed_password
+    db.commit()
+    return db_user
\ No newline at end of file
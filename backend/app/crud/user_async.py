@@ -0,0 +1,34 @@
+"""
+Async user functions for the auth endpoints.
+
+Password hashing and verification run on core.security.password_hash_pool,
+so bcrypt never occupies the event loop or the request threadpool.
+"""
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import security
+from app.crud import user as crud_user
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return await db.run_sync(crud_user.get_user_by_email, email)
+
+async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
+    hashed_password = await security.get_password_hash_async(user_in.password)
+    return await db.run_sync(crud_user.create_user_with_hash, user_in, hashed_password)
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """
+    Check credentials, rehashing the stored password if its cost is outdated.
+    Raises security.PasswordHashPoolFull when the hashing pool is saturated.
+    """
+    user = await get_user_by_email(db, email=email)
+    if not user:
+        return None
+    valid, new_hash = await security.verify_and_update_password_async(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        await db.run_sync(crud_user.set_password_hash, user, new_hash)
+    return user
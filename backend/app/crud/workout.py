@@ -1,13 +1,66 @@
-from typing import List, Optional, Tuple
-from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
-from app.models.workout import Workout
-from app.schemas.workout import WorkoutCreate
+import base64
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import Date, and_, or_, desc, asc, func, case, cast, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.cache import data_versions
+from app.core.config import settings
+from app.crud import data_version as crud_data_version
+from app.crud import goal_progress as crud_goal_progress
+from app.crud import personal_record as crud_personal_record
+from app.crud import workout_rollup as crud_rollup
+from app.models.workout import Workout, MISSING_DISTANCE_KEY, RUN_ACTIVITY_TYPES
+from app.schemas.workout import Workout as WorkoutSchema, WorkoutCreate
+from app.services import analytics
+
+# The columns of the Workout response schema, in its field order
+WORKOUT_RESPONSE_COLUMNS = [getattr(Workout, name) for name in WorkoutSchema.model_fields]
 
 def get_workout(db: Session, workout_id: int) -> Optional[Workout]:
     return db.query(Workout).filter(Workout.id == workout_id).first()
 
+def encode_cursor(sort_by: str, sort_order: str, value: Any, workout_id: int) -> str:
+    """Build an opaque keyset cursor from the last row's sort value and id."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort_by, "o": sort_order, "v": value, "id": workout_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[Any, int]:
+    """
+    Return the (sort value, id) encoded in cursor.
+    Raises ValueError if the cursor is malformed or was issued for another sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        issued_for = (payload["s"], payload["o"])
+        value, workout_id = payload["v"], int(payload["id"])
+        if sort_by == "workout_date" and value is not None:
+            value = datetime.fromisoformat(value)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if issued_for != (sort_by, sort_order):
+        raise ValueError("Cursor does not match the requested sort")
+    return value, workout_id
+
+def _after_cursor(column, sort_order: str, value: Any, workout_id: int):
+    """
+    Keyset condition for rows after (value, workout_id).
+    Follows PostgreSQL's default NULL placement so the per-user indexes
+    can serve the ORDER BY: NULLs sort last ascending and first descending.
+    """
+    if sort_order == "asc":
+        if value is None:
+            return and_(column.is_(None), Workout.id > workout_id)
+        return or_(tuple_(column, Workout.id) > tuple_(value, workout_id), column.is_(None))
+    if value is None:
+        return or_(and_(column.is_(None), Workout.id < workout_id), column.isnot(None))
+    # Row comparison is NULL for NULL values, which sort before the cursor here
+    return tuple_(column, Workout.id) < tuple_(value, workout_id)
+
 def get_workouts_by_user(
     db: Session,
     user_id: int,
@@ -15,28 +68,388 @@ def get_workouts_by_user(
     limit: int = 10,
     sort_by: Optional[str] = None,
     sort_order: str = "desc",
-    activity_type: Optional[str] = None
-) -> Tuple[List[Workout], int]:
-    query = db.query(Workout).filter(Workout.user_id == user_id)
+    activity_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    as_rows: bool = False,
+) -> Tuple[List[Any], Optional[int], Optional[str]]:
+    """
+    Return a page of workouts, the total (or None) and the cursor for the next page.
+    When cursor is given, skip is ignored and the page starts right after the
+    cursor's row, so deep pages cost the same as the first one.
+    With as_rows, the page holds plain rows of the API's workout fields
+    instead of Workout objects, skipping ORM identity-map overhead.
+    """
+    entities = WORKOUT_RESPONSE_COLUMNS if as_rows else [Workout]
+    query = db.query(*entities).filter(Workout.user_id == user_id)
     
     if activity_type:
         query = query.filter(Workout.activity_type == activity_type)
     
-    # Get total count before applying pagination
-    total = query.count()
+    total = None
+    if include_total:
+        if cursor is not None:
+            # Rollups hold per-day counts, which is far cheaper than COUNT(*) on deep pages
+            total = crud_rollup.count_workouts(db, user_id, activity_type)
+        else:
+            # Get total count before applying pagination
+            total = query.count()
     
-    # Apply sorting
-    if sort_by:
-        order_func = desc if sort_order == "desc" else asc
-        query = query.order_by(order_func(getattr(Workout, sort_by)))
-    else:
-        # Default sort by workout date descending
-        query = query.order_by(desc(Workout.workout_date))
+    # Default sort by workout date descending
+    if not sort_by:
+        sort_by, sort_order = "workout_date", "desc"
+    column = getattr(Workout, sort_by)
+    order_func = desc if sort_order == "desc" else asc
+    # id breaks ties so every row has a stable position
+    query = query.order_by(order_func(column), order_func(Workout.id))
     
     # Apply pagination
-    query = query.offset(skip).limit(limit)
+    if cursor is not None:
+        value, last_id = decode_cursor(cursor, sort_by, sort_order)
+        query = query.filter(_after_cursor(column, sort_order, value, last_id))
+    else:
+        query = query.offset(skip)
+    workouts = query.limit(limit + 1).all()
     
-    return query.all(), total
+    next_cursor = None
+    if len(workouts) > limit:
+        workouts = workouts[:limit]
+        last = workouts[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.id)
+    
+    return workouts, total, next_cursor
+
+def _runs_in_range(
+    query: Query,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Query:
+    query = query.filter(
+        Workout.user_id == user_id,
+        Workout.activity_type.in_(RUN_ACTIVITY_TYPES)
+    )
+    if start_date is not None:
+        query = query.filter(Workout.workout_date >= start_date)
+    if end_date is not None:
+        query = query.filter(Workout.workout_date <= end_date)
+    return query
+
+def _day_range(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> Optional[Tuple[Optional[date], Optional[date]]]:
+    """
+    Return the range as whole days when it starts at midnight and ends at
+    the last microsecond of a day, so it can be answered from rollups.
+    Returns None for ranges that split a day.
+    """
+    if start_date is not None and start_date.time() != time.min:
+        return None
+    if end_date is not None and end_date.time() != time.max:
+        return None
+    return (
+        start_date.date() if start_date is not None else None,
+        end_date.date() if end_date is not None else None,
+    )
+
+# Paces of 0 come from empty CSV cells and are treated as missing
+_valid_pace = Workout.avg_pace_min_mi != 0
+
+def _run_totals(db: Session, user_id: int, start_date: Optional[datetime], end_date: Optional[datetime]):
+    return _runs_in_range(
+        db.query(
+            func.count(Workout.id).label("total_runs"),
+            func.coalesce(func.sum(Workout.distance_mi), 0).label("total_distance"),
+            func.max(Workout.distance_mi).label("longest_run"),
+            func.min(Workout.avg_pace_min_mi).filter(_valid_pace).label("best_pace"),
+            func.avg(Workout.avg_pace_min_mi).filter(_valid_pace).label("avg_pace"),
+            func.coalesce(func.sum(Workout.workout_time_seconds), 0).label("total_time"),
+        ),
+        user_id, start_date, end_date
+    ).one()
+
+def _weekly_mileage(
+    db: Session, user_id: int, start_date: Optional[datetime], end_date: Optional[datetime]
+) -> List[Tuple[date, float]]:
+    week = func.date_trunc("week", Workout.workout_date).label("week")
+    rows = _runs_in_range(
+        db.query(week, func.coalesce(func.sum(Workout.distance_mi), 0)),
+        user_id, start_date, end_date
+    ).group_by(week).order_by(week).all()
+    return [(week_start.date(), float(distance)) for week_start, distance in rows]
+
+def _longest_run(
+    db: Session, user_id: int, start_date: Optional[datetime], end_date: Optional[datetime]
+) -> Optional[Tuple[float, date]]:
+    row = _runs_in_range(
+        db.query(Workout.distance_mi, Workout.workout_date),
+        user_id, start_date, end_date
+    ).filter(Workout.distance_mi.isnot(None)).order_by(
+        Workout.distance_mi.desc(), Workout.workout_date.asc()
+    ).first()
+    return (row[0], row[1].date()) if row else None
+
+def _best_pace(
+    db: Session, user_id: int, start_date: Optional[datetime], end_date: Optional[datetime]
+) -> Optional[Tuple[float, date]]:
+    row = _runs_in_range(
+        db.query(Workout.avg_pace_min_mi, Workout.workout_date),
+        user_id, start_date, end_date
+    ).filter(_valid_pace).order_by(
+        Workout.avg_pace_min_mi.asc(), Workout.workout_date.asc()
+    ).first()
+    return (row[0], row[1].date()) if row else None
+
+def _pace_zones(
+    db: Session,
+    user_id: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    avg_pace: float,
+) -> Dict[str, int]:
+    # Like the original loop, runs logged with a pace of 0 are excluded from
+    # the average but still counted, in the tempo zone
+    pace = Workout.avg_pace_min_mi
+    zones = _runs_in_range(
+        db.query(
+            func.sum(case((pace > avg_pace * 1.1, 1), else_=0)),
+            func.sum(case((pace <= avg_pace * 0.9, 1), else_=0)),
+            func.count(pace),
+        ),
+        user_id, start_date, end_date
+    ).one()
+    easy, tempo, paced_runs = (int(value or 0) for value in zones)
+    return {"easy": easy, "moderate": paced_runs - easy - tempo, "tempo": tempo}
+
+def _record_day(record: Optional[Tuple[float, datetime]]) -> Optional[Tuple[float, date]]:
+    return (record[0], record[1].date()) if record else None
+
+def get_workout_summary(
+    db: Session,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Compute the dashboard run summary in the database.
+    Whole-day ranges are answered from workout_rollups; only the pace zones
+    need the raw workouts. All-time achievements come from personal_records.
+    No Workout objects are loaded either way.
+    """
+    if settings.ANALYTICS_ENGINE == "pandas":
+        return analytics.get_workout_summary(db, user_id, start_date, end_date)
+
+    day_range = _day_range(start_date, end_date)
+    if day_range is not None:
+        totals = crud_rollup.get_run_totals(db, user_id, *day_range)
+    else:
+        totals = _run_totals(db, user_id, start_date, end_date)
+
+    total_runs = int(totals.total_runs)
+    if not total_runs:
+        return {
+            "total_runs": 0,
+            "total_distance": 0,
+            "avg_distance": 0,
+            "longest_run": 0,
+            "best_pace": None,
+            "avg_pace": None,
+            "total_time": 0,
+            "weekly_mileage": [],
+            "recent_achievements": [],
+            "pace_zones": {"easy": 0, "moderate": 0, "tempo": 0}
+        }
+
+    if start_date is None and end_date is None:
+        # All-time bests are kept in personal_records
+        weekly = crud_rollup.get_weekly_mileage(db, user_id)
+        records = crud_personal_record.get_records(db, user_id, RUN_ACTIVITY_TYPES)
+        longest = _record_day(crud_personal_record.best_record(records, "longest_distance"))
+        fastest = _record_day(crud_personal_record.best_record(records, "fastest_pace"))
+    elif day_range is not None:
+        weekly = crud_rollup.get_weekly_mileage(db, user_id, *day_range)
+        longest = crud_rollup.get_longest_run(db, user_id, *day_range)
+        fastest = crud_rollup.get_best_pace(db, user_id, *day_range)
+    else:
+        weekly = _weekly_mileage(db, user_id, start_date, end_date)
+        longest = _longest_run(db, user_id, start_date, end_date)
+        fastest = _best_pace(db, user_id, start_date, end_date)
+
+    total_distance = float(totals.total_distance)
+    avg_pace = float(totals.avg_pace) if totals.avg_pace is not None else None
+
+    # Weekly mileage, weeks start on Monday
+    weekly_mileage = [
+        {"week": str(week_start), "distance": distance}
+        for week_start, distance in weekly
+    ]
+
+    # Achievements, earliest workout wins ties
+    recent_achievements = []
+    if longest:
+        recent_achievements.append({
+            "type": "Longest Run",
+            "value": f"{longest[0]:.2f} miles",
+            "date": str(longest[1])
+        })
+    if fastest:
+        recent_achievements.append({
+            "type": "Best Pace",
+            "value": f"{fastest[0]:.2f} min/mi",
+            "date": str(fastest[1])
+        })
+
+    # Pace zones relative to the average pace
+    pace_zones = {"easy": 0, "moderate": 0, "tempo": 0}
+    if avg_pace is not None:
+        pace_zones = _pace_zones(db, user_id, start_date, end_date, avg_pace)
+
+    return {
+        "total_runs": total_runs,
+        "total_distance": total_distance,
+        "avg_distance": total_distance / total_runs,
+        "longest_run": float(totals.longest_run or 0),
+        "best_pace": float(totals.best_pace) if totals.best_pace is not None else None,
+        "avg_pace": avg_pace,
+        "total_time": int(totals.total_time),
+        "weekly_mileage": weekly_mileage,
+        "recent_achievements": recent_achievements,
+        "pace_zones": pace_zones
+    }
+
+# Metrics the trends endpoint can chart
+TREND_METRICS = ("distance", "pace", "time", "count", "max_distance", "heart_rate")
+# Metrics that read 0, rather than missing, for a period without runs
+ADDITIVE_TREND_METRICS = {"distance", "time", "count"}
+# Upper bound on the periods a zero-filled series may have
+MAX_FILLED_PERIODS = 10000
+
+def _trend_value(metric: str):
+    if metric == "distance":
+        return func.coalesce(func.sum(Workout.distance_mi), 0)
+    if metric == "pace":
+        return func.avg(Workout.avg_pace_min_mi).filter(_valid_pace)
+    if metric == "time":
+        return func.coalesce(func.sum(Workout.workout_time_seconds), 0)
+    if metric == "count":
+        return func.count(Workout.id)
+    if metric == "max_distance":
+        return func.max(Workout.distance_mi)
+    # heart_rate
+    return func.avg(Workout.avg_heart_rate)
+
+def _period_start(day: date, group_by: str) -> date:
+    if group_by == "week":
+        return day - timedelta(days=day.weekday())
+    if group_by == "month":
+        return day.replace(day=1)
+    return day
+
+def _next_period(period: date, group_by: str) -> date:
+    if group_by == "week":
+        return period + timedelta(days=7)
+    if group_by == "month":
+        return (period.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return period + timedelta(days=1)
+
+def _fill_periods(
+    rows: List[Tuple[date, Tuple[Any, ...]]],
+    metrics: List[str],
+    group_by: str,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> List[Tuple[date, Tuple[Any, ...]]]:
+    """Add the periods without runs between the range bounds, or the data's first and last period."""
+    first = start_date.date() if start_date is not None else (rows[0][0] if rows else None)
+    last = end_date.date() if end_date is not None else (rows[-1][0] if rows else None)
+    if first is None or last is None:
+        return rows
+    first, last = _period_start(first, group_by), _period_start(last, group_by)
+
+    empty = tuple(0 if metric in ADDITIVE_TREND_METRICS else None for metric in metrics)
+    by_period = dict(rows)
+    filled = []
+    period = first
+    while period <= last:
+        if len(filled) == MAX_FILLED_PERIODS:
+            raise ValueError(f"Range has more than {MAX_FILLED_PERIODS} periods to fill")
+        filled.append((period, by_period.get(period, empty)))
+        period = _next_period(period, group_by)
+    return filled
+
+def _trend_number(metric: str, value: Any) -> Any:
+    if value is None:
+        return None
+    return int(value) if metric == "count" else float(value)
+
+def get_trend_series(
+    db: Session,
+    user_id: int,
+    metrics: List[str],
+    group_by: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fill_empty: bool = False,
+) -> Dict[str, Any]:
+    """
+    Per-period values of several run metrics, computed in one grouped query.
+    Returns {"periods": [...], "series": {metric: [...]}} with every series
+    aligned to periods. Periods without runs are left out unless fill_empty
+    is set; then additive metrics read 0 for them and averages and maxima None.
+    Raises ValueError when filling would produce more than MAX_FILLED_PERIODS.
+    """
+    if settings.ANALYTICS_ENGINE == "pandas":
+        rows = analytics.get_trend_rows(db, user_id, metrics, group_by, start_date, end_date)
+    else:
+        day_range = _day_range(start_date, end_date)
+        if day_range is not None:
+            rows = crud_rollup.get_trends(db, user_id, metrics, group_by, *day_range)
+        else:
+            if group_by == "day":
+                period = cast(Workout.workout_date, Date)
+            else:  # week or month
+                period = func.date_trunc(group_by, Workout.workout_date)
+            period = period.label("period")
+
+            rows = [
+                (row[0].date() if isinstance(row[0], datetime) else row[0], tuple(row[1:]))
+                for row in _runs_in_range(
+                    db.query(period, *(_trend_value(metric) for metric in metrics)),
+                    user_id, start_date, end_date
+                ).group_by(period).order_by(period).all()
+            ]
+
+    if fill_empty:
+        rows = _fill_periods(rows, metrics, group_by, start_date, end_date)
+
+    return {
+        "periods": [period.strftime('%Y-%m-%d') for period, _ in rows],
+        "series": {
+            metric: [_trend_number(metric, values[i]) for _, values in rows]
+            for i, metric in enumerate(metrics)
+        },
+    }
+
+def get_workout_trends(
+    db: Session,
+    user_id: int,
+    metric: str,
+    group_by: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fill_empty: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Per-period values of one run metric, ordered by period.
+    Periods without a value (e.g. no recorded pace) are omitted.
+    """
+    series = get_trend_series(db, user_id, [metric], group_by, start_date, end_date, fill_empty)
+    return [
+        {"period": period, "value": value}
+        for period, value in zip(series["periods"], series["series"][metric])
+        if value is not None
+    ]
 
 def get_workouts_in_date_range(
     db: Session,
@@ -63,17 +476,135 @@ def create_workout(db: Session, workout: WorkoutCreate, user_id: int) -> Workout
         user_id=user_id
     )
     db.add(db_workout)
+    # The id is needed by the personal records
+    db.flush()
+    crud_rollup.apply_workouts(db, user_id, [workout])
+    crud_goal_progress.apply_workouts(db, user_id, [workout])
+    crud_personal_record.apply_workouts(db, user_id, [db_workout])
+    crud_data_version.bump(db, user_id)
     db.commit()
+    data_versions.bump(user_id)
     db.refresh(db_workout)
     return db_workout
 
-def create_workouts_bulk(db: Session, workouts: List[WorkoutCreate], user_id: int) -> List[Workout]:
-    db_workouts = [
-        Workout(**workout.model_dump(), user_id=user_id)
-        for workout in workouts
-    ]
-    db.add_all(db_workouts)
+class BulkUpsertResult(NamedTuple):
+    workouts: List[Workout]  # Inserted and updated rows
+    inserted: int
+    updated: int
+    skipped: int  # Unchanged rows and duplicates within the batch
+
+# Columns refreshed when an import matches an existing workout
+_UPSERT_COLUMNS = [
+    "workout_date", "activity_type", "calories_burned", "distance_mi",
+    "workout_time_seconds", "avg_pace_min_mi", "max_pace_min_mi", "avg_speed_mph",
+    "max_speed_mph", "avg_heart_rate", "steps", "notes", "source", "external_link",
+]
+
+# Must match the expressions of uq_workouts_user_id_date_activity_distance.
+# The constant is rendered inline: ON CONFLICT can't infer an index from a bound parameter.
+_UNLINKED_KEY = [
+    "user_id", "workout_date", "activity_type",
+    func.coalesce(Workout.__table__.c.distance_mi, literal_column(str(MISSING_DISTANCE_KEY))),
+]
+
+def _natural_key(row: Dict[str, Any]) -> Tuple:
+    if row["external_link"] is not None:
+        return ("link", row["external_link"])
+    return ("fields", row["workout_date"], row["activity_type"], row["distance_mi"])
+
+def _upsert(db: Session, rows: List[Dict[str, Any]], conflict_columns: List[Any], linked: bool) -> List[Any]:
+    """
+    Run one INSERT ... ON CONFLICT DO UPDATE against a natural-key index.
+    Conflicting rows are only rewritten when a value actually changed, and
+    only written rows come back, each flagged as inserted or updated.
+    """
+    if not rows:
+        return []
+    table = Workout.__table__
+    stmt = pg_insert(table)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[name] if isinstance(name, str) else name for name in conflict_columns],
+        index_where=table.c.external_link.isnot(None) if linked else table.c.external_link.is_(None),
+        set_={name: excluded[name] for name in _UPSERT_COLUMNS},
+        where=or_(*(table.c[name].is_distinct_from(excluded[name]) for name in _UPSERT_COLUMNS)),
+    ).returning(*table.c, literal_column("(xmax = 0)").label("inserted"))
+    return db.execute(stmt, rows).all()
+
+def upsert_workouts_bulk(db: Session, workouts: List[WorkoutCreate], user_id: int) -> BulkUpsertResult:
+    """
+    Insert workouts, updating existing ones that share their natural key:
+    the external link when present, otherwise (date, activity, distance).
+    Re-importing an unchanged export writes nothing.
+    """
+    # Later duplicates of a natural key win, as a re-import of the same row would
+    by_key: Dict[Tuple, Dict[str, Any]] = {}
+    for workout in workouts:
+        row = {**workout.model_dump(), "user_id": user_id}
+        row["external_link"] = row["external_link"] or None
+        by_key[_natural_key(row)] = row
+    rows = list(by_key.values())
+
+    linked = [row for row in rows if row["external_link"] is not None]
+    unlinked = [row for row in rows if row["external_link"] is None]
+
+    # Linked workouts may change date or activity, so note their current rollup keys
+    stale_keys = set()
+    if linked:
+        stale_keys = {
+            (workout_date.date(), activity_type)
+            for workout_date, activity_type in db.query(Workout.workout_date, Workout.activity_type).filter(
+                Workout.user_id == user_id,
+                Workout.external_link.in_([row["external_link"] for row in linked])
+            )
+        }
+
+    written = (
+        _upsert(db, linked, ["user_id", "external_link"], linked=True)
+        + _upsert(db, unlinked, _UNLINKED_KEY, linked=False)
+    )
+    inserted_rows = [row for row in written if row.inserted]
+    updated_rows = [row for row in written if not row.inserted]
+
+    # Days holding an updated workout are recomputed, which also counts any
+    # workout inserted on them; inserts on every other day are added as deltas
+    refreshed_keys = set()
+    if updated_rows:
+        refreshed_keys = stale_keys | {(row.workout_date.date(), row.activity_type) for row in updated_rows}
+        crud_rollup.refresh_days(db, user_id, refreshed_keys)
+    crud_rollup.apply_workouts(
+        db,
+        user_id,
+        [row for row in inserted_rows if (row.workout_date.date(), row.activity_type) not in refreshed_keys]
+    )
+    if updated_rows:
+        # Changed workouts may have held a record or counted toward a goal
+        crud_goal_progress.refresh_user_goals(db, user_id)
+        crud_personal_record.rebuild_records(db, user_id)
+    else:
+        crud_goal_progress.apply_workouts(db, user_id, inserted_rows)
+        crud_personal_record.apply_workouts(db, user_id, inserted_rows)
+    if written:
+        crud_data_version.bump(db, user_id)
     db.commit()
-    for workout in db_workouts:
-        db.refresh(workout)
-    return db_workouts 
\ No newline at end of file
+    if written:
+        data_versions.bump(user_id)
+
+    columns = [column.name for column in Workout.__table__.c]
+    return BulkUpsertResult(
+        workouts=[Workout(**{name: row._mapping[name] for name in columns}) for row in written],
+        inserted=len(inserted_rows),
+        updated=len(updated_rows),
+        skipped=len(workouts) - len(written),
+    )
+
+def create_workouts_bulk(db: Session, workouts: List[WorkoutCreate], user_id: int) -> List[Workout]:
+    """
+    Insert many workouts in a few multi-row INSERT ... ON CONFLICT statements.
+    Generated ids and defaults come back from the INSERT itself, so no
+    per-row SELECT is needed. Returns the inserted and updated workouts,
+    detached and fully populated.
+    """
+    if not workouts:
+        return []
+    return upsert_workouts_bulk(db, workouts, user_id).workouts
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Async versions of the crud.workout functions.
+
+Each function runs its synchronous counterpart through AsyncSession.run_sync,
+so the queries are shared with the sync path while the database I/O happens
+on asyncpg without blocking the event loop.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import workout as crud_workout
+from app.models.workout import Workout
+from app.schemas.workout import WorkoutCreate
+
+async def get_workout(db: AsyncSession, workout_id: int) -> Optional[Workout]:
+    return await db.run_sync(crud_workout.get_workout, workout_id)
+
+async def get_workouts_by_user(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: Optional[str] = None,
+    sort_order: str = "desc",
+    activity_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    as_rows: bool = False,
+) -> Tuple[List[Any], Optional[int], Optional[str]]:
+    return await db.run_sync(
+        crud_workout.get_workouts_by_user,
+        user_id,
+        skip=skip,
+        limit=limit,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        activity_type=activity_type,
+        cursor=cursor,
+        include_total=include_total,
+        as_rows=as_rows
+    )
+
+async def get_workouts_in_date_range(
+    db: AsyncSession,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> List[Workout]:
+    return await db.run_sync(crud_workout.get_workouts_in_date_range, user_id, start_date, end_date)
+
+async def get_workout_summary(
+    db: AsyncSession,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    return await db.run_sync(crud_workout.get_workout_summary, user_id, start_date, end_date)
+
+async def get_workout_trends(
+    db: AsyncSession,
+    user_id: int,
+    metric: str,
+    group_by: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fill_empty: bool = False,
+) -> List[Dict[str, Any]]:
+    return await db.run_sync(
+        crud_workout.get_workout_trends, user_id, metric, group_by, start_date, end_date, fill_empty
+    )
+
+async def get_trend_series(
+    db: AsyncSession,
+    user_id: int,
+    metrics: List[str],
+    group_by: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fill_empty: bool = False,
+) -> Dict[str, Any]:
+    return await db.run_sync(
+        crud_workout.get_trend_series, user_id, metrics, group_by, start_date, end_date, fill_empty
+    )
+
+async def create_workout(db: AsyncSession, workout: WorkoutCreate, user_id: int) -> Workout:
+    return await db.run_sync(crud_workout.create_workout, workout, user_id)
+
+async def create_workouts_bulk(db: AsyncSession, workouts: List[WorkoutCreate], user_id: int) -> List[Workout]:
+    return await db.run_sync(crud_workout.create_workouts_bulk, workouts, user_id)
+
+async def upsert_workouts_bulk(
+    db: AsyncSession, workouts: List[WorkoutCreate], user_id: int
+) -> crud_workout.BulkUpsertResult:
+    return await db.run_sync(crud_workout.upsert_workouts_bulk, workouts, user_id)
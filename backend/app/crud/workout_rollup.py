@@ -0,0 +1,260 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from datetime import date, datetime
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import Date, cast, delete, func, insert, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.workout import Workout, RUN_ACTIVITY_TYPES
+from app.models.workout_rollup import WorkoutRollup
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {
+        "workout_count": 0,
+        "distance_mi": 0.0,
+        "workout_time_seconds": 0,
+        "pace_sum": 0.0,
+        "pace_count": 0,
+        "max_distance_mi": None,
+        "min_pace_min_mi": None,
+        "heart_rate_sum": 0,
+        "heart_rate_count": 0,
+    }
+
+def apply_workouts(db: Session, user_id: int, workouts: Iterable[Any]) -> None:
+    """
+    Fold newly inserted workouts into the rollup table.
+    Accepts Workout or WorkoutCreate objects. Does not commit, so callers
+    run it inside the same transaction as the workout insert.
+    """
+    buckets: Dict[Tuple[date, str], Dict[str, Any]] = {}
+    for workout in workouts:
+        key = (workout.workout_date.date(), workout.activity_type)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = _empty_bucket()
+        bucket["workout_count"] += 1
+        bucket["distance_mi"] += workout.distance_mi or 0
+        bucket["workout_time_seconds"] += workout.workout_time_seconds or 0
+        if workout.distance_mi is not None:
+            if bucket["max_distance_mi"] is None or workout.distance_mi > bucket["max_distance_mi"]:
+                bucket["max_distance_mi"] = workout.distance_mi
+        if workout.avg_pace_min_mi:
+            bucket["pace_sum"] += workout.avg_pace_min_mi
+            bucket["pace_count"] += 1
+            if bucket["min_pace_min_mi"] is None or workout.avg_pace_min_mi < bucket["min_pace_min_mi"]:
+                bucket["min_pace_min_mi"] = workout.avg_pace_min_mi
+        if workout.avg_heart_rate is not None:
+            bucket["heart_rate_sum"] += workout.avg_heart_rate
+            bucket["heart_rate_count"] += 1
+
+    if not buckets:
+        return
+
+    stmt = pg_insert(WorkoutRollup).values([
+        {"user_id": user_id, "day": day, "activity_type": activity_type, **bucket}
+        for (day, activity_type), bucket in buckets.items()
+    ])
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[WorkoutRollup.user_id, WorkoutRollup.day, WorkoutRollup.activity_type],
+        set_={
+            "workout_count": WorkoutRollup.workout_count + excluded.workout_count,
+            "distance_mi": WorkoutRollup.distance_mi + excluded.distance_mi,
+            "workout_time_seconds": WorkoutRollup.workout_time_seconds + excluded.workout_time_seconds,
+            "pace_sum": WorkoutRollup.pace_sum + excluded.pace_sum,
+            "pace_count": WorkoutRollup.pace_count + excluded.pace_count,
+            # GREATEST/LEAST ignore NULLs in PostgreSQL
+            "max_distance_mi": func.greatest(WorkoutRollup.max_distance_mi, excluded.max_distance_mi),
+            "min_pace_min_mi": func.least(WorkoutRollup.min_pace_min_mi, excluded.min_pace_min_mi),
+            "heart_rate_sum": WorkoutRollup.heart_rate_sum + excluded.heart_rate_sum,
+            "heart_rate_count": WorkoutRollup.heart_rate_count + excluded.heart_rate_count,
+        }
+    )
+    db.execute(stmt)
+
+_ROLLUP_COLUMNS = [
+    "user_id", "day", "activity_type", "workout_count", "distance_mi",
+    "workout_time_seconds", "pace_sum", "pace_count",
+    "max_distance_mi", "min_pace_min_mi", "heart_rate_sum", "heart_rate_count",
+]
+
+def _rollup_source():
+    """SELECT computing rollup rows from workouts, in _ROLLUP_COLUMNS order."""
+    valid_pace = Workout.avg_pace_min_mi != 0
+    day = cast(Workout.workout_date, Date)
+    return select(
+        Workout.user_id,
+        day,
+        Workout.activity_type,
+        func.count(Workout.id),
+        func.coalesce(func.sum(Workout.distance_mi), 0),
+        func.coalesce(func.sum(Workout.workout_time_seconds), 0),
+        func.coalesce(func.sum(Workout.avg_pace_min_mi).filter(valid_pace), 0),
+        func.count(Workout.avg_pace_min_mi).filter(valid_pace),
+        func.max(Workout.distance_mi),
+        func.min(Workout.avg_pace_min_mi).filter(valid_pace),
+        func.coalesce(func.sum(Workout.avg_heart_rate), 0),
+        func.count(Workout.avg_heart_rate),
+    ).group_by(Workout.user_id, day, Workout.activity_type)
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recompute rollups from the workouts table, for one user or everyone.
+    Returns the number of rollup rows written.
+    """
+    source = _rollup_source()
+    clear = delete(WorkoutRollup)
+    if user_id is not None:
+        source = source.where(Workout.user_id == user_id)
+        clear = clear.where(WorkoutRollup.user_id == user_id)
+
+    db.execute(clear)
+    result = db.execute(insert(WorkoutRollup).from_select(_ROLLUP_COLUMNS, source))
+    db.commit()
+    return result.rowcount
+
+def refresh_days(db: Session, user_id: int, keys: Set[Tuple[date, str]]) -> None:
+    """
+    Recompute the given (day, activity_type) rollups from the workouts table.
+    Used when existing workouts change, where a delta can't be applied.
+    Does not commit.
+    """
+    if not keys:
+        return
+    keys_list = list(keys)
+    db.execute(
+        delete(WorkoutRollup).where(
+            WorkoutRollup.user_id == user_id,
+            tuple_(WorkoutRollup.day, WorkoutRollup.activity_type).in_(keys_list)
+        )
+    )
+    source = _rollup_source().where(
+        Workout.user_id == user_id,
+        tuple_(cast(Workout.workout_date, Date), Workout.activity_type).in_(keys_list)
+    )
+    db.execute(insert(WorkoutRollup).from_select(_ROLLUP_COLUMNS, source))
+
+def count_workouts(db: Session, user_id: int, activity_type: Optional[str] = None) -> int:
+    """Count a user's workouts from the rollups instead of the workouts table."""
+    query = db.query(func.coalesce(func.sum(WorkoutRollup.workout_count), 0)).filter(
+        WorkoutRollup.user_id == user_id
+    )
+    if activity_type:
+        query = query.filter(WorkoutRollup.activity_type == activity_type)
+    return int(query.scalar())
+
+def _runs_in_range(
+    query: Query,
+    user_id: int,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+) -> Query:
+    query = query.filter(
+        WorkoutRollup.user_id == user_id,
+        WorkoutRollup.activity_type.in_(RUN_ACTIVITY_TYPES)
+    )
+    if start_day is not None:
+        query = query.filter(WorkoutRollup.day >= start_day)
+    if end_day is not None:
+        query = query.filter(WorkoutRollup.day <= end_day)
+    return query
+
+def get_run_totals(
+    db: Session,
+    user_id: int,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+):
+    """Run totals for the summary, labelled like the raw workout aggregate."""
+    return _runs_in_range(
+        db.query(
+            func.coalesce(func.sum(WorkoutRollup.workout_count), 0).label("total_runs"),
+            func.coalesce(func.sum(WorkoutRollup.distance_mi), 0).label("total_distance"),
+            func.max(WorkoutRollup.max_distance_mi).label("longest_run"),
+            func.min(WorkoutRollup.min_pace_min_mi).label("best_pace"),
+            (func.sum(WorkoutRollup.pace_sum) / func.nullif(func.sum(WorkoutRollup.pace_count), 0)).label("avg_pace"),
+            func.coalesce(func.sum(WorkoutRollup.workout_time_seconds), 0).label("total_time"),
+        ),
+        user_id, start_day, end_day
+    ).one()
+
+def get_weekly_mileage(
+    db: Session,
+    user_id: int,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+) -> List[Tuple[date, float]]:
+    week = func.date_trunc("week", WorkoutRollup.day).label("week")
+    rows = _runs_in_range(
+        db.query(week, func.sum(WorkoutRollup.distance_mi)),
+        user_id, start_day, end_day
+    ).group_by(week).order_by(week).all()
+    return [(week_start.date(), float(distance)) for week_start, distance in rows]
+
+def get_longest_run(
+    db: Session,
+    user_id: int,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+) -> Optional[Tuple[float, date]]:
+    row = _runs_in_range(
+        db.query(WorkoutRollup.max_distance_mi, WorkoutRollup.day),
+        user_id, start_day, end_day
+    ).filter(WorkoutRollup.max_distance_mi.isnot(None)).order_by(
+        WorkoutRollup.max_distance_mi.desc(), WorkoutRollup.day.asc()
+    ).first()
+    return (row[0], row[1]) if row else None
+
+def get_best_pace(
+    db: Session,
+    user_id: int,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+) -> Optional[Tuple[float, date]]:
+    row = _runs_in_range(
+        db.query(WorkoutRollup.min_pace_min_mi, WorkoutRollup.day),
+        user_id, start_day, end_day
+    ).filter(WorkoutRollup.min_pace_min_mi.isnot(None)).order_by(
+        WorkoutRollup.min_pace_min_mi.asc(), WorkoutRollup.day.asc()
+    ).first()
+    return (row[0], row[1]) if row else None
+
+def _trend_value(metric: str):
+    if metric == "distance":
+        return func.sum(WorkoutRollup.distance_mi)
+    if metric == "pace":
+        return func.sum(WorkoutRollup.pace_sum) / func.nullif(func.sum(WorkoutRollup.pace_count), 0)
+    if metric == "time":
+        return func.sum(WorkoutRollup.workout_time_seconds)
+    if metric == "count":
+        return func.sum(WorkoutRollup.workout_count)
+    if metric == "max_distance":
+        return func.max(WorkoutRollup.max_distance_mi)
+    # heart_rate
+    return func.sum(WorkoutRollup.heart_rate_sum) / func.nullif(func.sum(WorkoutRollup.heart_rate_count), 0)
+
+def get_trends(
+    db: Session,
+    user_id: int,
+    metrics: List[str],
+    group_by: str,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+) -> List[Tuple[date, Tuple[Any, ...]]]:
+    """
+    Per-period values of several run metrics from one grouped query,
+    ordered by period. Values come in the order of metrics.
+    """
+    if group_by == "day":
+        period = WorkoutRollup.day
+    else:  # week or month
+        period = func.date_trunc(group_by, WorkoutRollup.day)
+    period = period.label("period")
+
+    rows = _runs_in_range(
+        db.query(period, *(_trend_value(metric) for metric in metrics)),
+        user_id, start_day, end_day
+    ).group_by(period).order_by(period).all()
+    return [
+        (row[0].date() if isinstance(row[0], datetime) else row[0], tuple(row[1:]))
+        for row in rows
+    ]
@@ -1,3 +1,8 @@
 from app.db.base_class import Base
 from app.models.user import User
-from app.models.workout import Workout 
\ No newline at end of file
+from app.models.workout import Workout
+from app.models.goal import Goal
+from app.models.workout_rollup import WorkoutRollup
+from app.models.import_job import ImportJob
+from app.models.sync_state import SyncState
+from app.models.personal_record import PersonalRecord
\ No newline at end of file
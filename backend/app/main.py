@@ -1,12 +1,20 @@
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.v1.api import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.logs import RequestContextMiddleware, configure_logging, shutdown_logging
+from app.core.metrics import render_metrics
+from app.core.middleware import MetricsMiddleware
 from app.db.init_db import init_db
 from app.db.session import SessionLocal
+from app.services.archive_import import shutdown_parse_pool
+from app.services.import_worker import import_workers
+from app.services.mapmyfitness import close_http_client
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -24,17 +32,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_BYTES,
+    gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+
+app.add_middleware(MetricsMiddleware)
+
+# Outermost, so every record logged while handling a request carries its id
+app.add_middleware(RequestContextMiddleware)
+
 # Add API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize the database on startup."""
+    """Initialize the database and start the import workers on startup."""
     db = SessionLocal()
     try:
         init_db(db)
     finally:
         db.close()
+    import_workers.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Let running import batches finish before the process exits."""
+    import_workers.stop()
+    shutdown_parse_pool()
+    await close_http_client()
+    shutdown_logging()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 async def root():
@@ -1,10 +1,13 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
 class Goal(Base):
     __tablename__ = "goals"
+    __table_args__ = (
+        Index("ix_goals_user_id_target_date", "user_id", "target_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -14,5 +17,16 @@ class Goal(Base):
     date_created = Column(DateTime, default=datetime.utcnow)
     completed = Column(DateTime, nullable=True)  # When the goal was achieved
 
+    # Thresholds parsed from target; None where the target doesn't say
+    target_distance_mi = Column(Float, nullable=True)
+    target_seconds = Column(Integer, nullable=True)
+    # How progress is measured; None if the target couldn't be read
+    kind = Column(String, nullable=True)
+    # Maintained as workouts are imported, see app.crud.goal_progress.
+    # progress_updated_at is None until the values have been computed.
+    progress_value = Column(Float, nullable=True)
+    progress = Column(Float, nullable=True)  # Share of the target reached, 0 to 1
+    progress_updated_at = Column(DateTime, nullable=True)
+
     # Relationship with User model
-    user = relationship("User", back_populates="goals") 
\ No newline at end of file
+    user = relationship("User", back_populates="goals")
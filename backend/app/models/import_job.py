@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
+from app.db.base_class import Base
+
+class ImportJob(Base):
+    """A queued or running CSV import, processed by the background worker pool."""
+    __tablename__ = "import_jobs"
+    __table_args__ = (
+        Index("ix_import_jobs_status_created_at", "status", "created_at"),
+    )
+
+    id = Column(String, primary_key=True)  # uuid4 hex, also names the stored upload
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    filename = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued")  # 'queued', 'running', 'completed' or 'failed'
+    total_rows = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)
+    error = Column(String)  # Why the whole job failed
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    claim_token = Column(String)  # Changes on every claim, so a worker can tell it lost the job
+    finished_at = Column(DateTime)
+
+    @property
+    def rows_processed(self) -> int:
+        return self.total_rows
+
+    @property
+    def throughput_rows_per_sec(self) -> float | None:
+        if not self.started_at:
+            return None
+        end = self.finished_at or datetime.utcnow()
+        elapsed = (end - self.started_at).total_seconds()
+        return self.total_rows / elapsed if elapsed > 0 else None
@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from app.db.base_class import Base
+
+class PersonalRecord(Base):
+    """A user's all-time best in one category for one activity type, maintained as workouts are written."""
+    __tablename__ = "personal_records"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    activity_type = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)  # 'longest_distance', 'fastest_pace', 'longest_duration' or 'most_calories'
+    value = Column(Float, nullable=False)  # Miles, min/mi, seconds or kcal depending on category
+    workout_id = Column(Integer, ForeignKey("workouts.id"), nullable=False)
+    workout_date = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
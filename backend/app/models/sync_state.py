@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from app.db.base_class import Base
+
+class SyncState(Base):
+    """A user's connection to an external workout provider and their incremental sync cursor."""
+    __tablename__ = "sync_states"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    provider = Column(String, primary_key=True)  # 'mapmyfitness'
+    remote_user_id = Column(String, nullable=False)
+    access_token = Column(String, nullable=False)
+    # Start time of the newest workout pulled so far; the next sync asks for workouts from here on
+    cursor = Column(DateTime)
+    status = Column(String, nullable=False, default="idle")  # 'idle', 'running', 'completed' or 'failed'
+    workouts_synced = Column(Integer, nullable=False, default=0)
+    error = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_synced_at = Column(DateTime)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Boolean
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from passlib.context import CryptContext
@@ -15,6 +15,8 @@ class User(Base):
     full_name = Column(String)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped in the same transaction as every workout or goal write; ETags derive from it
+    data_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     # Relationships
     workouts = relationship("Workout", back_populates="user")
@@ -1,10 +1,31 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
+# Activity types counted as runs by the analytics endpoints
+RUN_ACTIVITY_TYPES = ("Run", "Running")
+
+# Stands in for a missing distance in the unlinked natural key
+MISSING_DISTANCE_KEY = -1
+
 class Workout(Base):
     __tablename__ = "workouts"
+    __table_args__ = (
+        Index("ix_workouts_user_id_workout_date", "user_id", "workout_date"),
+        Index("ix_workouts_user_id_activity_type_workout_date", "user_id", "activity_type", "workout_date"),
+        # Natural keys used to de-duplicate re-imported workouts
+        Index(
+            "uq_workouts_user_id_external_link", "user_id", "external_link",
+            unique=True, postgresql_where=text("external_link IS NOT NULL")
+        ),
+        # COALESCE so workouts without a distance match too; NULLs never conflict
+        Index(
+            "uq_workouts_user_id_date_activity_distance",
+            "user_id", "workout_date", "activity_type", text(f"COALESCE(distance_mi, {MISSING_DISTANCE_KEY})"),
+            unique=True, postgresql_where=text("external_link IS NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
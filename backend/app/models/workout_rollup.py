@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Date, ForeignKey
+from app.db.base_class import Base
+
+class WorkoutRollup(Base):
+    """Per-user, per-day, per-activity aggregates maintained alongside workouts."""
+    __tablename__ = "workout_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    activity_type = Column(String, primary_key=True)
+    workout_count = Column(Integer, nullable=False, default=0)
+    distance_mi = Column(Float, nullable=False, default=0)
+    workout_time_seconds = Column(BigInteger, nullable=False, default=0)
+    pace_sum = Column(Float, nullable=False, default=0)  # Sum of non-zero avg paces
+    pace_count = Column(Integer, nullable=False, default=0)
+    max_distance_mi = Column(Float)
+    min_pace_min_mi = Column(Float)
+    heart_rate_sum = Column(BigInteger, nullable=False, default=0)  # Sum of recorded avg heart rates
+    heart_rate_count = Column(Integer, nullable=False, default=0)
@@ -18,6 +18,13 @@ class Goal(GoalBase):
     user_id: int
     date_created: datetime
     completed: Optional[datetime] = None
+    target_distance_mi: Optional[float] = None
+    target_seconds: Optional[int] = None
+    # 'distance', 'time', 'longest_run' or 'race_pace'; None if the target couldn't be read
+    kind: Optional[str] = None
+    # Miles, seconds, miles or min/mi depending on kind
+    progress_value: Optional[float] = None
+    progress: Optional[float] = None  # Share of the target reached, 0 to 1
 
     class Config:
         from_attributes = True 
\ No newline at end of file
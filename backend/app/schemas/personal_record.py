@@ -0,0 +1,12 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+class PersonalRecord(BaseModel):
+    activity_type: str
+    category: str  # 'longest_distance', 'fastest_pace', 'longest_duration' or 'most_calories'
+    value: float
+    workout_id: int
+    workout_date: datetime
+
+    class Config:
+        from_attributes = True
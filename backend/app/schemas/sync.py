@@ -0,0 +1,29 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class SyncConnection(BaseModel):
+    remote_user_id: str
+    access_token: str
+
+class SyncState(BaseModel):
+    provider: str
+    remote_user_id: str
+    cursor: Optional[datetime] = None
+    status: str  # 'idle', 'running', 'completed' or 'failed'
+    workouts_synced: int
+    error: Optional[str] = None
+    last_synced_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class SyncResult(BaseModel):
+    fetched: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0  # Workouts the API returned that could not be mapped
+    pages: int = 0
+    retries: int = 0  # Requests repeated after a 429 or a transient error
+    cursor: Optional[datetime] = None
@@ -6,4 +6,8 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 class TokenPayload(BaseModel):
-    sub: Optional[int] = None 
\ No newline at end of file
+    sub: Optional[int] = None
+
+class Principal(BaseModel):
+    id: int
+    is_active: bool
\ No newline at end of file
@@ -40,7 +40,48 @@ class WorkoutInDB(WorkoutInDBBase):
 
 class WorkoutList(BaseModel):
     items: List[Workout]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class WorkoutImportRowError(BaseModel):
+    row: int
+    error: str
+
+class WorkoutImportResult(BaseModel):
+    total_rows: int = 0
+    imported: int = 0  # Rows written, i.e. inserted + updated
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0  # Rows matching an existing workout with no changes
+    failed: int = 0
+    errors: List[WorkoutImportRowError] = []
+    error: Optional[str] = None  # Set when the file could not be read to the end
+
+class WorkoutImportFileResult(WorkoutImportResult):
+    filename: str
+
+class WorkoutArchiveImportResult(WorkoutImportResult):
+    failed_files: int = 0
+    files: List[WorkoutImportFileResult] = []
+
+class ImportJob(BaseModel):
+    id: str
+    filename: str
+    status: str  # 'queued', 'running', 'completed' or 'failed'
+    rows_processed: int
+    rows_failed: int
+    inserted: int
+    updated: int
+    skipped: int
+    throughput_rows_per_sec: Optional[float] = None
+    errors: List[WorkoutImportRowError] = []
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
 
 class WeeklyMileage(BaseModel):
     week: str
@@ -0,0 +1,183 @@
+"""
+Columnar analytics engine.
+
+Fetches only the columns the dashboard needs for a user's runs, as one
+result set, and computes the summary, trends and pace zones with vectorized
+pandas/NumPy operations. Results match crud.workout.get_workout_summary and
+crud.workout.get_trend_series.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.workout import Workout, RUN_ACTIVITY_TYPES
+
+COLUMNS = ["workout_date", "distance_mi", "workout_time_seconds", "avg_pace_min_mi", "avg_heart_rate"]
+
+def load_runs(
+    db: Session,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> pd.DataFrame:
+    """Fetch the run columns for a date range as a DataFrame ordered by date."""
+    stmt = select(
+        Workout.workout_date, Workout.distance_mi, Workout.workout_time_seconds, Workout.avg_pace_min_mi,
+        Workout.avg_heart_rate
+    ).where(
+        Workout.user_id == user_id,
+        Workout.activity_type.in_(RUN_ACTIVITY_TYPES)
+    )
+    if start_date is not None:
+        stmt = stmt.where(Workout.workout_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(Workout.workout_date <= end_date)
+    rows = db.execute(stmt.order_by(Workout.workout_date.asc())).all()
+    return frame_from_rows(rows)
+
+def frame_from_rows(rows: List[Any]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(rows, columns=COLUMNS)
+    frame["workout_date"] = pd.to_datetime(frame["workout_date"])
+    for column in COLUMNS[1:]:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("float64")
+    return frame
+
+def _periods(dates: pd.Series, group_by: str) -> pd.Series:
+    days = dates.dt.normalize()
+    if group_by == "day":
+        return days
+    if group_by == "week":
+        # Weeks start on Monday
+        return days - pd.to_timedelta(days.dt.weekday, unit="D")
+    return days - pd.to_timedelta(days.dt.day - 1, unit="D")
+
+def _valid_pace(frame: pd.DataFrame) -> pd.Series:
+    # Paces of 0 come from empty CSV cells and are treated as missing
+    pace = frame["avg_pace_min_mi"]
+    return pace.notna() & (pace != 0)
+
+def summarize(frame: pd.DataFrame) -> Dict[str, Any]:
+    """Build the WorkoutSummary payload from a frame returned by load_runs."""
+    total_runs = len(frame)
+    if not total_runs:
+        return {
+            "total_runs": 0,
+            "total_distance": 0,
+            "avg_distance": 0,
+            "longest_run": 0,
+            "best_pace": None,
+            "avg_pace": None,
+            "total_time": 0,
+            "weekly_mileage": [],
+            "recent_achievements": [],
+            "pace_zones": {"easy": 0, "moderate": 0, "tempo": 0}
+        }
+
+    distance = frame["distance_mi"].to_numpy()
+    valid = _valid_pace(frame).to_numpy()
+    paces = frame["avg_pace_min_mi"].to_numpy()[valid]
+
+    total_distance = float(np.nansum(distance))
+    has_distance = not np.isnan(distance).all()
+    avg_pace = float(paces.mean()) if paces.size else None
+    best_pace = float(paces.min()) if paces.size else None
+
+    weeks = _periods(frame["workout_date"], "week")
+    weekly = frame["distance_mi"].fillna(0).groupby(weeks).sum()
+    weekly_mileage = [
+        {"week": str(week.date()), "distance": float(value)}
+        for week, value in weekly.items()
+    ]
+
+    # Rows are ordered by date, so argmax/argmin pick the earliest workout on ties
+    recent_achievements = []
+    dates = frame["workout_date"]
+    if has_distance:
+        longest_index = int(np.nanargmax(distance))
+        recent_achievements.append({
+            "type": "Longest Run",
+            "value": f"{distance[longest_index]:.2f} miles",
+            "date": str(dates.iloc[longest_index].date())
+        })
+    if paces.size:
+        fastest_index = int(np.flatnonzero(valid)[paces.argmin()])
+        recent_achievements.append({
+            "type": "Best Pace",
+            "value": f"{paces.min():.2f} min/mi",
+            "date": str(dates.iloc[fastest_index].date())
+        })
+
+    pace_zones = {"easy": 0, "moderate": 0, "tempo": 0}
+    if avg_pace is not None:
+        # Zero paces are left out of the average but, as before, counted as tempo
+        zone_paces = frame["avg_pace_min_mi"].dropna().to_numpy()
+        easy = int((zone_paces > avg_pace * 1.1).sum())
+        tempo = int((zone_paces <= avg_pace * 0.9).sum())
+        pace_zones = {"easy": easy, "moderate": int(zone_paces.size) - easy - tempo, "tempo": tempo}
+
+    return {
+        "total_runs": total_runs,
+        "total_distance": total_distance,
+        "avg_distance": total_distance / total_runs,
+        "longest_run": float(np.nanmax(distance)) if has_distance else 0.0,
+        "best_pace": best_pace,
+        "avg_pace": avg_pace,
+        "total_time": int(np.nansum(frame["workout_time_seconds"].to_numpy())),
+        "weekly_mileage": weekly_mileage,
+        "recent_achievements": recent_achievements,
+        "pace_zones": pace_zones
+    }
+
+# metric: (frame column, aggregation); sums skip missing values, so empty sums are 0 like COALESCE(SUM)
+_TREND_AGGREGATIONS = {
+    "distance": ("distance_mi", "sum"),
+    "pace": ("valid_pace", "mean"),
+    "time": ("workout_time_seconds", "sum"),
+    "count": ("workout_date", "size"),
+    "max_distance": ("distance_mi", "max"),
+    "heart_rate": ("avg_heart_rate", "mean"),
+}
+
+def trend_rows(frame: pd.DataFrame, metrics: List[str], group_by: str) -> List[Tuple[date, Tuple[Any, ...]]]:
+    """
+    Per-period values of several metrics from a frame returned by load_runs,
+    in one groupby. Shaped like crud.workout_rollup.get_trends.
+    """
+    if frame.empty:
+        return []
+    frame = frame.assign(valid_pace=frame["avg_pace_min_mi"].where(_valid_pace(frame)))
+    table = frame.groupby(_periods(frame["workout_date"], group_by)).agg(
+        **{metric: _TREND_AGGREGATIONS[metric] for metric in metrics}
+    )
+    return [
+        (period.date(), tuple(None if pd.isna(value) else float(value) for value in values))
+        for period, values in zip(table.index, table.itertuples(index=False, name=None))
+    ]
+
+def trends(frame: pd.DataFrame, metric: str, group_by: str) -> List[Dict[str, Any]]:
+    """Per-period metric values from a frame returned by load_runs."""
+    return [
+        {"period": period.strftime('%Y-%m-%d'), "value": values[0]}
+        for period, values in trend_rows(frame, [metric], group_by)
+        if values[0] is not None
+    ]
+
+def get_workout_summary(
+    db: Session,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    return summarize(load_runs(db, user_id, start_date, end_date))
+
+def get_trend_rows(
+    db: Session,
+    user_id: int,
+    metrics: List[str],
+    group_by: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> List[Tuple[date, Tuple[Any, ...]]]:
+    return trend_rows(load_runs(db, user_id, start_date, end_date), metrics, group_by)
@@ -0,0 +1,268 @@
+"""
+Bulk import of several CSV exports in one request.
+
+Uploads may be plain .csv files, gzip-compressed .csv.gz files or .zip
+archives holding either. Each upload is spooled to import storage once,
+then every CSV inside is decompressed and parsed as a stream in a process
+pool, so large archives use all cores. Each parsed file is spooled back to
+import storage batch by batch, so neither the workers nor the request hold
+a whole file, and written in batches as it finishes. Each file gets its
+own result.
+"""
+import asyncio
+import concurrent.futures
+import gzip
+import io
+import multiprocessing
+import os
+import pickle
+import shutil
+import uuid
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, IO, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.crud import workout_async as crud_workout_async
+from app.schemas.workout import WorkoutArchiveImportResult, WorkoutCreate, WorkoutImportFileResult
+from app.services import csv_import
+
+SUPPORTED_SUFFIXES = ('.zip', '.csv.gz', '.csv')
+
+class ArchiveError(ValueError):
+    """Raised when an upload is not a supported file or exceeds the archive limits."""
+
+class ImportTask(NamedTuple):
+    """One CSV to parse: a spooled upload, optionally a zip member inside it."""
+    filename: str
+    path: str
+    member: Optional[str]
+    gzipped: bool
+
+class ParsedFile(NamedTuple):
+    filename: str
+    batches_path: Optional[str]  # Pickled WorkoutCreate batches, None if the file failed
+    result: WorkoutImportFileResult
+
+class DecompressedSizeError(ValueError):
+    """Raised when a CSV inflates past ARCHIVE_MAX_UNCOMPRESSED_BYTES."""
+
+def is_supported(filename: str) -> bool:
+    return filename.lower().endswith(SUPPORTED_SUFFIXES)
+
+def _is_csv_member(info: zipfile.ZipInfo) -> bool:
+    name = info.filename
+    return (
+        not info.is_dir()
+        and not name.startswith('__MACOSX/')
+        and not os.path.basename(name).startswith('.')
+        and name.lower().endswith(('.csv', '.csv.gz'))
+    )
+
+def spool_upload(stream: BinaryIO) -> str:
+    """Copy an upload into import storage without decompressing it."""
+    os.makedirs(settings.IMPORT_STORAGE_DIR, exist_ok=True)
+    path = os.path.join(settings.IMPORT_STORAGE_DIR, f"bulk-{uuid.uuid4().hex}")
+    with open(path, "wb") as out:
+        shutil.copyfileobj(stream, out)
+    return path
+
+def plan_tasks(filename: str, path: str) -> List[ImportTask]:
+    """
+    List the CSVs in a spooled upload.
+    Zip archives are only read up to their central directory here; members
+    are decompressed later by the parsing processes.
+    """
+    lower = filename.lower()
+    if lower.endswith('.csv'):
+        return [ImportTask(filename, path, None, False)]
+    if lower.endswith('.csv.gz'):
+        return [ImportTask(filename, path, None, True)]
+    if not lower.endswith('.zip'):
+        raise ArchiveError(f"{filename}: unsupported file type")
+
+    try:
+        with zipfile.ZipFile(path) as archive:
+            members = [info for info in archive.infolist() if _is_csv_member(info)]
+    except zipfile.BadZipFile:
+        raise ArchiveError(f"{filename}: not a valid zip archive")
+    if len(members) > settings.ARCHIVE_MAX_MEMBERS:
+        raise ArchiveError(f"{filename}: more than {settings.ARCHIVE_MAX_MEMBERS} CSV files")
+    # Declared sizes guard against zip bombs before anything is inflated
+    if sum(info.file_size for info in members) > settings.ARCHIVE_MAX_UNCOMPRESSED_BYTES:
+        raise ArchiveError(f"{filename}: archive is too large once decompressed")
+    return [
+        ImportTask(
+            f"{filename}/{info.filename}",
+            path,
+            info.filename,
+            info.filename.lower().endswith('.gz')
+        )
+        for info in members
+    ]
+
+class _CappedStream(io.RawIOBase):
+    """
+    Read-through wrapper that fails once more than limit bytes were read.
+    Declared zip sizes say nothing about gzip data, so .csv.gz uploads and
+    .gz zip members are capped while they are inflated.
+    """
+
+    def __init__(self, stream: IO[bytes], limit: int):
+        self._stream = stream
+        self._limit = limit
+        self._read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        self._read += len(data)
+        if self._read > self._limit:
+            raise DecompressedSizeError(f"file is larger than {self._limit} bytes once decompressed")
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        self._stream.close()
+        super().close()
+
+def _open_task(task: ImportTask, archive: Optional[zipfile.ZipFile]) -> IO[bytes]:
+    stream: IO[bytes] = archive.open(task.member) if archive else open(task.path, "rb")
+    if not task.gzipped:
+        return stream
+    return io.BufferedReader(_CappedStream(gzip.GzipFile(fileobj=stream), settings.ARCHIVE_MAX_UNCOMPRESSED_BYTES))
+
+def parse_task(task: ImportTask) -> ParsedFile:
+    """
+    Decompress and parse one CSV, pickling its batches to a file next to
+    the upload. Runs in a worker process, so everything it returns must be
+    picklable.
+    """
+    result = WorkoutImportFileResult(filename=task.filename)
+    batches_path = f"{task.path}-{uuid.uuid4().hex}.parsed"
+    try:
+        archive = zipfile.ZipFile(task.path) if task.member else None
+        try:
+            with _open_task(task, archive) as stream, open(batches_path, "wb") as out:
+                rows = csv_import.iter_csv_rows(stream)
+                for batch in csv_import.iter_workout_batches(rows, result, settings.CSV_IMPORT_BATCH_SIZE):
+                    pickle.dump(batch, out, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            if archive:
+                archive.close()
+    except (csv_import.MissingColumnsError, csv_import.MalformedCsvError, DecompressedSizeError) as e:
+        result.error = str(e)
+    except (OSError, EOFError, zipfile.BadZipFile, zlib.error) as e:
+        result.error = f"Could not read file: {e}"
+    if result.error:
+        _remove(batches_path)
+        return ParsedFile(task.filename, None, result)
+    return ParsedFile(task.filename, batches_path, result)
+
+def _remove(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+def _read_batches(path: str) -> Iterator[List[WorkoutCreate]]:
+    with open(path, "rb") as batches:
+        while True:
+            try:
+                yield pickle.load(batches)
+            except EOFError:
+                return
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all bulk imports, started on first use."""
+    global _parse_pool
+    if _parse_pool is None:
+        # Spawned rather than forked: the API process runs threads (log listener,
+        # import workers, the threadpool) whose locks a fork could copy while held
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=settings.IMPORT_PARSE_PROCESSES or None,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_pool
+
+def shutdown_parse_pool() -> None:
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=True, cancel_futures=True)
+        _parse_pool = None
+
+async def _write_file(db: AsyncSession, parsed: ParsedFile, user_id: int) -> WorkoutImportFileResult:
+    result = parsed.result
+    if parsed.batches_path is None:
+        return result
+    batches = _read_batches(parsed.batches_path)
+    while True:
+        batch = await run_in_threadpool(next, batches, None)
+        if batch is None:
+            break
+        csv_import.record_batch(result, await crud_workout_async.upsert_workouts_bulk(db, batch, user_id))
+    return result
+
+def _add_totals(total: WorkoutArchiveImportResult, result: WorkoutImportFileResult) -> None:
+    total.total_rows += result.total_rows
+    total.imported += result.imported
+    total.inserted += result.inserted
+    total.updated += result.updated
+    total.skipped += result.skipped
+    total.failed += result.failed
+    if result.error:
+        total.failed_files += 1
+
+async def import_uploads(
+    db: AsyncSession,
+    uploads: List[Tuple[str, BinaryIO]],
+    user_id: int,
+) -> WorkoutArchiveImportResult:
+    """
+    Import every CSV in the given (filename, stream) uploads.
+    Files are parsed in parallel and written as each one finishes; a file
+    that cannot be read is reported on its own result without affecting
+    the rest. Raises ArchiveError if an upload is unsupported or too large.
+    """
+    for filename, _ in uploads:
+        if not is_supported(filename):
+            raise ArchiveError(f"{filename}: file must be a .csv, .csv.gz or .zip")
+
+    paths: List[str] = []
+    futures: List[concurrent.futures.Future] = []
+    try:
+        tasks: List[ImportTask] = []
+        for filename, stream in uploads:
+            path = await run_in_threadpool(spool_upload, stream)
+            paths.append(path)
+            tasks.extend(await run_in_threadpool(plan_tasks, filename, path))
+
+        pool = get_parse_pool()
+        futures = [pool.submit(parse_task, task) for task in tasks]
+
+        async def parse(index: int) -> Tuple[int, ParsedFile]:
+            return index, await asyncio.wrap_future(futures[index])
+
+        total = WorkoutArchiveImportResult()
+        results: List[Optional[WorkoutImportFileResult]] = [None] * len(tasks)
+        for finished in asyncio.as_completed([parse(i) for i in range(len(tasks))]):
+            index, parsed = await finished
+            results[index] = await _write_file(db, parsed, user_id)
+            _add_totals(total, results[index])
+        # Report files in upload order rather than completion order
+        total.files = results
+        return total
+    finally:
+        # Workers may still be reading the uploads if the import failed part way
+        for future in futures:
+            future.cancel()
+        await run_in_threadpool(concurrent.futures.wait, futures)
+        for future in futures:
+            if not future.cancelled() and future.exception() is None and future.result().batches_path:
+                paths.append(future.result().batches_path)
+        for path in paths:
+            _remove(path)
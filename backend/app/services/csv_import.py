@@ -0,0 +1,217 @@
+import csv
+import io
+from datetime import datetime
+from itertools import chain, islice
+from typing import Callable, Iterator, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.crud import workout as crud_workout
+from app.crud import workout_async as crud_workout_async
+from app.schemas.workout import WorkoutCreate, WorkoutImportResult, WorkoutImportRowError
+from app.services.date_parser import DateParser, parse_date
+
+# Cap on the number of per-row errors echoed back so a completely broken
+# file cannot grow the response without bound.
+MAX_REPORTED_ERRORS = 100
+
+# Rows read ahead to detect the file's date format
+DATE_DETECTION_ROWS = 100
+
+REQUIRED_COLUMNS = {
+    'Workout Date',
+    'Activity Type',
+    'Calories Burned (kCal)',
+    'Distance (mi)',
+    'Workout Time (seconds)',
+    'Avg Pace (min/mi)',
+    'Max Pace (min/mi)',
+    'Avg Speed (mi/h)',
+    'Max Speed (mi/h)',
+    'Source',
+    'Link'
+}
+
+OPTIONAL_COLUMNS = {
+    'Avg Heart Rate',
+    'Steps',
+    'Notes'
+}
+
+class MissingColumnsError(ValueError):
+    """Raised when the CSV header lacks one or more required columns."""
+
+    def __init__(self, missing: set):
+        self.missing = missing
+        super().__init__(f"CSV file is missing required columns: {', '.join(sorted(missing))}")
+
+class MalformedCsvError(ValueError):
+    """Raised when the file can't be read as CSV, e.g. a field exceeds the csv module's size limit."""
+
+def safe_int(value: str, allow_null: bool = False, treat_zero_as_null: bool = False) -> int | None:
+    """Convert string to int, handling empty strings and floats.
+    
+    Args:
+        value: The string value to convert
+        allow_null: Whether to return None for empty/invalid values instead of 0
+        treat_zero_as_null: Whether to treat 0 values as null (useful for measurements that can't be 0)
+    """
+    if not value or value.strip() == '':
+        return None if allow_null else 0
+    try:
+        result = int(float(value))
+        if treat_zero_as_null and result == 0:
+            return None
+        return result
+    except (ValueError, TypeError):
+        return None if allow_null else 0
+
+def safe_float(value: str, allow_null: bool = False) -> float | None:
+    """Convert string to float, handling empty strings."""
+    if not value or value.strip() == '':
+        return None if allow_null else 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None if allow_null else 0.0
+
+def row_to_workout(row: dict, parse: Callable[[str], datetime] = parse_date) -> WorkoutCreate:
+    """Build a WorkoutCreate from one MapMyRun CSV row."""
+    return WorkoutCreate(
+        workout_date=parse(row['Workout Date']),
+        activity_type=row['Activity Type'],
+        calories_burned=safe_int(row['Calories Burned (kCal)']),
+        distance_mi=safe_float(row['Distance (mi)']),
+        workout_time_seconds=safe_int(row['Workout Time (seconds)']),
+        avg_pace_min_mi=safe_float(row['Avg Pace (min/mi)']),
+        max_pace_min_mi=safe_float(row['Max Pace (min/mi)']),
+        avg_speed_mph=safe_float(row['Avg Speed (mi/h)']),
+        max_speed_mph=safe_float(row['Max Speed (mi/h)']),
+        avg_heart_rate=safe_int(row.get('Avg Heart Rate') or '', allow_null=True, treat_zero_as_null=True),
+        steps=safe_int(row.get('Steps') or '', allow_null=True),
+        notes=(row.get('Notes') or '').strip("b''"),
+        source=row['Source'],
+        external_link=row['Link']
+    )
+
+def iter_csv_rows(stream: io.BufferedIOBase) -> Iterator[dict]:
+    """
+    Lazily decode and parse a binary CSV stream.
+    Only one buffered chunk of the underlying file is decoded at a time.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline='')
+    reader = csv.DictReader(text)
+    try:
+        missing_columns = REQUIRED_COLUMNS - set(reader.fieldnames or [])
+        if missing_columns:
+            raise MissingColumnsError(missing_columns)
+        yield from reader
+    except csv.Error as e:
+        raise MalformedCsvError(f"CSV file could not be parsed at line {reader.line_num}: {e}") from e
+    finally:
+        # Hand the underlying stream back to its owner instead of closing it
+        text.detach()
+
+def iter_workout_batches(
+    rows: Iterator[dict],
+    result: WorkoutImportResult,
+    batch_size: int,
+    first_row: int = 2,
+) -> Iterator[List[WorkoutCreate]]:
+    """
+    Convert CSV rows into WorkoutCreate batches of at most batch_size items.
+    Rows that fail to parse are recorded on result and skipped.
+    Row numbers match the spreadsheet view, so the header is row 1.
+    The date format is detected once from the first rows of the file.
+    """
+    rows = iter(rows)
+    head = list(islice(rows, DATE_DETECTION_ROWS))
+    parser = DateParser.detect(row.get('Workout Date') or '' for row in head)
+    batch: List[WorkoutCreate] = []
+    for row_number, row in enumerate(chain(head, rows), start=first_row):
+        result.total_rows += 1
+        try:
+            batch.append(row_to_workout(row, parser.parse))
+        except (ValueError, KeyError) as e:
+            record_row_error(result, row_number, e)
+            continue
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def record_row_error(result: WorkoutImportResult, row_number: int, error: Exception) -> None:
+    result.failed += 1
+    if len(result.errors) < MAX_REPORTED_ERRORS:
+        result.errors.append(WorkoutImportRowError(row=row_number, error=str(error)))
+
+def record_batch(result: WorkoutImportResult, upserted: crud_workout.BulkUpsertResult) -> None:
+    result.inserted += upserted.inserted
+    result.updated += upserted.updated
+    result.skipped += upserted.skipped
+    result.imported += upserted.inserted + upserted.updated
+
+def _record_truncation(result: WorkoutImportResult, error: MalformedCsvError, written: bool) -> None:
+    """
+    Batches are committed as they are written, so once one is stored a
+    parse error ends the import with the counts so far instead of failing it.
+    """
+    if not written:
+        raise error
+    result.error = f"{error}. Rows before it were imported."
+
+def import_csv_stream(
+    db: Session,
+    stream: io.BufferedIOBase,
+    user_id: int,
+    batch_size: int,
+    on_batch: Optional[Callable[[WorkoutImportResult], None]] = None,
+) -> WorkoutImportResult:
+    """
+    Stream a MapMyRun CSV export into the workouts table.
+    Workouts are flushed to the database every batch_size rows, so peak
+    memory is bounded by the batch size rather than the file size.
+    Raises MissingColumnsError or MalformedCsvError if nothing could be
+    imported; a file that breaks off later returns its partial result with
+    error set.
+    on_batch, if given, is called with the running totals after each batch.
+    """
+    result = WorkoutImportResult()
+    rows = iter_csv_rows(stream)
+    written = False
+    try:
+        for batch in iter_workout_batches(rows, result, batch_size):
+            record_batch(result, crud_workout.upsert_workouts_bulk(db, batch, user_id))
+            written = True
+            if on_batch is not None:
+                on_batch(result)
+    except MalformedCsvError as e:
+        _record_truncation(result, e, written)
+    return result
+
+async def import_csv_stream_async(
+    db: AsyncSession,
+    stream: io.BufferedIOBase,
+    user_id: int,
+    batch_size: int,
+) -> WorkoutImportResult:
+    """
+    Async variant of import_csv_stream.
+    Parsing runs in the threadpool one batch at a time and inserts go through
+    the async session, so the event loop stays free during large imports.
+    """
+    result = WorkoutImportResult()
+    batches = iter_workout_batches(iter_csv_rows(stream), result, batch_size)
+    written = False
+    while True:
+        try:
+            batch = await run_in_threadpool(next, batches, None)
+        except MalformedCsvError as e:
+            _record_truncation(result, e, written)
+            break
+        if batch is None:
+            break
+        record_batch(result, await crud_workout_async.upsert_workouts_bulk(db, batch, user_id))
+        written = True
+    return result
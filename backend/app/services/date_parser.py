@@ -0,0 +1,155 @@
+"""
+Date parsing for CSV imports.
+
+parse_date probes every supported format and is used for one-off values.
+DateParser looks at the first rows of a file once, picks the format the
+export uses (including day/month order for slash dates), and then parses
+each row with a single precompiled regex, falling back to parse_date only
+for rows that don't match.
+"""
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+def parse_date(date_str: str) -> datetime:
+    """Try multiple date formats to parse the date string."""
+    # First, normalize the month abbreviations
+    month_mappings = {
+        'Jan.': 'Jan', 'Feb.': 'Feb', 'Mar.': 'Mar', 'Apr.': 'Apr',
+        'Jun.': 'Jun', 'Jul.': 'Jul', 'Aug.': 'Aug', 'Sept.': 'Sep',
+        'Oct.': 'Oct', 'Nov.': 'Nov', 'Dec.': 'Dec',
+        'September': 'Sep', 'October': 'Oct', 'November': 'Nov', 'December': 'Dec',
+        'January': 'Jan', 'February': 'Feb', 'March': 'Mar', 'April': 'Apr',
+        'June': 'Jun', 'July': 'Jul', 'August': 'Aug'
+    }
+
+    # Remove any extra spaces and normalize the date string
+    date_str = ' '.join(date_str.split())  # Normalize spaces
+
+    # Replace month names with standard abbreviations
+    for month, abbr in month_mappings.items():
+        if month in date_str:
+            date_str = date_str.replace(month, abbr)
+            break
+
+    # Special case for "Sept" -> "Sep"
+    date_str = date_str.replace('Sept', 'Sep')
+
+    date_formats = [
+        '%Y-%m-%d %H:%M:%S',  # 2024-12-04 15:30:00
+        '%b %d, %Y',          # Sep 26, 2024
+        '%Y-%m-%d',           # 2024-12-04
+        '%m/%d/%Y',           # 12/4/2024
+        '%d/%m/%Y',           # 4/12/2024
+    ]
+
+    for date_format in date_formats:
+        try:
+            return datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+
+    raise ValueError(f"Could not parse date: {date_str}")
+
+MONTHS: Dict[str, int] = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8, 'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10, 'nov': 11, 'november': 11, 'dec': 12, 'december': 12,
+}
+
+ISO_DATETIME = re.compile(r'^\s*(\d{4})-(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{2}):(\d{2})\s*$')
+ISO_DATE = re.compile(r'^\s*(\d{4})-(\d{1,2})-(\d{1,2})\s*$')
+MONTH_NAME = re.compile(r'^\s*([A-Za-z]+)\.?\s+(\d{1,2}),\s*(\d{4})\s*$')
+SLASH = re.compile(r'^\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*$')
+
+def _iso_datetime(match: re.Match) -> datetime:
+    return datetime(*map(int, match.groups()))
+
+def _iso_date(match: re.Match) -> datetime:
+    return datetime(*map(int, match.groups()))
+
+def _month_name(match: re.Match) -> datetime:
+    name, day, year = match.groups()
+    month = MONTHS.get(name.lower())
+    if month is None:
+        raise ValueError(f"Unknown month: {name}")
+    return datetime(int(year), month, int(day))
+
+def _month_first(match: re.Match) -> datetime:
+    month, day, year = match.groups()
+    return datetime(int(year), int(month), int(day))
+
+def _day_first(match: re.Match) -> datetime:
+    day, month, year = match.groups()
+    return datetime(int(year), int(month), int(day))
+
+# Formats in the same priority order parse_date tries them
+FORMATS = {
+    'iso_datetime': (ISO_DATETIME, _iso_datetime),
+    'month_name': (MONTH_NAME, _month_name),
+    'iso_date': (ISO_DATE, _iso_date),
+    'month_first': (SLASH, _month_first),
+    'day_first': (SLASH, _day_first),
+}
+
+def _slash_order(samples: Iterable[str]) -> str:
+    """
+    Decide between month/day/year and day/month/year from evidence.
+    A first field above 12 can only be a day, a second field above 12 only
+    a day too. Without decisive evidence we keep parse_date's preference
+    for month first.
+    """
+    day_first_votes = month_first_votes = 0
+    for sample in samples:
+        match = SLASH.match(sample)
+        if not match:
+            continue
+        first, second = int(match.group(1)), int(match.group(2))
+        if first > 12 >= second:
+            day_first_votes += 1
+        elif second > 12 >= first:
+            month_first_votes += 1
+    return 'day_first' if day_first_votes > month_first_votes else 'month_first'
+
+class DateParser:
+    """Per-file date parser with a detected fast path and a probing fallback."""
+
+    def __init__(self, format_name: Optional[str] = None):
+        self.format_name = format_name
+        if format_name is not None:
+            self._pattern, self._build = FORMATS[format_name]
+        else:
+            self._pattern, self._build = None, None
+        self.fallbacks = 0
+
+    @classmethod
+    def detect(cls, samples: Iterable[str]) -> "DateParser":
+        """Pick the format that matches most of the sample values."""
+        samples = [sample for sample in samples if sample]
+        votes: Counter = Counter()
+        for sample in samples:
+            for name in ('iso_datetime', 'month_name', 'iso_date', 'month_first'):
+                if FORMATS[name][0].match(sample):
+                    votes[name] += 1
+                    break
+        if not votes:
+            return cls(None)
+        format_name = votes.most_common(1)[0][0]
+        if format_name == 'month_first':
+            format_name = _slash_order(samples)
+        return cls(format_name)
+
+    def parse(self, date_str: str) -> datetime:
+        if self._pattern is not None:
+            match = self._pattern.match(date_str)
+            if match:
+                try:
+                    return self._build(match)
+                except ValueError:
+                    pass
+        self.fallbacks += 1
+        return parse_date(date_str)
+
+    __call__ = parse
@@ -0,0 +1,166 @@
+"""
+Goal targets and progress.
+
+Targets are free-form strings, as entered in the goals form. parse_target
+turns them into typed thresholds: a distance in miles and/or a duration
+in seconds. Each goal then tracks one progress value, chosen by its kind:
+
+- distance: total run distance (mi) inside the goal window
+- time: total run time (s)
+- race without a time: longest run (mi), toward the race distance
+- race with a time: best average pace (min/mi) on runs at least as long
+  as the race, toward the pace the target time requires
+
+All of these are sums, maxima or minima, so fold() can update a value
+one workout at a time as workouts are imported, and a full recompute is
+the same fold over the window's workouts in date order.
+"""
+import re
+from datetime import datetime, time, timedelta
+from typing import Any, NamedTuple, Optional, Tuple
+
+KM_IN_MI = 0.621371
+
+# Share of a race distance a run must cover to count as running it, since
+# exports round and GPS comes up short (a marathon is 26.22 mi, logged as 26.2)
+RACE_DISTANCE_TOLERANCE = 0.98
+
+# Race names, matched as whole words, and their distance in miles. The
+# half comes first so 'half marathon' isn't read as 'marathon'; ultras
+# aren't marathons, so '50k ultra marathon' falls through to its distance.
+RACE_DISTANCES = [
+    (re.compile(r"\bhalf\b"), 13.1094),
+    (re.compile(r"(?<!ultra )(?<!ultra-)\bmarathon\b"), 26.2188),
+]
+# 'the mile' when no distance is given; '10 mile' is a distance
+MILE_RACE = re.compile(r"\bmile\b")
+
+DISTANCE = re.compile(r"(\d+(?:\.\d+)?)\s*(mi|miles?|km|k)?\b", re.IGNORECASE)
+CLOCK = re.compile(r"\b(\d{1,3}):([0-5]\d)(?::([0-5]\d))?\b")
+DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(h|hrs?|hours?|m|mins?|minutes?)\b", re.IGNORECASE)
+
+class GoalTarget(NamedTuple):
+    distance_mi: Optional[float] = None
+    seconds: Optional[int] = None
+
+def _clock_seconds(match: "re.Match", hours_first: bool) -> int:
+    first, second, third = match.group(1), match.group(2), match.group(3)
+    if third is not None:
+        return int(first) * 3600 + int(second) * 60 + int(third)
+    # Two parts: H:MM for training time, MM:SS for a race result
+    if hours_first:
+        return int(first) * 3600 + int(second) * 60
+    return int(first) * 60 + int(second)
+
+def _duration_seconds(text: str, hours_first: bool) -> Optional[int]:
+    match = CLOCK.search(text)
+    if match:
+        return _clock_seconds(match, hours_first)
+    match = DURATION.search(text)
+    if match:
+        value, unit = float(match.group(1)), match.group(2).lower()
+        return int(round(value * (3600 if unit.startswith("h") else 60)))
+    return None
+
+def _distance_mi(text: str) -> Optional[float]:
+    lowered = text.lower()
+    for pattern, miles in RACE_DISTANCES:
+        if pattern.search(lowered):
+            return miles
+    # Clock times aren't distances
+    match = DISTANCE.search(CLOCK.sub(" ", text))
+    if match:
+        value, unit = float(match.group(1)), (match.group(2) or "").lower()
+        return value * KM_IN_MI if unit in ("k", "km") else value
+    if MILE_RACE.search(lowered):
+        return 1.0
+    return None
+
+def parse_target(goal_type: str, target: str) -> GoalTarget:
+    """
+    Typed thresholds for a goal. Fields that can't be read are None; a
+    target with neither threshold can't be tracked.
+        distance: '100', '100 miles', '160 km'
+        time:     '10:00:00', '40:00' (hours:minutes), '12 hours', '90 min'
+        race:     'Marathon', 'Half marathon in 1:45:00', '5K 24:30', '10 mile',
+                  '50k ultra marathon'
+    """
+    if goal_type == "distance":
+        match = DISTANCE.search(target)
+        if not match:
+            return GoalTarget()
+        value, unit = float(match.group(1)), (match.group(2) or "").lower()
+        return GoalTarget(distance_mi=value * KM_IN_MI if unit in ("k", "km") else value)
+    if goal_type == "time":
+        return GoalTarget(seconds=_duration_seconds(target, hours_first=True))
+    if goal_type == "race":
+        distance = _distance_mi(target)
+        if distance is None:
+            return GoalTarget()
+        return GoalTarget(distance_mi=distance, seconds=_duration_seconds(target, hours_first=False))
+    return GoalTarget()
+
+def kind(goal_type: str, target_distance_mi: Optional[float], target_seconds: Optional[int]) -> Optional[str]:
+    """How progress is measured, or None when the target couldn't be parsed."""
+    if goal_type == "distance" and target_distance_mi:
+        return "distance"
+    if goal_type == "time" and target_seconds:
+        return "time"
+    if goal_type == "race" and target_distance_mi:
+        return "race_pace" if target_seconds else "longest_run"
+    return None
+
+def initial_value(goal_kind: Optional[str]) -> Optional[float]:
+    return 0.0 if goal_kind in ("distance", "time") else None
+
+def fold(goal_kind: str, value: Optional[float], workout: Any, target_distance_mi: Optional[float]) -> Optional[float]:
+    """Progress value after one more workout in the goal window."""
+    if goal_kind == "distance":
+        return (value or 0.0) + (workout.distance_mi or 0.0)
+    if goal_kind == "time":
+        return (value or 0.0) + (workout.workout_time_seconds or 0)
+    if goal_kind == "longest_run":
+        if workout.distance_mi is None:
+            return value
+        return workout.distance_mi if value is None else max(value, workout.distance_mi)
+    # race_pace; paces of 0 are missing values
+    if not workout.avg_pace_min_mi or (workout.distance_mi or 0) < target_distance_mi * RACE_DISTANCE_TOLERANCE:
+        return value
+    return workout.avg_pace_min_mi if value is None else min(value, workout.avg_pace_min_mi)
+
+def _target_pace(target_distance_mi: float, target_seconds: int) -> float:
+    return target_seconds / 60 / target_distance_mi
+
+def achieved(goal_kind: Optional[str], value: Optional[float], target_distance_mi: Optional[float], target_seconds: Optional[int]) -> bool:
+    if goal_kind is None or value is None:
+        return False
+    if goal_kind == "distance":
+        return value >= target_distance_mi
+    if goal_kind == "longest_run":
+        return value >= target_distance_mi * RACE_DISTANCE_TOLERANCE
+    if goal_kind == "time":
+        return value >= target_seconds
+    return value <= _target_pace(target_distance_mi, target_seconds)
+
+def progress(goal_kind: Optional[str], value: Optional[float], target_distance_mi: Optional[float], target_seconds: Optional[int]) -> Optional[float]:
+    """Share of the target reached, from 0 to 1, or None if the goal can't be tracked."""
+    if goal_kind is None:
+        return None
+    if value is None:
+        return 0.0
+    if goal_kind == "distance":
+        share = value / target_distance_mi
+    elif goal_kind == "longest_run":
+        share = value / (target_distance_mi * RACE_DISTANCE_TOLERANCE)
+    elif goal_kind == "time":
+        share = value / target_seconds
+    else:
+        share = _target_pace(target_distance_mi, target_seconds) / value
+    return min(share, 1.0)
+
+def window(date_created: datetime, target_date: datetime) -> Tuple[datetime, datetime]:
+    """Workouts count from the start of the day the goal was set through the whole target day."""
+    return (
+        datetime.combine(date_created.date(), time.min),
+        datetime.combine(target_date.date(), time.min) + timedelta(days=1),
+    )
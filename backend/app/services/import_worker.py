@@ -0,0 +1,168 @@
+import logging
+import os
+import shutil
+import threading
+import uuid
+from datetime import timedelta
+from typing import BinaryIO, List
+from app.core.config import settings
+from app.crud import import_job as crud_import_job
+from app.db.session import SessionLocal
+from app.models.import_job import ImportJob
+from app.services import csv_import
+
+logger = logging.getLogger(__name__)
+
+def upload_path(job_id: str) -> str:
+    return os.path.join(settings.IMPORT_STORAGE_DIR, f"{job_id}.csv")
+
+def store_upload(stream: BinaryIO) -> str:
+    """Copy an uploaded file into import storage and return the new job id."""
+    os.makedirs(settings.IMPORT_STORAGE_DIR, exist_ok=True)
+    job_id = uuid.uuid4().hex
+    with open(upload_path(job_id), "wb") as out:
+        shutil.copyfileobj(stream, out)
+    return job_id
+
+class JobReclaimedError(Exception):
+    """Raised in a worker whose job was re-claimed by another worker after its heartbeat went stale."""
+
+class _Heartbeat:
+    """
+    Refreshes a claimed job's heartbeat from a background thread, so a long
+    batch doesn't make the job look abandoned. Sets lost if the job was
+    re-claimed anyway.
+    """
+
+    def __init__(self, job_id: str, claim_token: str, interval: float):
+        self.job_id = job_id
+        self.claim_token = claim_token
+        self.interval = interval
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"import-heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            db = SessionLocal()
+            try:
+                alive = crud_import_job.heartbeat(db, self.job_id, self.claim_token)
+            except Exception:
+                logger.exception("Heartbeat for import job %s failed", self.job_id)
+                continue
+            finally:
+                db.close()
+            if not alive:
+                self.lost.set()
+                return
+
+class ImportWorkerPool:
+    """
+    Fixed-size pool of threads that drain the import_jobs table.
+    The pool size bounds how many imports run at once. Jobs are claimed
+    with SKIP LOCKED, so pools in several API processes can share the queue
+    as long as they share IMPORT_STORAGE_DIR, where uploads are kept.
+    A job whose heartbeat goes stale is re-claimed; the worker that lost it
+    stops at its next batch and leaves the upload to the new owner.
+    """
+
+    def __init__(self, workers: int, poll_seconds: float, stale_after: timedelta):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.stale_after = stale_after
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def start(self) -> None:
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"import-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers right away instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                worked = self._run_one()
+            except Exception:
+                logger.exception("Import worker failed to poll the job queue")
+                worked = False
+            if not worked:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+
+    def _run_one(self) -> bool:
+        db = SessionLocal()
+        try:
+            db_job = crud_import_job.claim_next_job(db, self.stale_after)
+            if db_job is None:
+                return False
+            self._process(db, db_job)
+            return True
+        finally:
+            db.close()
+
+    def _process(self, db, db_job: ImportJob) -> None:
+        job_id, claim_token = db_job.id, db_job.claim_token
+        path = upload_path(job_id)
+        owned = True
+        with _Heartbeat(job_id, claim_token, self.stale_after.total_seconds() / 3) as heartbeat:
+
+            def on_batch(result) -> None:
+                if heartbeat.lost.is_set() or not crud_import_job.record_progress(db, job_id, claim_token, result):
+                    raise JobReclaimedError(job_id)
+
+            try:
+                with open(path, "rb") as stream:
+                    result = csv_import.import_csv_stream(
+                        db,
+                        stream,
+                        user_id=db_job.user_id,
+                        batch_size=settings.CSV_IMPORT_BATCH_SIZE,
+                        on_batch=on_batch
+                    )
+            except JobReclaimedError:
+                db.rollback()
+                logger.warning("Import job %s was re-claimed by another worker, stopping", job_id)
+                owned = False
+            except (csv_import.MissingColumnsError, csv_import.MalformedCsvError) as e:
+                db.rollback()
+                owned = crud_import_job.finish_job(db, job_id, claim_token, error=str(e))
+            except Exception as e:
+                logger.exception("Import job %s failed", job_id)
+                db.rollback()
+                owned = crud_import_job.finish_job(db, job_id, claim_token, error=f"Import failed: {e}")
+            else:
+                owned = (
+                    crud_import_job.record_progress(db, job_id, claim_token, result)
+                    and crud_import_job.finish_job(db, job_id, claim_token, error=result.error)
+                )
+        # A worker that lost the job leaves the upload to the one importing it now
+        if owned and os.path.exists(path):
+            os.remove(path)
+
+import_workers = ImportWorkerPool(
+    workers=settings.IMPORT_WORKERS,
+    poll_seconds=settings.IMPORT_POLL_SECONDS,
+    stale_after=timedelta(seconds=settings.IMPORT_STALE_AFTER_SECONDS),
+)
@@ -0,0 +1,342 @@
+"""
+MapMyFitness workout sync.
+
+Workouts are pulled from the MapMyFitness v7.1 API with one pooled
+httpx.AsyncClient per process. After the first page reveals the total
+count, the remaining pages are fetched concurrently through a shared
+rate limiter that spaces requests out and pauses everyone when the API
+answers 429. Only workouts started since the user's sync cursor are
+requested, and they are upserted in batches while later pages are still
+in flight.
+
+MAPMYFITNESS_API_URL points the client at a local stub server for testing,
+see scripts/mapmyfitness_stub.py.
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.crud import sync_state_async as crud_sync_state
+from app.crud import workout_async as crud_workout
+from app.schemas.sync import SyncResult
+from app.schemas.workout import WorkoutCreate
+
+PROVIDER = "mapmyfitness"
+METERS_PER_MILE = 1609.344
+JOULES_PER_KCAL = 4184
+WORKOUT_URL = "https://www.mapmyfitness.com/workout/{id}"
+
+# MapMyFitness activity type ids, named like the CSV export; others keep their id
+ACTIVITY_TYPES = {
+    "16": "Run",
+    "9": "Walk",
+    "11": "Bike Ride",
+}
+
+class MapMyFitnessError(Exception):
+    """Raised when a sync cannot be completed."""
+
+class NotConnectedError(MapMyFitnessError):
+    """Raised when syncing a user who has not connected a MapMyFitness account."""
+
+class RateLimiter:
+    """
+    Spaces requests at most 1/rate seconds apart across every task that
+    shares the limiter. block_for pushes all future slots back, so one 429
+    pauses the whole process instead of each task finding out separately.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            slot = max(time.monotonic(), self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def block_for(self, seconds: float) -> None:
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header, given either as a delay or an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def _backoff(attempt: int) -> float:
+    return min(0.5 * 2 ** attempt, 30.0) + random.uniform(0, 0.25)
+
+class MapMyFitnessClient:
+    """Fetches one user's workouts. Counts pages and retries for the sync result."""
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        access_token: str,
+        limiter: RateLimiter,
+        page_size: int,
+        concurrency: int,
+        max_retries: int,
+    ):
+        self.http = http
+        self.access_token = access_token
+        self.limiter = limiter
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.pages = 0
+        self.retries = 0
+
+    async def get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET a JSON document, retrying 429s, 5xx responses and connection errors."""
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            await self.limiter.acquire()
+            try:
+                response = await self.http.get(path, params=params, headers=headers)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                delay = _backoff(attempt)
+            else:
+                if response.status_code == 429 and not last_attempt:
+                    self.limiter.block_for(_retry_after(response) or _backoff(attempt))
+                    delay = 0.0
+                elif response.status_code >= 500 and not last_attempt:
+                    delay = _retry_after(response) or _backoff(attempt)
+                else:
+                    response.raise_for_status()
+                    self.pages += 1
+                    return response.json()
+            self.retries += 1
+            if delay:
+                await asyncio.sleep(delay)
+        raise MapMyFitnessError("Retries exhausted")  # Not reached, the last attempt returns or raises
+
+    def _params(self, remote_user_id: str, started_after: Optional[datetime], offset: int) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"user": remote_user_id, "limit": self.page_size, "offset": offset}
+        if started_after is not None:
+            params["started_after"] = started_after.replace(tzinfo=timezone.utc).isoformat()
+        return params
+
+    async def iter_workout_pages(
+        self,
+        remote_user_id: str,
+        started_after: Optional[datetime] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of workout documents as they arrive, in no particular order.
+        The first page is fetched alone to learn total_count; the other offsets
+        are then fetched at most `concurrency` at a time. If the API omits
+        total_count, the next links are followed one page at a time instead.
+        """
+        first = await self.get("workout/", self._params(remote_user_id, started_after, 0))
+        yield _workouts(first)
+
+        total = first.get("total_count")
+        if total is None:
+            page = first
+            while _next_href(page):
+                # Next links are host-relative, so resolve them against the API root
+                page = await self.get(str(self.http.base_url.join(_next_href(page))), {})
+                yield _workouts(page)
+            return
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(offset: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get("workout/", self._params(remote_user_id, started_after, offset))
+
+        tasks = [
+            asyncio.ensure_future(fetch(offset))
+            for offset in range(self.page_size, int(total), self.page_size)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield _workouts(await finished)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+def _workouts(page: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return (page.get("_embedded") or {}).get("workouts") or []
+
+def _next_href(page: Dict[str, Any]) -> Optional[str]:
+    links = (page.get("_links") or {}).get("next") or []
+    return links[0].get("href") if links else None
+
+def _link_id(item: Dict[str, Any], name: str) -> Optional[str]:
+    links = (item.get("_links") or {}).get(name) or []
+    return str(links[0]["id"]) if links and links[0].get("id") is not None else None
+
+def started_at_utc(item: Dict[str, Any]) -> datetime:
+    """Start time of a workout document as a naive UTC datetime, the sync cursor's unit."""
+    started = datetime.fromisoformat(item["start_datetime"].replace("Z", "+00:00"))
+    if started.tzinfo is None:
+        return started
+    return started.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _local_start(item: Dict[str, Any]) -> datetime:
+    # CSV exports use the wall-clock time where the workout happened
+    started = datetime.fromisoformat(item["start_datetime"].replace("Z", "+00:00"))
+    if started.tzinfo is None:
+        return started
+    zone = item.get("start_locale_timezone")
+    if zone:
+        try:
+            started = started.astimezone(ZoneInfo(zone))
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return started.replace(tzinfo=None)
+
+def _mph(meters_per_second: Optional[float]) -> Optional[float]:
+    return meters_per_second * 3600 / METERS_PER_MILE if meters_per_second else None
+
+def workout_from_api(item: Dict[str, Any]) -> WorkoutCreate:
+    """Map a MapMyFitness workout document onto the fields of a CSV row."""
+    workout_id = _link_id(item, "self")
+    if workout_id is None:
+        raise ValueError("Workout has no id")
+    activity_id = _link_id(item, "activity_type")
+    aggregates = item.get("aggregates") or {}
+
+    distance_m = aggregates.get("distance_total")
+    seconds = aggregates.get("active_time_total") or aggregates.get("elapsed_time_total")
+    avg_mph = _mph(aggregates.get("speed_avg"))
+    max_mph = _mph(aggregates.get("speed_max"))
+    energy = aggregates.get("metabolic_energy_total")
+    heart_rate = aggregates.get("heartrate_avg")
+
+    return WorkoutCreate(
+        workout_date=_local_start(item),
+        activity_type=ACTIVITY_TYPES.get(activity_id, f"Activity {activity_id}" if activity_id else "Workout"),
+        calories_burned=int(energy / JOULES_PER_KCAL) if energy else 0,
+        distance_mi=distance_m / METERS_PER_MILE if distance_m is not None else 0.0,
+        workout_time_seconds=int(seconds) if seconds is not None else 0,
+        avg_pace_min_mi=60 / avg_mph if avg_mph else 0.0,
+        max_pace_min_mi=60 / max_mph if max_mph else 0.0,
+        avg_speed_mph=avg_mph or 0.0,
+        max_speed_mph=max_mph or 0.0,
+        avg_heart_rate=int(heart_rate) if heart_rate else None,
+        steps=aggregates.get("steps_total"),
+        notes=item.get("notes") or item.get("name") or "",
+        source=PROVIDER,
+        external_link=WORKOUT_URL.format(id=workout_id)
+    )
+
+_http_client: Optional[httpx.AsyncClient] = None
+_rate_limiter: Optional[RateLimiter] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Connection-pooled client shared by every sync in this process."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=settings.MAPMYFITNESS_API_URL,
+            timeout=settings.MAPMYFITNESS_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.MAPMYFITNESS_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MAPMYFITNESS_MAX_CONNECTIONS,
+            ),
+            headers={"Api-Key": settings.MAPMYFITNESS_CLIENT_ID or ""},
+        )
+    return _http_client
+
+def get_rate_limiter() -> RateLimiter:
+    """The API's rate limit applies per client id, so all syncs share one limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(settings.MAPMYFITNESS_REQUESTS_PER_SECOND)
+    return _rate_limiter
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+async def _write(db: AsyncSession, workouts: List[WorkoutCreate], user_id: int, result: SyncResult) -> None:
+    upserted = await crud_workout.upsert_workouts_bulk(db, workouts, user_id)
+    result.inserted += upserted.inserted
+    result.updated += upserted.updated
+    result.skipped += upserted.skipped
+
+async def sync_user(db: AsyncSession, user_id: int, client: Optional[MapMyFitnessClient] = None) -> SyncResult:
+    """
+    Pull the user's workouts started since their cursor and upsert them.
+    Batches are committed as they fill, but the cursor only advances once
+    every page has been read, so a failed sync is retried from the same
+    point and the natural-key upsert absorbs the overlap.
+    """
+    db_state = await crud_sync_state.get_state(db, user_id, PROVIDER)
+    if db_state is None:
+        raise NotConnectedError("MapMyFitness account is not connected")
+    if client is None:
+        client = MapMyFitnessClient(
+            get_http_client(),
+            db_state.access_token,
+            get_rate_limiter(),
+            page_size=settings.MAPMYFITNESS_PAGE_SIZE,
+            concurrency=settings.MAPMYFITNESS_CONCURRENCY,
+            max_retries=settings.MAPMYFITNESS_MAX_RETRIES,
+        )
+    await crud_sync_state.start_sync(db, db_state)
+
+    result = SyncResult(cursor=db_state.cursor)
+    batch: List[WorkoutCreate] = []
+    try:
+        async for page in client.iter_workout_pages(db_state.remote_user_id, db_state.cursor):
+            for item in page:
+                result.fetched += 1
+                try:
+                    workout = workout_from_api(item)
+                    started = started_at_utc(item)
+                except (KeyError, TypeError, ValueError):
+                    result.failed += 1
+                    continue
+                batch.append(workout)
+                if result.cursor is None or started > result.cursor:
+                    result.cursor = started
+            if len(batch) >= settings.CSV_IMPORT_BATCH_SIZE:
+                await _write(db, batch, user_id, result)
+                batch = []
+        if batch:
+            await _write(db, batch, user_id, result)
+    except (httpx.HTTPError, MapMyFitnessError) as e:
+        await db.rollback()
+        await crud_sync_state.finish_sync(db, db_state, error=f"Sync failed: {e}")
+        raise MapMyFitnessError(f"Sync failed: {e}") from e
+    except Exception as e:
+        # Anything else is a bug or a database error; still release the sync before surfacing it
+        await db.rollback()
+        await crud_sync_state.finish_sync(db, db_state, error=f"Sync failed: {e}")
+        raise
+    finally:
+        result.pages = client.pages
+        result.retries = client.retries
+
+    await crud_sync_state.finish_sync(
+        db, db_state, cursor=result.cursor, synced=result.inserted + result.updated
+    )
+    return result
@@ -0,0 +1,206 @@
+"""
+Streaming export of a user's workouts as CSV, NDJSON or Parquet.
+
+Rows are read through a server-side cursor in EXPORT_BATCH_SIZE batches
+and each batch is encoded and handed to the response before the next one
+is fetched, so memory use depends on the batch size, not on the length of
+the history.
+
+The CSV uses the MapMyRun export columns accepted by the CSV upload.
+Dates are written as 'YYYY-MM-DD HH:MM:SS' rather than MapMyRun's
+'Jan. 5, 2024', so workout times survive a round trip and a re-import
+matches the existing workouts instead of duplicating them.
+"""
+import csv
+import io
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Sequence
+from sqlalchemy import DateTime, Float, Integer, select
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.responses import dumps
+from app.crud.workout import WORKOUT_RESPONSE_COLUMNS
+from app.db.session import AsyncSessionLocal
+from app.models.workout import Workout
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - Parquet export unavailable
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+# format: (media type, file extension)
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# MapMyRun CSV header and the workout field each column comes from
+CSV_COLUMNS = [
+    ("Date Submitted", "date_submitted"),
+    ("Workout Date", "workout_date"),
+    ("Activity Type", "activity_type"),
+    ("Calories Burned (kCal)", "calories_burned"),
+    ("Distance (mi)", "distance_mi"),
+    ("Workout Time (seconds)", "workout_time_seconds"),
+    ("Avg Pace (min/mi)", "avg_pace_min_mi"),
+    ("Max Pace (min/mi)", "max_pace_min_mi"),
+    ("Avg Speed (mi/h)", "avg_speed_mph"),
+    ("Max Speed (mi/h)", "max_speed_mph"),
+    ("Avg Heart Rate", "avg_heart_rate"),
+    ("Steps", "steps"),
+    ("Notes", "notes"),
+    ("Source", "source"),
+    ("Link", "external_link"),
+]
+
+FIELDS = [column.key for column in WORKOUT_RESPONSE_COLUMNS]
+
+def parquet_available() -> bool:
+    return pyarrow is not None
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+class CsvEncoder:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._indexes = [FIELDS.index(field) for _, field in CSV_COLUMNS]
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def header(self) -> bytes:
+        self._writer.writerow([name for name, _ in CSV_COLUMNS])
+        return self._drain()
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        self._writer.writerows([_csv_value(row[i]) for i in self._indexes] for row in rows)
+        return self._drain()
+
+    def footer(self) -> bytes:
+        return b""
+
+class NdjsonEncoder:
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        return b"".join(dumps(dict(zip(FIELDS, row))) + b"\n" for row in rows)
+
+    def footer(self) -> bytes:
+        return b""
+
+class _ChunkSink:
+    """
+    Write-only file that keeps what was written until it is drained.
+    ParquetWriter only needs write and tell, so row groups can be sent
+    as soon as they are written.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def _arrow_type(column) -> "pyarrow.DataType":
+    if isinstance(column.type, DateTime):
+        return pyarrow.timestamp("us")
+    if isinstance(column.type, Integer):
+        return pyarrow.int64()
+    if isinstance(column.type, Float):
+        return pyarrow.float64()
+    return pyarrow.string()
+
+class ParquetEncoder:
+    """One row group per batch. The footer, written on close, completes the file."""
+
+    def __init__(self):
+        self._schema = pyarrow.schema(
+            [(column.key, _arrow_type(column)) for column in WORKOUT_RESPONSE_COLUMNS]
+        )
+        self._sink = _ChunkSink()
+        self._writer = pyarrow.parquet.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        columns = list(zip(*rows))
+        self._writer.write_table(pyarrow.Table.from_arrays(
+            [pyarrow.array(values, type=field.type) for values, field in zip(columns, self._schema)],
+            schema=self._schema,
+        ))
+        return self._sink.drain()
+
+    def footer(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+ENCODERS = {"csv": CsvEncoder, "ndjson": NdjsonEncoder, "parquet": ParquetEncoder}
+
+async def stream_workouts(user_id: int, export_format: str) -> AsyncIterator[bytes]:
+    """
+    Yield the encoded export of a user's workouts, oldest first.
+    Opens its own session, since the response body is produced after the
+    endpoint has returned.
+    """
+    encoder = ENCODERS[export_format]()
+    # Parquet encoding is CPU heavy enough to keep off the event loop
+    offload = export_format == "parquet"
+    stmt = (
+        select(*WORKOUT_RESPONSE_COLUMNS)
+        .where(Workout.user_id == user_id)
+        .order_by(Workout.workout_date, Workout.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    exported = 0
+    header = encoder.header()
+    if header:
+        yield header
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            chunk = await run_in_threadpool(encoder.encode, rows) if offload else encoder.encode(rows)
+            exported += len(rows)
+            if chunk:
+                yield chunk
+    footer = await run_in_threadpool(encoder.footer) if offload else encoder.footer()
+    if footer:
+        yield footer
+    logger.info("Workouts exported", extra={"format": export_format, "workouts": exported})
@@ -0,0 +1,180 @@
+"""
+Benchmark the columnar analytics engine against the original per-object
+Python loops, and check that both produce the same results.
+
+Runs entirely in memory, no database needed. From the backend directory:
+    python -m scripts.benchmark_analytics --sizes 10000 100000
+"""
+import argparse
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List
+from app.services import analytics
+
+def make_runs(count: int) -> List[SimpleNamespace]:
+    rng = random.Random(count)
+    start = datetime(2012, 1, 1)
+    runs = []
+    for i in range(count):
+        pace = rng.choice([0.0, None]) if rng.random() < 0.03 else round(rng.uniform(6.5, 12.5), 2)
+        runs.append(SimpleNamespace(
+            workout_date=start + timedelta(minutes=90 * i + rng.randint(0, 60)),
+            distance_mi=round(rng.uniform(1, 16), 2),
+            workout_time_seconds=rng.randint(600, 9000),
+            avg_pace_min_mi=pace,
+            avg_heart_rate=rng.randint(120, 175) if rng.random() < 0.8 else None,
+        ))
+    return runs
+
+def legacy_summary(runs: List[SimpleNamespace]) -> Dict[str, Any]:
+    """
+    The analytics summary endpoint's loops before aggregation moved out of
+    Python, copied verbatim from the original handler body after its run filter.
+    """
+    total_runs = len(runs)
+    
+    if not runs:
+        return {
+            "total_runs": 0,
+            "total_distance": 0,
+            "avg_distance": 0,
+            "longest_run": 0,
+            "best_pace": None,
+            "avg_pace": None,
+            "total_time": 0,
+            "weekly_mileage": [],
+            "recent_achievements": [],
+            "pace_zones": {"easy": 0, "moderate": 0, "tempo": 0}
+        }
+    
+    # Calculate stats
+    total_distance = sum(r.distance_mi for r in runs)
+    avg_distance = total_distance / total_runs if total_runs > 0 else 0
+    longest_run = max(r.distance_mi for r in runs)
+    best_pace = min((r.avg_pace_min_mi for r in runs if r.avg_pace_min_mi), default=None)
+    avg_pace = sum(r.avg_pace_min_mi for r in runs if r.avg_pace_min_mi) / len([r for r in runs if r.avg_pace_min_mi]) if runs else None
+    total_time = sum(r.workout_time_seconds for r in runs)
+    
+    # Calculate weekly mileage
+    weekly_mileage = {}
+    for run in runs:
+        week_start = run.workout_date.date() - timedelta(days=run.workout_date.weekday())
+        weekly_mileage[week_start] = weekly_mileage.get(week_start, 0) + run.distance_mi
+    
+    weekly_mileage = [
+        {"week": str(week), "distance": distance}
+        for week, distance in sorted(weekly_mileage.items())
+    ]
+    
+    # Find recent achievements
+    recent_achievements = []
+    longest_run_workout = max(runs, key=lambda r: r.distance_mi)
+    if longest_run_workout:
+        recent_achievements.append({
+            "type": "Longest Run",
+            "value": f"{longest_run_workout.distance_mi:.2f} miles",
+            "date": str(longest_run_workout.workout_date.date())
+        })
+    
+    best_pace_workout = min((r for r in runs if r.avg_pace_min_mi), key=lambda r: r.avg_pace_min_mi, default=None)
+    if best_pace_workout:
+        recent_achievements.append({
+            "type": "Best Pace",
+            "value": f"{best_pace_workout.avg_pace_min_mi:.2f} min/mi",
+            "date": str(best_pace_workout.workout_date.date())
+        })
+    
+    # Calculate pace zones
+    pace_zones = {"easy": 0, "moderate": 0, "tempo": 0}
+    if avg_pace is not None:
+        for run in runs:
+            if run.avg_pace_min_mi is None:
+                continue
+            if run.avg_pace_min_mi > avg_pace * 1.1:
+                pace_zones["easy"] += 1
+            elif run.avg_pace_min_mi <= avg_pace * 0.9:
+                pace_zones["tempo"] += 1
+            else:
+                pace_zones["moderate"] += 1
+    
+    return {
+        "total_runs": total_runs,
+        "total_distance": total_distance,
+        "avg_distance": avg_distance,
+        "longest_run": longest_run,
+        "best_pace": best_pace,
+        "avg_pace": avg_pace,
+        "total_time": total_time,
+        "weekly_mileage": weekly_mileage,
+        "recent_achievements": recent_achievements,
+        "pace_zones": pace_zones
+    }
+
+def legacy_trends(runs: List[SimpleNamespace], metric: str, group_by: str) -> List[Dict[str, Any]]:
+    grouped: Dict[Any, List[SimpleNamespace]] = {}
+    for run in runs:
+        day = run.workout_date.date()
+        if group_by == "day":
+            period = day
+        elif group_by == "week":
+            period = day - timedelta(days=day.weekday())
+        else:
+            period = day.replace(day=1)
+        grouped.setdefault(period, []).append(run)
+    data = []
+    for period in sorted(grouped):
+        period_runs = grouped[period]
+        if metric == "distance":
+            value = sum(r.distance_mi for r in period_runs)
+        elif metric == "pace":
+            paces = [r.avg_pace_min_mi for r in period_runs if r.avg_pace_min_mi]
+            value = sum(paces) / len(paces) if paces else None
+        else:
+            value = sum(r.workout_time_seconds for r in period_runs)
+        if value is not None:
+            data.append({"period": period.strftime("%Y-%m-%d"), "value": float(value)})
+    return data
+
+def same(a: Any, b: Any) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return a is not None and b is not None and math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    return a == b
+
+def timed(func, *args) -> (Any, float):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Columnar analytics benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        runs = make_runs(size)
+        rows = [(r.workout_date, r.distance_mi, r.workout_time_seconds, r.avg_pace_min_mi, r.avg_heart_rate) for r in runs]
+
+        expected, legacy_seconds = timed(legacy_summary, runs)
+        frame, frame_seconds = timed(analytics.frame_from_rows, rows)
+        actual, columnar_seconds = timed(analytics.summarize, frame)
+        assert same(expected, actual), "summary mismatch"
+        print(f"summary {size:>7}: legacy {legacy_seconds * 1000:8.1f} ms  "
+              f"columnar {columnar_seconds * 1000:8.1f} ms (+{frame_seconds * 1000:.1f} ms to build frame)")
+
+        for group_by in ("day", "week", "month"):
+            for metric in ("distance", "pace", "time"):
+                expected, legacy_seconds = timed(legacy_trends, runs, metric, group_by)
+                actual, columnar_seconds = timed(analytics.trends, frame, metric, group_by)
+                assert same(expected, actual), f"trends mismatch for {metric}/{group_by}"
+            print(f"trends  {size:>7} {group_by:<5}: legacy {legacy_seconds * 1000:8.1f} ms  "
+                  f"columnar {columnar_seconds * 1000:8.1f} ms (time metric)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Measure request throughput on one API worker while a large CSV upload runs.
+
+Starts the API separately, e.g. with a single worker:
+    uvicorn app.main:app --workers 1 --port 8000
+
+then, from the backend directory:
+    python -m scripts.benchmark_concurrent_upload --email user@analyzemyrun.com --password user123
+
+The benchmark first measures a baseline of concurrent GET /workouts and
+/analytics/summary requests, then repeats the measurement while uploading
+a synthetic CSV of --rows workouts, and prints both throughputs.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+import httpx
+
+CSV_HEADER = [
+    'Date Submitted', 'Workout Date', 'Activity Type', 'Calories Burned (kCal)',
+    'Distance (mi)', 'Workout Time (seconds)', 'Avg Pace (min/mi)', 'Max Pace (min/mi)',
+    'Avg Speed (mi/h)', 'Max Speed (mi/h)', 'Avg Heart Rate', 'Steps', 'Notes', 'Source', 'Link',
+]
+
+def build_csv(rows: int) -> bytes:
+    rng = random.Random(7)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    start = datetime(2015, 1, 1)
+    for i in range(rows):
+        day = start + timedelta(hours=6 * i)
+        distance = round(rng.uniform(1, 13), 2)
+        pace = round(rng.uniform(7, 12), 2)
+        writer.writerow([
+            day.strftime('%b. %d, %Y'), day.strftime('%b. %d, %Y'), 'Run',
+            int(distance * 110), distance, int(distance * pace * 60), pace, round(pace * 0.8, 2),
+            round(60 / pace, 2), round(75 / pace, 2), rng.randint(130, 170), int(distance * 1500),
+            '', 'Map My Run', f'https://www.mapmyfitness.com/workout/{i}',
+        ])
+    return buffer.getvalue().encode()
+
+async def hammer(client: httpx.AsyncClient, stop: asyncio.Event, latencies: List[float]) -> None:
+    paths = ['/api/v1/workouts/?limit=20', '/api/v1/workouts/analytics/summary?days=30']
+    i = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(paths[i % len(paths)])
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        i += 1
+
+async def measure(client: httpx.AsyncClient, concurrency: int, upload: bytes = None, duration: float = 5.0) -> Dict:
+    stop = asyncio.Event()
+    latencies: List[float] = []
+    workers = [asyncio.create_task(hammer(client, stop, latencies)) for _ in range(concurrency)]
+    started = time.perf_counter()
+    upload_seconds = None
+    if upload is not None:
+        response = await client.post(
+            '/api/v1/workouts/upload-csv',
+            files={'file': ('bench.csv', upload, 'text/csv')},
+            timeout=None,
+        )
+        response.raise_for_status()
+        upload_seconds = time.perf_counter() - started
+    else:
+        await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'throughput_rps': len(latencies) / elapsed,
+        'p50_ms': 1000 * latencies[len(latencies) // 2] if latencies else None,
+        'p99_ms': 1000 * latencies[int(len(latencies) * 0.99)] if latencies else None,
+        'upload_seconds': upload_seconds,
+    }
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput during a large upload")
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        token = await client.post(
+            '/api/v1/auth/login', data={'username': args.email, 'password': args.password}
+        )
+        token.raise_for_status()
+        client.headers['Authorization'] = f"Bearer {token.json()['access_token']}"
+
+        upload = build_csv(args.rows)
+        baseline = await measure(client, args.concurrency)
+        during = await measure(client, args.concurrency, upload=upload)
+
+    print(f"baseline:      {baseline}")
+    print(f"during upload: {during}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""
+Benchmark the per-file DateParser against probing parse_date, and check
+that both return the same datetimes.
+
+Runs entirely in memory. From the backend directory:
+    python -m scripts.benchmark_date_parser --rows 50000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+from app.services.date_parser import DateParser, parse_date
+
+FORMATTERS = {
+    "month_name": lambda d: d.strftime("%b. %d, %Y").replace("May.", "May").replace("Sep.", "Sept."),
+    "iso_date": lambda d: d.strftime("%Y-%m-%d"),
+    "iso_datetime": lambda d: d.strftime("%Y-%m-%d %H:%M:%S"),
+    "month_first": lambda d: f"{d.month}/{d.day}/{d.year}",
+    "day_first": lambda d: f"{d.day}/{d.month}/{d.year}",
+}
+
+def make_dates(format_name: str, rows: int) -> List[str]:
+    rng = random.Random(rows)
+    start = datetime(2012, 1, 1)
+    formatter = FORMATTERS[format_name]
+    return [formatter(start + timedelta(days=rng.randint(0, 4500))) for _ in range(rows)]
+
+def timed(parse: Callable[[str], datetime], values: List[str]) -> Tuple[float, List[datetime]]:
+    started = time.perf_counter()
+    parsed = [parse(value) for value in values]
+    return time.perf_counter() - started, parsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    for format_name in FORMATTERS:
+        values = make_dates(format_name, args.rows)
+        legacy_seconds, expected = timed(parse_date, values)
+        date_parser = DateParser.detect(values[:100])
+        fast_seconds, parsed = timed(date_parser.parse, values)
+        if format_name == "day_first":
+            # parse_date prefers month first, so compare against the unambiguous reading
+            expected = [datetime.strptime(v, "%d/%m/%Y") for v in values]
+        assert parsed == expected, f"{format_name}: results differ"
+        print(
+            f"{format_name:>13}: detected={date_parser.format_name:<13} "
+            f"probing={legacy_seconds * 1000:8.1f}ms fast={fast_seconds * 1000:7.1f}ms "
+            f"speedup={legacy_seconds / fast_seconds:5.1f}x fallbacks={date_parser.fallbacks}"
+        )
+
+if __name__ == "__main__":
+    main()
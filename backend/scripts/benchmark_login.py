@@ -0,0 +1,84 @@
+"""
+Measure login latency under a burst and its impact on other endpoints.
+
+Start the API separately (one worker), then from the backend directory:
+    python -m scripts.benchmark_login --email user@analyzemyrun.com --password user123
+
+Runs a steady stream of GET /workouts requests, first alone and then while
+--logins concurrent logins hammer /auth/login, and reports p50/p99 for both.
+Logins rejected with 503 by the saturated hashing pool are counted separately.
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+import httpx
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {"count": 0}
+    latencies = sorted(latencies)
+    return {
+        "count": len(latencies),
+        "p50_ms": 1000 * latencies[len(latencies) // 2],
+        "p99_ms": 1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+async def reader(client: httpx.AsyncClient, stop: asyncio.Event, latencies: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/v1/workouts/?limit=20")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+async def login(client: httpx.AsyncClient, email: str, password: str, latencies: List[float], rejected: List[int]) -> None:
+    started = time.perf_counter()
+    response = await client.post("/api/v1/auth/login", data={"username": email, "password": password})
+    if response.status_code == 503:
+        rejected.append(1)
+        return
+    response.raise_for_status()
+    latencies.append(time.perf_counter() - started)
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Login burst benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+        token = await client.post("/api/v1/auth/login", data={"username": args.email, "password": args.password})
+        token.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {token.json()['access_token']}"
+
+        # Baseline reads
+        stop = asyncio.Event()
+        baseline: List[float] = []
+        readers = [asyncio.create_task(reader(client, stop, baseline)) for _ in range(args.readers)]
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        await asyncio.gather(*readers)
+
+        # Reads during a login burst
+        stop = asyncio.Event()
+        during: List[float] = []
+        login_latencies: List[float] = []
+        rejected: List[int] = []
+        readers = [asyncio.create_task(reader(client, stop, during)) for _ in range(args.readers)]
+        await asyncio.gather(*(
+            login(client, args.email, args.password, login_latencies, rejected)
+            for _ in range(args.logins)
+        ))
+        stop.set()
+        await asyncio.gather(*readers)
+
+    print(f"reads, baseline:     {percentiles(baseline)}")
+    print(f"reads, during burst: {percentiles(during)}")
+    print(f"logins:              {percentiles(login_latencies)}  rejected={len(rejected)}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
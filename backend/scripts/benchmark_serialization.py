@@ -0,0 +1,117 @@
+"""
+Benchmark the FAST_JSON_RESPONSES path against FastAPI's default
+serialization, and the response compression options.
+
+The default path is reproduced the way FastAPI runs it for an endpoint
+with a response_model: validate the content against the model (from ORM
+attributes for workouts), dump it in JSON mode and encode it with
+json.dumps. The fast path pairs row tuples with field names and encodes
+them with app.core.responses.dumps. Both outputs are decoded and compared.
+
+Runs entirely in memory. From the backend directory:
+    python -m scripts.benchmark_serialization --page-size 100 --trend-points 1500
+"""
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple
+from pydantic import TypeAdapter
+from app.core import compression, responses
+from app.core.config import settings
+from app.crud.workout import WORKOUT_RESPONSE_COLUMNS
+from app.schemas.workout import WorkoutList
+from app.services.csv_import import row_to_workout
+from scripts.synthetic_data import generate_user_rows
+
+FIELDS = [column.key for column in WORKOUT_RESPONSE_COLUMNS]
+
+def make_rows(count: int) -> List[Tuple]:
+    """Row tuples as the as_rows query returns them."""
+    rows = []
+    for index, row in enumerate(generate_user_rows(0, count, seed=0)):
+        workout = row_to_workout(row).model_dump()
+        workout.update(id=index + 1, user_id=1, date_submitted=workout["workout_date"] + timedelta(hours=1))
+        rows.append(tuple(workout[name] for name in FIELDS))
+    return rows
+
+def make_trends(points: int) -> Dict[str, Any]:
+    start = datetime(2020, 1, 1)
+    return {
+        "metric": "distance",
+        "group_by": "day",
+        "data": [
+            {"period": (start + timedelta(days=i)).strftime("%Y-%m-%d"), "value": round(3 + (i % 7) * 0.85, 2)}
+            for i in range(points)
+        ],
+    }
+
+def default_render(adapter: TypeAdapter, content: Any, from_attributes: bool = False) -> bytes:
+    value = adapter.validate_python(content, from_attributes=from_attributes)
+    dumped = adapter.dump_python(value, mode="json")
+    return json.dumps(dumped, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def timed(render: Callable[[], bytes], repeat: int) -> Tuple[float, bytes]:
+    body = render()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - started) / repeat, body
+
+def report(name: str, default: Tuple[float, bytes], fast: Tuple[float, bytes]) -> bytes:
+    assert json.loads(default[1]) == json.loads(fast[1]), f"{name}: bodies differ"
+    print(
+        f"{name:>16}: default={default[0] * 1000:7.2f}ms fast={fast[0] * 1000:7.2f}ms "
+        f"speedup={default[0] / fast[0]:5.1f}x bytes={len(fast[1])}"
+    )
+    return fast[1]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--trend-points", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if responses.orjson is not None else 'json (orjson not installed)'}")
+
+    rows = make_rows(args.page_size)
+    objects = [SimpleNamespace(**dict(zip(FIELDS, row))) for row in rows]
+    page_adapter = TypeAdapter(WorkoutList)
+    page = report(
+        f"workouts x{args.page_size}",
+        timed(lambda: default_render(
+            page_adapter, {"items": objects, "total": 1000, "next_cursor": None}, from_attributes=True
+        ), args.repeat),
+        timed(lambda: responses.dumps(
+            {"items": responses.rows_to_dicts(rows, FIELDS), "total": 1000, "next_cursor": None}
+        ), args.repeat),
+    )
+
+    trends = make_trends(args.trend_points)
+    trends_adapter = TypeAdapter(Dict)
+    trend_body = report(
+        f"trends x{args.trend_points}",
+        timed(lambda: default_render(trends_adapter, trends), args.repeat),
+        timed(lambda: responses.dumps(trends), args.repeat),
+    )
+
+    for name, body in (("workouts", page), ("trends", trend_body)):
+        for encoding in compression.ENCODINGS:
+            seconds, compressed = timed(
+                lambda: compression.compress(
+                    body, encoding, settings.GZIP_COMPRESSION_LEVEL, settings.BROTLI_QUALITY
+                ),
+                max(args.repeat // 10, 1),
+            )
+            if encoding == "gzip":
+                assert gzip.decompress(compressed) == body
+            print(
+                f"{name:>16} {encoding:>4}: {len(body)} -> {len(compressed)} bytes "
+                f"({len(compressed) / len(body):.0%}) in {seconds * 1000:.2f}ms"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Local stand-in for the MapMyFitness workout list API.
+
+Serves generated workouts with the API's offset pagination, next links,
+started_after filtering and 429 responses, so the sync client can be
+exercised without credentials. From the backend directory:
+
+    python -m scripts.mapmyfitness_stub --port 8765 --workouts 500
+    MAPMYFITNESS_API_URL=http://127.0.0.1:8765/v7.1/ uvicorn app.main:app
+
+or check the client against it in-process, without a database:
+
+    python -m scripts.mapmyfitness_stub --check
+"""
+import argparse
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+import httpx
+from app.services import mapmyfitness
+
+API_PREFIX = "/v7.1/"
+START = datetime(2023, 1, 1, 11, 0, tzinfo=timezone.utc)
+
+def make_workouts(count: int) -> List[Dict[str, Any]]:
+    workouts = []
+    for i in range(1, count + 1):
+        started = START + timedelta(hours=13 * i)
+        workouts.append({
+            "name": f"Run {i}",
+            "start_datetime": started.isoformat().replace("+00:00", "Z"),
+            "start_locale_timezone": "America/New_York",
+            "aggregates": {
+                "distance_total": 4000.0 + 37 * (i % 200),
+                "active_time_total": 1200.0 + 11 * (i % 300),
+                "speed_avg": 3.1,
+                "speed_max": 4.2,
+                "metabolic_energy_total": 1_250_000.0,
+                "heartrate_avg": 150,
+            },
+            "_links": {
+                "self": [{"id": str(1000 + i)}],
+                "activity_type": [{"id": "16"}],
+            },
+        })
+    return workouts
+
+class StubState:
+    def __init__(self, workouts: List[Dict[str, Any]], throttle_every: int, fail_every: int,
+                 retry_after: str, include_total: bool):
+        self.workouts = workouts
+        self.throttle_every = throttle_every
+        self.fail_every = fail_every
+        self.retry_after = retry_after
+        self.include_total = include_total
+        self.requests = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != API_PREFIX + "workout/":
+                return self._send(404, {"error": "not found"})
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                return self._send(401, {"error": "missing token"})
+
+            with state.lock:
+                state.requests += 1
+                number = state.requests
+            if state.throttle_every and number % state.throttle_every == 0:
+                with state.lock:
+                    state.throttled += 1
+                return self._send(429, {"error": "rate limited"}, {"Retry-After": state.retry_after})
+            if state.fail_every and number % state.fail_every == 0:
+                return self._send(503, {"error": "unavailable"})
+
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            limit = int(query.get("limit", 20))
+            offset = int(query.get("offset", 0))
+            workouts = state.workouts
+            if "started_after" in query:
+                after = datetime.fromisoformat(query["started_after"].replace("Z", "+00:00"))
+                workouts = [
+                    w for w in workouts
+                    if datetime.fromisoformat(w["start_datetime"].replace("Z", "+00:00")) >= after
+                ]
+
+            body: Dict[str, Any] = {"_embedded": {"workouts": workouts[offset:offset + limit]}, "_links": {}}
+            if offset + limit < len(workouts):
+                next_query = urlencode({**query, "offset": offset + limit})
+                body["_links"]["next"] = [{"href": f"{API_PREFIX}workout/?{next_query}"}]
+            if state.include_total:
+                body["total_count"] = len(workouts)
+            self._send(200, body)
+
+    return Handler
+
+def serve(state: StubState, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def fetch_all(
+    base_url: str, started_after: Optional[datetime] = None
+) -> Tuple[mapmyfitness.MapMyFitnessClient, List[Dict[str, Any]]]:
+    async with httpx.AsyncClient(base_url=base_url) as http:
+        client = mapmyfitness.MapMyFitnessClient(
+            http, "stub-token", mapmyfitness.RateLimiter(200),
+            page_size=40, concurrency=4, max_retries=8,
+        )
+        items: List[Dict[str, Any]] = []
+        async for page in client.iter_workout_pages("42", started_after):
+            items.extend(page)
+        return client, items
+
+def check(workout_count: int) -> None:
+    """Run the client against the stub and assert it sees every workout exactly once."""
+    for include_total in (True, False):
+        state = StubState(make_workouts(workout_count), throttle_every=5, fail_every=13,
+                          retry_after="0.05", include_total=include_total)
+        server = serve(state, 0)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}{API_PREFIX}"
+        try:
+            client, items = asyncio.run(fetch_all(base_url))
+            ids = [mapmyfitness.workout_from_api(item).external_link for item in items]
+            assert len(ids) == workout_count and len(set(ids)) == workout_count, "missing or duplicate workouts"
+            assert client.retries >= state.throttled, "429s were not retried"
+
+            # An incremental sync from the newest start time only returns that workout
+            newest = max(mapmyfitness.started_at_utc(item) for item in items)
+            _, incremental = asyncio.run(fetch_all(base_url, started_after=newest))
+            assert len(incremental) == 1, "cursor did not limit the fetch"
+        finally:
+            server.shutdown()
+        mode = "concurrent offsets" if include_total else "next links"
+        print(
+            f"{mode}: fetched {len(ids)} workouts in {client.pages} pages, "
+            f"{state.throttled} throttled, {client.retries} retries"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workouts", type=int, default=500)
+    parser.add_argument("--throttle-every", type=int, default=7, help="answer every Nth request with 429, 0 to disable")
+    parser.add_argument("--fail-every", type=int, default=0, help="answer every Nth request with 503, 0 to disable")
+    parser.add_argument("--retry-after", default="1")
+    parser.add_argument("--no-total", action="store_true", help="omit total_count so clients must follow next links")
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    if args.check:
+        check(args.workouts)
+        return
+
+    state = StubState(make_workouts(args.workouts), args.throttle_every, args.fail_every,
+                      args.retry_after, not args.no_total)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(state))
+    print(f"Serving {args.workouts} workouts at http://127.0.0.1:{args.port}{API_PREFIX}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Rebuild personal_records from the workouts table.
+
+Usage (from the backend directory):
+    python -m scripts.rebuild_personal_records              # every user
+    python -m scripts.rebuild_personal_records --user-id 42 # a single user
+"""
+import argparse
+from app.crud import personal_record as crud_personal_record
+from app.db.session import SessionLocal
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's records")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = crud_personal_record.rebuild_records(db, user_id=args.user_id)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Wrote {rows} personal records")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Rebuild workout_rollups from the workouts table.
+
+Usage (from the backend directory):
+    python -m scripts.rebuild_rollups              # every user
+    python -m scripts.rebuild_rollups --user-id 42 # a single user
+"""
+import argparse
+from app.crud import workout_rollup as crud_rollup
+from app.db.session import SessionLocal
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rollups")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = crud_rollup.rebuild_rollups(db, user_id=args.user_id)
+    finally:
+        db.close()
+    print(f"Wrote {rows} rollup rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Deterministic synthetic workout data in the MapMyRun CSV export layout.
+
+The same (seed, user index, count) always produces the same rows, so
+benchmark databases and upload files can be rebuilt identically on any
+machine. Each synthetic athlete has their own base pace and training
+rhythm, gets slowly fitter over time, and mostly runs with some walks and
+rides mixed in. Cells are left empty where real exports leave them empty.
+
+Write CSV files for 3 users with 2000 workouts each, from the backend directory:
+    python -m scripts.synthetic_data --users 3 --workouts 2000 --output-dir /tmp/synthetic
+"""
+import argparse
+import csv
+import io
+import math
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, TextIO
+
+CSV_HEADER = [
+    'Date Submitted', 'Workout Date', 'Activity Type', 'Calories Burned (kCal)',
+    'Distance (mi)', 'Workout Time (seconds)', 'Avg Pace (min/mi)', 'Max Pace (min/mi)',
+    'Avg Speed (mi/h)', 'Max Speed (mi/h)', 'Avg Heart Rate', 'Steps', 'Notes', 'Source', 'Link',
+]
+
+# Generated histories end here rather than today so output never drifts
+END_DATE = datetime(2026, 1, 1, 7, 0)
+
+# (activity type, weight); older exports label runs 'Running'
+ACTIVITIES = [("Run", 0.76), ("Running", 0.04), ("Walk", 0.12), ("Bike Ride", 0.08)]
+
+NOTES = ["Easy run", "Long run", "Intervals", "Felt tired", "Hill repeats", "Recovery", "Race day"]
+
+def format_date(day: datetime) -> str:
+    """Dates as MapMyRun writes them: 'Jan. 5, 2024', 'May 5, 2024', 'Sept. 26, 2024'."""
+    month = day.strftime('%b')
+    if month == 'May':
+        return f"May {day.day}, {day.year}"
+    if month == 'Sep':
+        month = 'Sept'
+    return f"{month}. {day.day}, {day.year}"
+
+def _activity(rng: random.Random) -> str:
+    names, weights = zip(*ACTIVITIES)
+    return rng.choices(names, weights)[0]
+
+def _distance_and_pace(rng: random.Random, activity: str, base_pace: float, progress: float):
+    if activity in ("Run", "Running"):
+        distance = min(max(rng.lognormvariate(math.log(4.5), 0.45), 1.0), 26.2)
+        # Fitter with time, slower on long runs
+        pace = base_pace * (1 - 0.08 * progress) * (1 + 0.015 * (distance - 4.5)) * rng.gauss(1, 0.05)
+    elif activity == "Walk":
+        distance = rng.uniform(1.0, 5.0)
+        pace = rng.uniform(15.0, 20.0)
+    else:  # Bike Ride
+        distance = rng.uniform(6.0, 40.0)
+        pace = rng.uniform(3.0, 5.0)
+    return round(distance, 2), round(max(pace, 2.5), 2)
+
+def generate_user_rows(
+    user_index: int,
+    count: int,
+    seed: int = 0,
+    end: datetime = END_DATE,
+    bad_row_rate: float = 0.0,
+) -> List[Dict[str, str]]:
+    """
+    count CSV rows for one synthetic athlete, oldest first.
+    bad_row_rate is the share of rows with an unparseable date, for
+    exercising the importer's error path.
+    """
+    rng = random.Random(f"{seed}:{user_index}")
+    base_pace = rng.uniform(7.0, 11.0)
+    mean_gap_hours = rng.uniform(24, 60)
+
+    # Walk backwards from the end date so the newest workout is always recent
+    days: List[datetime] = []
+    day = end
+    for _ in range(count):
+        days.append(day)
+        day -= timedelta(hours=max(rng.expovariate(1 / mean_gap_hours), 6))
+    days.reverse()
+
+    rows = []
+    for i, day in enumerate(days):
+        progress = i / max(count - 1, 1)
+        activity = _activity(rng)
+        distance, pace = _distance_and_pace(rng, activity, base_pace, progress)
+        speed = 60 / pace
+        max_speed = speed * rng.uniform(1.1, 1.35)
+        running = activity in ("Run", "Running")
+        note = rng.choice(NOTES) if running and rng.random() < 0.15 else ""
+        workout_date = format_date(day)
+        if bad_row_rate and rng.random() < bad_row_rate:
+            workout_date = "not a date"
+        rows.append({
+            'Date Submitted': format_date(day + timedelta(hours=rng.randint(0, 30))),
+            'Workout Date': workout_date,
+            'Activity Type': activity,
+            'Calories Burned (kCal)': str(int(distance * rng.uniform(85, 120) if running else distance * 40)),
+            'Distance (mi)': f"{distance:.2f}",
+            'Workout Time (seconds)': str(int(distance * pace * 60)),
+            'Avg Pace (min/mi)': f"{pace:.2f}",
+            'Max Pace (min/mi)': f"{60 / max_speed:.2f}",
+            'Avg Speed (mi/h)': f"{speed:.2f}",
+            'Max Speed (mi/h)': f"{max_speed:.2f}",
+            # Heart rate and steps are missing when no sensor was paired
+            'Avg Heart Rate': str(rng.randint(128, 176)) if rng.random() < 0.8 else "",
+            'Steps': str(int(distance * rng.uniform(1500, 1750))) if activity != "Bike Ride" else "",
+            'Notes': f"b'{note}'" if note else "",
+            'Source': "Map My Run",
+            'Link': f"https://www.mapmyfitness.com/workout/{seed}{user_index:05d}{i:08d}",
+        })
+    return rows
+
+def write_csv(rows: List[Dict[str, str]], stream: TextIO) -> None:
+    writer = csv.DictWriter(stream, fieldnames=CSV_HEADER)
+    writer.writeheader()
+    writer.writerows(rows)
+
+def csv_bytes(rows: List[Dict[str, str]]) -> bytes:
+    buffer = io.StringIO()
+    write_csv(rows, buffer)
+    return buffer.getvalue().encode()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic MapMyRun CSV exports")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--workouts", type=int, default=1000, help="workouts per user")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bad-row-rate", type=float, default=0.0)
+    parser.add_argument("--output-dir", required=True)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for user_index in range(args.users):
+        rows = generate_user_rows(user_index, args.workouts, args.seed, bad_row_rate=args.bad_row_rate)
+        path = os.path.join(args.output_dir, f"user-{user_index}.csv")
+        with open(path, "w", newline="") as out:
+            write_csv(rows, out)
+        print(f"Wrote {len(rows)} workouts to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ import {
   CardContent,
   IconButton,
   Alert,
+  LinearProgress,
 } from '@mui/material';
 import { DatePicker } from '@mui/x-date-pickers/DatePicker';
 import { LocalizationProvider } from '@mui/x-date-pickers/LocalizationProvider';
@@ -30,6 +31,7 @@ interface Goal {
   target_date: Date | null;
   date_created?: string;
   completed?: string | null;
+  progress?: number | null;
 }
 
 const Goals: React.FC = () => {
@@ -216,6 +218,14 @@ const Goals: React.FC = () => {
                               Completed: {format(new Date(goal.completed), 'MMM d, yyyy')}
                             </Typography>
                           )}
+                          {goal.progress != null && (
+                            <Box mt={1}>
+                              <LinearProgress variant="determinate" value={goal.progress * 100} />
+                              <Typography variant="body2" color="textSecondary">
+                                {Math.round(goal.progress * 100)}% complete
+                              </Typography>
+                            </Box>
+                          )}
                         </Box>
                         <IconButton
                           onClick={() => goal.id && handleDeleteGoal(goal.id)}
@@ -13,6 +13,8 @@ import CloudUploadIcon from '@mui/icons-material/CloudUpload';
 import SyncIcon from '@mui/icons-material/Sync';
 import api from '../services/api';
 
+const IMPORT_POLL_INTERVAL_MS = 1000;
+
 interface TabPanelProps {
   children?: React.ReactNode;
   index: number;
@@ -38,7 +40,8 @@ const TabPanel = (props: TabPanelProps) => {
 const ImportRuns: React.FC = () => {
   const [tabValue, setTabValue] = useState(0);
   const [file, setFile] = useState<File | null>(null);
-  const [uploadStatus, setUploadStatus] = useState<{ type: 'success' | 'error', message: string } | null>(null);
+  const [uploadStatus, setUploadStatus] = useState<{ type: 'success' | 'info' | 'error', message: string } | null>(null);
+  const [uploading, setUploading] = useState(false);
   const [mapmyrunCredentials, setMapmyrunCredentials] = useState({
     username: '',
     password: '',
@@ -62,6 +65,21 @@ const ImportRuns: React.FC = () => {
     });
   };
 
+  const waitForImport = async (jobId: string) => {
+    // Poll the background import until it completes or fails
+    for (;;) {
+      const { data: job } = await api.get(`/workouts/imports/${jobId}`);
+      if (job.status === 'completed' || job.status === 'failed') {
+        return job;
+      }
+      setUploadStatus({
+        type: 'info',
+        message: `Importing ${job.filename}: ${job.rows_processed} rows processed`,
+      });
+      await new Promise((resolve) => setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+    }
+  };
+
   const handleCsvUpload = async () => {
     if (!file) return;
 
@@ -69,23 +87,37 @@ const ImportRuns: React.FC = () => {
     formData.append('file', file);
 
     try {
-      const response = await api.post('/workouts/upload-csv', formData, {
+      setUploading(true);
+      const response = await api.post('/workouts/imports', formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
       });
+      setFile(null);
 
+      const { inserted, updated, skipped, rows_failed: failed, error } = await waitForImport(response.data.id);
+      const summary = `${inserted} new, ${updated} updated, ${skipped} unchanged`;
+      if (error) {
+        setUploadStatus({
+          type: 'error',
+          message: inserted + updated > 0 ? `${error} (${summary})` : error,
+        });
+        return;
+      }
       setUploadStatus({
-        type: 'success',
-        message: `Successfully uploaded ${response.data.length} workouts`,
+        type: failed > 0 ? 'error' : 'success',
+        message: failed > 0
+          ? `Uploaded workouts (${summary}), ${failed} rows could not be imported`
+          : `Successfully uploaded workouts (${summary})`,
       });
-      setFile(null);
     } catch (error: any) {
       console.error('Upload error:', error);
       setUploadStatus({
         type: 'error',
         message: error.response?.data?.detail || 'Failed to upload file. Please try again.',
       });
+    } finally {
+      setUploading(false);
     }
   };
 
@@ -133,6 +165,7 @@ const ImportRuns: React.FC = () => {
                 variant="contained"
                 color="primary"
                 onClick={handleCsvUpload}
+                disabled={uploading}
                 sx={{ mt: 2 }}
               >
                 Upload